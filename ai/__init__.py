@@ -0,0 +1,10 @@
+"""AI service helpers"""
+from .parsing import extract_json_object, parse_ai_response
+from .prompt import PromptBuilder, token_usage
+from .resilience import CircuitBreaker, CircuitOpenError, hedged
+from .routing import ModelRouter, ModelTier
+from .snapping import match_profile, snap_answer
+
+__all__ = ['extract_json_object', 'parse_ai_response', 'PromptBuilder', 'token_usage',
+           'CircuitBreaker', 'CircuitOpenError', 'hedged', 'ModelRouter', 'ModelTier',
+           'match_profile', 'snap_answer']
@@ -0,0 +1,70 @@
+"""
+Local stand-in for the bedrock-runtime client (AI_BACKEND=fake).
+
+Implements invoke_model with per-model latency and answer quality, so the
+routing tiers, escalation, parsing and metrics can be exercised without AWS.
+Select-type questions get the first option; free-text answers from the
+cheapest tier come back with low confidence so they escalate.
+"""
+
+import io
+import json
+import re
+import time
+
+_QUESTION = re.compile(r"QUESTION: (.*)")
+_OPTIONS = re.compile(r"Available Options: (.*)")
+
+# model id substring -> (latency seconds, confidence for free text, confidence for options)
+FAKE_MODELS = {
+    "micro": (0.05, 0.4, 0.9),
+    "lite": (0.15, 0.8, 0.95),
+    "pro": (0.4, 0.92, 0.97),
+}
+
+
+class FakeBedrockClient:
+    """
+    Mimics bedrock_runtime.invoke_model.
+
+    Args:
+        latency_scale: Multiplier on the per-model latency (0 for instant replies)
+        garble: Model id substrings whose output is returned as non-JSON prose
+    """
+
+    def __init__(self, latency_scale: float = 1.0, garble: tuple[str, ...] = ()):
+        self.latency_scale = latency_scale
+        self.garble = garble
+        self.calls = []
+
+    def invoke_model(self, body: str, modelId: str, accept: str = None, contentType: str = None) -> dict:
+        self.calls.append(modelId)
+        latency, free_text_confidence, option_confidence = next(
+            (profile for key, profile in FAKE_MODELS.items() if key in modelId), (0.1, 0.7, 0.9)
+        )
+        time.sleep(latency * self.latency_scale)
+
+        request = json.loads(body)
+        prompt = "\n".join(
+            block.get("text", "") for message in request.get("messages", []) for block in message["content"]
+        )
+        question = _QUESTION.search(prompt)
+        options = _OPTIONS.search(prompt)
+
+        if options:
+            answer = options.group(1).split(", ")[0]
+            confidence = option_confidence
+        else:
+            answer = f"Answer to: {question.group(1) if question else 'question'}"
+            confidence = free_text_confidence
+
+        text = json.dumps({"answer": answer, "confidence": confidence, "reasoning": f"fake {modelId}",
+                           "intent": "unknown"})
+        if any(key in modelId for key in self.garble):
+            text = f"I think the answer is {answer}."
+
+        payload = {
+            "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+            "usage": {"inputTokens": len(body) // 4, "outputTokens": len(text) // 4},
+        }
+        return {"body": io.BytesIO(json.dumps(payload).encode())}
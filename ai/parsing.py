@@ -0,0 +1,252 @@
+"""
+Tolerant JSON extraction from model output.
+
+Models wrap their JSON in markdown fences, add prose before/after it, use
+single quotes or Python literals, and sometimes stop mid-object when they hit
+the token limit. These helpers locate the first balanced JSON object holding
+the answer (skipping braces in prose and example objects), repair the common
+deviations, and validate the result against AIResponse.
+"""
+
+import json
+import re
+
+from pydantic import ValidationError
+
+from models import AIResponse
+
+_FENCE = re.compile(r"```(?:json|JSON)?")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PY_LITERAL = re.compile(r"\b(True|False|None)\b")
+
+
+def extract_json_object(text: str, required_key: str | None = None) -> tuple[dict | None, bool]:
+    """
+    Finds and parses the first JSON object in text.
+
+    Args:
+        text: Model output
+        required_key: Skip objects without this key ("{placeholder}" prose or an
+            example object before the real answer)
+
+    Returns:
+        (object or None, repaired) where repaired is True if the object only
+        parsed after fixing quotes/literals/trailing commas or closing a
+        truncated object
+    """
+    if not text:
+        return None, False
+
+    def wanted(data) -> bool:
+        return isinstance(data, dict) and (required_key is None or required_key in data)
+
+    text = _FENCE.sub("", text)
+    start = text.find("{")
+    while start != -1:
+        end, closers, in_string = _scan_object(text, start)
+
+        if end is not None:
+            candidate = text[start:end + 1]
+            try:
+                data = json.loads(candidate)
+                if wanted(data):
+                    return data, False
+            except json.JSONDecodeError:
+                data = _loads_repaired(candidate)
+                if wanted(data):
+                    return data, True
+        else:
+            # Unbalanced: the output was cut off mid-object
+            data = _close_truncated(text[start:])
+            if wanted(data):
+                return data, True
+            if required_key is None:
+                return None, False
+
+        start = text.find("{", start + 1)
+
+    return None, False
+
+
+def parse_ai_response(text: str) -> tuple[AIResponse | None, bool]:
+    """
+    Extracts the model's JSON answer and validates it against AIResponse.
+
+    Returns:
+        (AIResponse or None, repaired)
+    """
+    data, repaired = extract_json_object(text, required_key="answer")
+    if not data:
+        return None, repaired
+
+    answer = data.get("answer")
+    if isinstance(answer, list):
+        answer = ", ".join(str(item) for item in answer)
+    elif isinstance(answer, bool):
+        answer = "Yes" if answer else "No"
+
+    try:
+        response = AIResponse.model_validate({
+            "answer": "" if answer is None else str(answer),
+            "confidence": _confidence(data.get("confidence")),
+            "reasoning": _optional_str(data.get("reasoning")),
+            "intent": _optional_str(data.get("intent")),
+        })
+    except ValidationError:
+        return None, repaired
+
+    return response, repaired
+
+
+def _scan_object(text: str, start: int) -> tuple[int | None, str, str | None]:
+    """
+    Walks from the '{' at start, tracking strings (either quote style) and nesting.
+
+    Returns:
+        (index of the matching '}' or None, pending closers, open string quote or None)
+    """
+    stack = []
+    quote = None
+    escaped = False
+
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote and not _is_apostrophe(text, i, quote):
+                quote = None
+            continue
+
+        if _opens_string(text, i):
+            quote = ch
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return i, "", None
+
+    return None, "".join(reversed(stack)), quote
+
+
+def _loads_repaired(candidate: str):
+    """Parses after converting single-quoted strings, Python literals and trailing commas"""
+    repaired = _normalize_quotes(candidate)
+    repaired = _PY_LITERAL.sub(lambda m: _PY_LITERALS[m.group(1)], repaired)
+    repaired = _TRAILING_COMMA.sub(r"\1", repaired)
+    try:
+        return json.loads(repaired, strict=False)
+    except json.JSONDecodeError:
+        return None
+
+
+def _normalize_quotes(text: str) -> str:
+    """Rewrites '...' strings as "..." strings, escaping embedded double quotes"""
+    out = []
+    quote = None
+    i = 0
+
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if ch == "\\" and i + 1 < len(text):
+                nxt = text[i + 1]
+                out.append("'" if quote == "'" and nxt == "'" else ch + nxt)
+                i += 2
+                continue
+            if ch == quote and not _is_apostrophe(text, i, quote):
+                quote = None
+                out.append('"')
+            elif ch == '"':
+                out.append('\\"')
+            else:
+                out.append(ch)
+        elif _opens_string(text, i):
+            quote = ch
+            out.append('"')
+        else:
+            out.append(ch)
+        i += 1
+
+    return "".join(out)
+
+
+def _close_truncated(fragment: str, max_cuts: int = 5):
+    """
+    Completes an object cut off mid-output by closing the open string and
+    brackets; if that does not parse, drops the last incomplete member and retries.
+    """
+    for _ in range(max_cuts + 1):
+        _, closers, quote = _scan_object(fragment, 0)
+        candidate = fragment.rstrip()
+        if quote:
+            candidate += quote
+        candidate = candidate.rstrip().rstrip(",:")
+        data = _loads_repaired(candidate + closers)
+        if isinstance(data, dict):
+            return data
+
+        cut = _last_top_level_comma(fragment)
+        if cut is None:
+            return None
+        fragment = fragment[:cut]
+
+    return None
+
+
+def _last_top_level_comma(fragment: str) -> int | None:
+    """Index of the last comma outside strings, or None"""
+    quote = None
+    escaped = False
+    last = None
+    for i, ch in enumerate(fragment):
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote and not _is_apostrophe(fragment, i, quote):
+                quote = None
+        elif _opens_string(fragment, i):
+            quote = ch
+        elif ch == ",":
+            last = i
+    return last
+
+
+def _opens_string(text: str, i: int) -> bool:
+    """A quote outside a string starts one, except an apostrophe inside a bare word"""
+    ch = text[i]
+    return ch == '"' or (ch == "'" and not (i > 0 and text[i - 1].isalnum()))
+
+
+def _is_apostrophe(text: str, i: int, quote: str) -> bool:
+    """Inside a single-quoted string, "don't" is an apostrophe, not the closing quote"""
+    return (quote == "'" and 0 < i < len(text) - 1
+            and text[i - 1].isalpha() and text[i + 1].isalpha())
+
+
+def _confidence(value) -> float:
+    """Coerces 0.8 / "0.8" / "80%" / 80 to a float in [0, 1]"""
+    try:
+        if isinstance(value, str):
+            value = value.strip()
+            percent = value.endswith("%")
+            value = float(value.rstrip("%"))
+            if percent:
+                value /= 100
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if value > 1:
+        value /= 100
+    return max(0.0, min(1.0, value))
+
+
+def _optional_str(value) -> str | None:
+    return None if value is None else str(value)
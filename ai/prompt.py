@@ -0,0 +1,101 @@
+"""
+Bedrock (Nova) request body builder.
+
+The instructions, canonical intents and response format never change between
+calls, so they live in a precompiled system prompt followed by a cache point.
+The user profile is identical for every question of one application, so it
+is the first block of the user message, followed by a second cache point.
+Only the question and its options are assembled per call, and the JSON
+encoding of the static part of the body is computed once.
+"""
+
+import json
+
+# Static system prompt (cacheable prefix)
+SYSTEM_PROMPT = """You are a job application assistant. You answer questions from job application forms on behalf of the candidate described in USER PROFILE.
+
+AVAILABLE INTENTS:
+personal.firstName, personal.lastName, personal.email, personal.phone, personal.linkedin,
+personal.city, personal.state, personal.country,
+workAuthorization.authorizedUS, workAuthorization.needsSponsorship,
+eeo.gender, eeo.race, eeo.veteran, eeo.disability
+
+INSTRUCTIONS:
+1. Select the BEST option or write the answer.
+2. Identify the intent.
+
+RESPONSE FORMAT (JSON ONLY):
+{
+    "answer": "value",
+    "confidence": 0.0-1.0,
+    "reasoning": "why",
+    "intent": "intent.name"
+}"""
+
+CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+_COMPACT = (",", ":")
+
+
+class PromptBuilder:
+    """
+    Builds invoke_model bodies from a pre-encoded prefix plus the per-call suffix.
+
+    Args:
+        system_prompt: Static instructions sent as the system prompt
+        max_new_tokens: Output token budget
+        cache: Insert cache points after the system prompt and the user profile
+    """
+
+    def __init__(self, system_prompt: str = SYSTEM_PROMPT, max_new_tokens: int = 1000, cache: bool = True):
+        self.system_prompt = system_prompt
+        self.cache = cache
+
+        system = [{"text": system_prompt}]
+        if cache:
+            system.append(CACHE_POINT)
+
+        # '{"inferenceConfig":...,"system":[...],"messages":' - closed per call
+        head = json.dumps({"inferenceConfig": {"max_new_tokens": max_new_tokens}, "system": system},
+                          separators=_COMPACT)
+        self._prefix = head[:-1] + ',"messages":'
+        self._cache_point = json.dumps(CACHE_POINT, separators=_COMPACT)
+
+    @staticmethod
+    def profile_text(user_profile: dict) -> str:
+        """
+        User profile block. Keys are sorted so the same profile always encodes
+        to the same bytes and hits the cache.
+        """
+        return "USER PROFILE: " + json.dumps(user_profile, separators=_COMPACT, sort_keys=True, default=str)
+
+    @staticmethod
+    def question_text(question: str, options: list[str] | None) -> str:
+        """Variable suffix: the question and its options"""
+        options_str = f"Available Options: {', '.join(options)}" if options else "Free text input"
+        return f"QUESTION: {question}\n{options_str}"
+
+    def body(self, question: str, options: list[str] | None, user_profile: dict) -> str:
+        """Complete invoke_model body for one question"""
+        blocks = [json.dumps({"text": self.profile_text(user_profile)})]
+        if self.cache:
+            blocks.append(self._cache_point)
+        blocks.append(json.dumps({"text": self.question_text(question, options)}))
+
+        return self._prefix + '[{"role":"user","content":[' + ",".join(blocks) + "]}]}"
+
+
+def token_usage(response_body: dict) -> dict:
+    """
+    Token counts reported by the runtime.
+
+    Returns:
+        {'input', 'output', 'cache_read', 'cache_write'} (0 where not reported)
+    """
+    usage = response_body.get("usage") or {}
+    return {
+        "input": usage.get("inputTokens", 0),
+        "output": usage.get("outputTokens", 0),
+        "cache_read": usage.get("cacheReadInputTokenCount", 0),
+        "cache_write": usage.get("cacheWriteInputTokenCount", 0),
+    }
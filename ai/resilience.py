@@ -0,0 +1,168 @@
+"""
+Upstream resilience: circuit breakers and hedged requests.
+
+A CircuitBreaker tracks the outcome of the last `window` calls to one
+upstream. Once at least `min_calls` have been made and the failure rate
+reaches `failure_rate`, or after `consecutive_failures` failures in a row
+(so an outage after a healthy period is not masked by the window's old
+successes), it opens and callers fail fast for `reset_timeout` seconds. After that a limited number of probe calls are let through
+(half-open): a successful probe closes the breaker, a failed one opens it again.
+
+hedged() sends a second identical request when the first has not answered
+within `delay`, and returns whichever answers first.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Shared pool for hedged requests (both the original and the hedge run here)
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open"""
+
+    def __init__(self, name: str):
+        super().__init__(f"{name} circuit open")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one upstream.
+
+    Args:
+        name: Upstream name (used in errors and health output)
+        failure_rate: Failure fraction over the window that opens the breaker
+        min_calls: Minimum calls in the window before the rate is evaluated
+        window: Number of most recent outcomes considered
+        consecutive_failures: Failures in a row that open the breaker regardless of the window
+        reset_timeout: Seconds to stay open before probing
+        half_open_calls: Concurrent probe calls allowed while half-open
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, min_calls: int = 5, window: int = 20,
+                 reset_timeout: float = 30.0, half_open_calls: int = 1, consecutive_failures: int = 3,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.consecutive_failures = consecutive_failures
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)
+        self._streak = 0  # Failures since the last success
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opens = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """True if a call may proceed; False (and counted as rejected) to fail fast"""
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_calls):
+                self.rejected += 1
+                return False
+            if state == HALF_OPEN:
+                self._probes += 1
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._streak = 0
+            if self._current_state() == HALF_OPEN:
+                self._state = CLOSED
+                self._outcomes.clear()
+            else:
+                self._outcomes.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._open()
+                return
+
+            self._outcomes.append(False)
+            self._streak += 1
+            calls = len(self._outcomes)
+            if self._streak >= self.consecutive_failures or (
+                calls >= self.min_calls and self._outcomes.count(False) / calls >= self.failure_rate
+            ):
+                self._open()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._outcomes)
+            failures = self._outcomes.count(False)
+            retry_in = self._opened_at + self.reset_timeout - self._clock() if state == OPEN else 0.0
+            return {
+                "state": state,
+                "calls": calls,
+                "failure_rate": round(failures / calls, 3) if calls else 0.0,
+                "consecutive_failures": self._streak,
+                "opens": self.opens,
+                "rejected": self.rejected,
+                "retry_in": round(max(0.0, retry_in), 3),
+            }
+
+    def _current_state(self) -> str:
+        """State, moving OPEN -> HALF_OPEN once reset_timeout has passed (lock held)"""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._streak = 0
+        self.opens += 1
+
+
+def hedged(call, delay: float | None, on_hedge=None):
+    """
+    Runs call(); if it has not finished after delay seconds, starts a second
+    call() and returns the first successful result. The slower call is left
+    to finish in the background.
+
+    Args:
+        call: Zero-argument callable performing an idempotent request
+        delay: Seconds before hedging; None or <= 0 disables hedging
+        on_hedge: Optional callback invoked when the hedge is sent
+    """
+    if not delay or delay <= 0:
+        return call()
+
+    first = _HEDGE_POOL.submit(call)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+
+    if on_hedge:
+        on_hedge()
+    pending = {first, _HEDGE_POOL.submit(call)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
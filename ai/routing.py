@@ -0,0 +1,114 @@
+"""
+Model routing: cheapest capable model first, escalate when the answer is weak.
+
+Questions are routed to a starting tier by field type, option count and
+expected answer length (select-type and short text questions start on the
+cheapest model, long free-text answers start one tier up). An answer is
+escalated to the next tier when it fails to parse, its confidence is below
+the threshold, or it matches none of the provided options.
+
+Configuration (AI_ROUTING env var, JSON, all keys optional):
+    {
+        "tiers": [{"name": "micro", "modelId": "...", "inputCost": 0.035, "outputCost": 0.14}, ...],
+        "escalateBelow": 0.6,
+        "maxEscalations": 1
+    }
+Costs are USD per million tokens.
+"""
+
+import json
+from typing import NamedTuple
+
+from matching import normalize
+from models import AIResponse
+
+
+class ModelTier(NamedTuple):
+    """A model and its price (USD per million tokens)"""
+    name: str
+    model_id: str
+    input_cost: float
+    output_cost: float
+
+    def cost(self, usage: dict) -> float:
+        """USD cost of one call from its token usage"""
+        return (usage.get("input", 0) * self.input_cost + usage.get("output", 0) * self.output_cost) / 1e6
+
+
+DEFAULT_TIERS = (
+    ModelTier("micro", "us.amazon.nova-micro-v1:0", 0.035, 0.14),
+    ModelTier("lite", "us.amazon.nova-lite-v1:0", 0.06, 0.24),
+    ModelTier("pro", "us.amazon.nova-pro-v1:0", 0.8, 3.2),
+)
+
+# Field types whose answers are written prose rather than picked or short
+LONG_ANSWER_TYPES = {"textarea"}
+
+# Question wording that asks for a written answer even in a text input
+LONG_ANSWER_WORDS = {"describe", "explain", "why", "tell", "summarize", "elaborate", "cover"}
+
+# Longer option lists are routed like free text questions
+MAX_ROUTED_OPTIONS = 50
+
+
+class ModelRouter:
+    """
+    Picks the tier sequence for a question and decides when to escalate.
+
+    Args:
+        tiers: Tiers ordered cheapest to strongest
+        escalate_below: Confidence under which an answer is escalated
+        max_escalations: Maximum number of escalations per question
+    """
+
+    def __init__(self, tiers: tuple[ModelTier, ...] = DEFAULT_TIERS, escalate_below: float = 0.6,
+                 max_escalations: int = 1):
+        if not tiers:
+            raise ValueError("ModelRouter needs at least one tier")
+        self.tiers = tuple(tiers)
+        self.escalate_below = escalate_below
+        self.max_escalations = max_escalations
+
+    @classmethod
+    def from_config(cls, config: str | dict | None) -> "ModelRouter":
+        """Builds a router from the AI_ROUTING JSON (string or dict); empty means defaults"""
+        if not config:
+            return cls()
+        if isinstance(config, str):
+            config = json.loads(config)
+
+        tiers = DEFAULT_TIERS
+        if config.get("tiers"):
+            tiers = tuple(
+                ModelTier(t["name"], t["modelId"], float(t.get("inputCost", 0)), float(t.get("outputCost", 0)))
+                for t in config["tiers"]
+            )
+        return cls(tiers, float(config.get("escalateBelow", 0.6)), int(config.get("maxEscalations", 1)))
+
+    def start_index(self, question: str, field_type: str, options: list[str] | None) -> int:
+        """Index of the starting tier for a question"""
+        if options and len(options) <= MAX_ROUTED_OPTIONS:
+            return 0
+        if field_type in LONG_ANSWER_TYPES or LONG_ANSWER_WORDS.intersection(normalize(question).split()):
+            return min(1, len(self.tiers) - 1)
+        return 0
+
+    def route(self, question: str, field_type: str, options: list[str] | None) -> tuple[ModelTier, ...]:
+        """Tiers to try in order: the starting tier plus up to max_escalations stronger ones"""
+        start = self.start_index(question, field_type, options)
+        return self.tiers[start:start + 1 + self.max_escalations]
+
+    def escalation_reason(self, response: AIResponse | None, options: list[str] | None) -> str | None:
+        """
+        Why an answer should be escalated, or None to accept it.
+
+        Returns:
+            "parse_error", "no_option_match", "low_confidence" or None
+        """
+        if response is None:
+            return "parse_error"
+        if options and response.optionIndex is None:
+            return "no_option_match"
+        if response.confidence < self.escalate_below:
+            return "low_confidence"
+        return None
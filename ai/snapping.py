@@ -0,0 +1,157 @@
+"""
+Option snapping for select-type questions.
+
+When the request carries the option list, the model's free-text answer is
+mapped onto one of those options so the executors receive the exact label
+(and its index) instead of having to fuzzy-match in the browser. For small
+option sets, well-known questions (gender, work authorization, country...)
+are first matched directly against the user profile without calling the
+model at all.
+"""
+
+import re
+
+from matching import best_match, normalize
+from models import AIResponse
+
+# Minimum score for snapping a model answer onto an option
+MIN_SNAP_SCORE = 0.6
+
+# Profile matches must be near-exact, since they skip the model entirely
+MIN_PROFILE_SCORE = 0.88
+
+# Only option sets up to this size are matched against the profile
+SMALL_OPTION_SET = 12
+
+# Boolean-ish answers mapped onto the usual option labels
+_SYNONYMS = {"true": "Yes", "false": "No", "y": "Yes", "n": "No"}
+
+# Question keywords -> canonical intent path of the profile field answering it
+QUESTION_INTENTS = (
+    (("gender",), "eeo.gender"),
+    (("race", "ethnicity", "hispanic", "latino"), "eeo.race"),
+    (("veteran",), "eeo.veteran"),
+    (("disability",), "eeo.disability"),
+    (("sponsorship", "sponsor"), "workAuthorization.needsSponsorship"),
+    (("authorized", "authorization", "eligible"), "workAuthorization.authorizedUS"),
+    (("country",), "personal.country"),
+    (("state", "province"), "personal.state"),
+)
+
+# The profile's work authorization answers are for the US: a question naming
+# another country ("...authorized to work in the United Kingdom?") goes to the model
+US_SCOPED_INTENTS = {"workAuthorization.authorizedUS", "workAuthorization.needsSponsorship"}
+US_NAMES = ("united states", "u s", "u s a", "america")
+_US_ABBREVIATION = re.compile(r"\bUSA?\b")  # Case-sensitive: "us" is also a pronoun
+OTHER_COUNTRIES = (
+    "united kingdom", "uk", "u k", "great britain", "britain", "england", "scotland", "wales",
+    "northern ireland", "ireland", "canada", "mexico", "brazil", "argentina", "chile", "colombia",
+    "peru", "germany", "france", "spain", "portugal", "italy", "netherlands", "belgium",
+    "luxembourg", "switzerland", "austria", "denmark", "sweden", "norway", "finland", "iceland",
+    "poland", "czech republic", "czechia", "hungary", "romania", "bulgaria", "greece", "turkey",
+    "ukraine", "estonia", "latvia", "lithuania", "israel", "united arab emirates", "uae",
+    "saudi arabia", "qatar", "egypt", "south africa", "nigeria", "kenya", "india", "pakistan",
+    "bangladesh", "sri lanka", "china", "hong kong", "taiwan", "japan", "south korea", "korea",
+    "singapore", "malaysia", "indonesia", "philippines", "thailand", "vietnam", "australia",
+    "new zealand", "european union", "eu", "eea", "europe",
+)
+
+
+def snap_answer(response: AIResponse, options: list[str] | None,
+                min_score: float = MIN_SNAP_SCORE) -> AIResponse:
+    """
+    Replaces response.answer with the best matching option text and sets
+    optionIndex / matchScore. Answers matching no option are returned
+    unchanged with matchScore 0.
+    """
+    if not options or not response.answer:
+        return response
+
+    answer = _SYNONYMS.get(normalize(response.answer), response.answer)
+    match = best_match(answer, options, min_score)
+    if match is None:
+        return response.model_copy(update={"optionIndex": None, "matchScore": 0.0})
+
+    return response.model_copy(update={
+        "answer": match.text,
+        "optionIndex": match.index,
+        "matchScore": match.score,
+    })
+
+
+def match_profile(question: str, options: list[str] | None, user_profile: dict,
+                  min_score: float = MIN_PROFILE_SCORE) -> AIResponse | None:
+    """
+    Answers a small select-type question straight from the profile.
+
+    Returns:
+        AIResponse if exactly one known intent matches the question and its
+        profile value matches an option, else None (ask the model)
+    """
+    if not options or len(options) > SMALL_OPTION_SET or not user_profile:
+        return None
+
+    words = set(normalize(question).split())
+    intents = [intent for keywords, intent in QUESTION_INTENTS if words.intersection(keywords)]
+    if len(intents) != 1:
+        return None
+
+    intent = intents[0]
+    if intent in US_SCOPED_INTENTS and not _about_us(question):
+        return None
+
+    value = profile_value(user_profile, intent)
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        value = "Yes" if value else "No"
+
+    match = best_match(str(value), options, min_score)
+    if match is None:
+        return None
+
+    return AIResponse(
+        answer=match.text,
+        confidence=round(0.95 * match.score, 3),
+        reasoning=f"Matched profile field {intent}",
+        intent=intent,
+        optionIndex=match.index,
+        matchScore=match.score,
+    )
+
+
+def _about_us(question: str) -> bool:
+    """True if the question names the US or no country at all"""
+    text = f" {normalize(question)} "
+    if _US_ABBREVIATION.search(question) or any(f" {name} " in text for name in US_NAMES):
+        return True
+    return not any(f" {name} " in text for name in OTHER_COUNTRIES)
+
+
+def profile_value(user_profile: dict, intent: str):
+    """
+    Looks up a profile value by intent path ("eeo.gender"), falling back to
+    the last path segment at any depth ("gender") for flat profiles.
+    """
+    node = user_profile
+    for part in intent.split("."):
+        if not isinstance(node, dict) or part not in node:
+            break
+        node = node[part]
+    else:
+        return node
+
+    return _find_key(user_profile, intent.rsplit(".", 1)[-1].casefold())
+
+
+def _find_key(node, key: str):
+    if not isinstance(node, dict):
+        return None
+    for name, value in node.items():
+        if str(name).casefold() == key and not isinstance(value, dict):
+            return value
+    for value in node.values():
+        found = _find_key(value, key)
+        if found is not None:
+            return found
+    return None
@@ -12,16 +12,32 @@ Environment Variables:
 - AWS_SECRET_ACCESS_KEY
 - AWS_REGION
 - PATTERN_API_URL (e.g., http://localhost:5000/api/patterns)
+- BEDROCK_PROMPT_CACHE (default: true) - cache points after the static prompt and user profile
+- PATTERN_HEDGE_DELAY (seconds, default: 0 = off) - send a second pattern search after this delay
+- AI_ROUTING (JSON, optional) - model tiers and escalation threshold (see ai/routing.py)
+- AI_BACKEND (default: bedrock) - "fake" answers from a local stand-in model backend
+- AI_WARMUP (default: true) - warm clients and connections at startup; /ready reports 503 until done
+
+boto3 and requests are imported on first use (during warmup) so the process
+starts serving /health without paying for them.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from models import AIRequest, AIResponse
+from responses import FastJSONResponse
+from ai import (
+    CircuitBreaker, CircuitOpenError, ModelRouter, ModelTier, PromptBuilder, hedged, match_profile,
+    parse_ai_response, snap_answer, token_usage
+)
+from metrics import Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE
+from contextlib import asynccontextmanager
 import logging
 import os
-import requests
+import threading
+import time
 import json
-import boto3
+from functools import partial
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -35,10 +51,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts warmup in the background so /health answers immediately"""
+    if WARMUP_ENABLED:
+        threading.Thread(target=run_warmup, name="warmup", daemon=True).start()
+    else:
+        WARMUP_DONE.set()
+    yield
+
 app = FastAPI(
     title="AI Service",
     description="AI Prediction Engine for Job Applications",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Enable CORS
@@ -52,6 +79,84 @@ app.add_middleware(
 
 # Configuration
 PATTERN_API_URL = os.environ.get('PATTERN_API_URL', 'http://localhost:3001/api/patterns')
+PROMPT_CACHE = os.environ.get('BEDROCK_PROMPT_CACHE', 'true').lower() not in ('0', 'false', 'no')
+
+PATTERN_HEDGE_DELAY = float(os.environ.get('PATTERN_HEDGE_DELAY', '0'))
+
+AI_BACKEND = os.environ.get('AI_BACKEND', 'bedrock').lower()
+WARMUP_ENABLED = os.environ.get('AI_WARMUP', 'true').lower() not in ('0', 'false', 'no')
+
+# Model tiers (cheapest first) and escalation rules
+ROUTER = ModelRouter.from_config(os.environ.get('AI_ROUTING'))
+
+# Lazily created clients (see bedrock_client / http_session)
+_clients_lock = threading.Lock()
+_bedrock = None
+_http = None
+
+# Set once startup warmup has finished (GET /ready)
+WARMUP_DONE = threading.Event()
+WARMUP_REPORT = {}
+
+# Per-upstream circuit breakers (state reported at /health)
+PATTERN_BREAKER = CircuitBreaker("pattern_api", reset_timeout=30.0)
+BEDROCK_BREAKER = CircuitBreaker("bedrock", reset_timeout=15.0)
+
+# Static prompt prefix, encoded once
+PROMPT_BUILDER = PromptBuilder(cache=PROMPT_CACHE)
+
+# Metrics (exported at /metrics)
+PREDICT_LATENCY = Histogram(
+    "ai_predict_duration_seconds",
+    "Latency of /predict by path taken (profile_match, memory_hit, model_call, parse_error, aws_error, credentials_missing)",
+    labels=("path",)
+)
+PREDICT_IN_FLIGHT = Gauge("ai_predict_in_flight", "Number of /predict requests currently being served")
+UPSTREAM_LATENCY = Histogram(
+    "ai_upstream_duration_seconds",
+    "Latency of upstream calls (pattern_api, bedrock)",
+    labels=("upstream", "operation")
+)
+UPSTREAM_ERRORS = Counter(
+    "ai_upstream_errors_total",
+    "Failed upstream calls (exceptions and non-2xx responses)",
+    labels=("upstream", "operation")
+)
+PARSE_OUTCOMES = Counter(
+    "ai_response_parse_total",
+    "Model outputs by parse outcome (json, repaired, reask, failed)",
+    labels=("outcome",)
+)
+
+MODEL_TOKENS = Counter(
+    "ai_model_tokens_total",
+    "Bedrock tokens by type (input, output, cache_read, cache_write)",
+    labels=("type",)
+)
+
+UPSTREAM_REJECTED = Counter(
+    "ai_upstream_rejected_total",
+    "Upstream calls skipped because the circuit breaker was open",
+    labels=("upstream",)
+)
+TIER_CALLS = Counter("ai_model_tier_calls_total", "Model calls per routing tier", labels=("tier",))
+TIER_LATENCY = Histogram(
+    "ai_model_tier_duration_seconds",
+    "Latency of one tier attempt (model call, parsing and any re-ask)",
+    labels=("tier",)
+)
+TIER_COST = Counter("ai_model_tier_cost_usd_total", "Estimated model cost per routing tier (USD)", labels=("tier",))
+ESCALATIONS = Counter(
+    "ai_model_escalations_total",
+    "Answers escalated to a stronger tier, by reason (parse_error, no_option_match, low_confidence)",
+    labels=("from_tier", "to_tier", "reason")
+)
+PATTERN_HEDGES = Counter("ai_pattern_hedged_total", "Pattern searches that sent a hedged second request")
+
+WARMUP_SECONDS = Gauge("ai_warmup_duration_seconds", "Startup warmup time per component", labels=("component",))
+
+# Output budget for the constrained re-ask when the first answer is unparseable
+REASK_MAX_TOKENS = 200
 
 def check_pattern_memory(question: str) -> dict | None:
     """
@@ -61,15 +166,25 @@ def check_pattern_memory(question: str) -> dict | None:
     try:
         if not PATTERN_API_URL:
             return None
+        if not PATTERN_BREAKER.allow():
+            UPSTREAM_REJECTED.inc(upstream="pattern_api")
+            return None
             
         # Search for the specific question
-        response = requests.get(
+        search = partial(
+            http_session().get,
             f"{PATTERN_API_URL}/search",
             params={'q': question},
             timeout=2.0
         )
+        with UPSTREAM_LATENCY.time(upstream="pattern_api", operation="search"):
+            response = hedged(search, PATTERN_HEDGE_DELAY, on_hedge=PATTERN_HEDGES.inc)
         
-        if response.status_code == 200:
+        if response.status_code != 200:
+            PATTERN_BREAKER.record_failure()
+            UPSTREAM_ERRORS.inc(upstream="pattern_api", operation="search")
+        else:
+            PATTERN_BREAKER.record_success()
             results = response.json().get('patterns', [])
             if results and len(results) > 0:
                 # Basic exact match check or high confidence check could go here
@@ -80,6 +195,8 @@ def check_pattern_memory(question: str) -> dict | None:
                 return first_match
                 
     except Exception as e:
+        PATTERN_BREAKER.record_failure()
+        UPSTREAM_ERRORS.inc(upstream="pattern_api", operation="search")
         logger.warning(f"Failed to check pattern memory: {str(e)}")
         
     return None
@@ -91,6 +208,9 @@ def save_learned_pattern(question: str, answer: str, intent: str, confidence: fl
     try:
         if not PATTERN_API_URL:
             return
+        if not PATTERN_BREAKER.allow():
+            UPSTREAM_REJECTED.inc(upstream="pattern_api")
+            return
             
         payload = {
             "pattern": {
@@ -103,126 +223,317 @@ def save_learned_pattern(question: str, answer: str, intent: str, confidence: fl
             }
         }
         
-        requests.post(
-            f"{PATTERN_API_URL}/upload",
-            json=payload,
-            timeout=2.0
-        )
+        with UPSTREAM_LATENCY.time(upstream="pattern_api", operation="upload"):
+            response = http_session().post(
+                f"{PATTERN_API_URL}/upload",
+                json=payload,
+                timeout=2.0
+            )
+        if not response.ok:
+            PATTERN_BREAKER.record_failure()
+            UPSTREAM_ERRORS.inc(upstream="pattern_api", operation="upload")
+        else:
+            PATTERN_BREAKER.record_success()
         logger.info(f"💾 [AI Service] Saved to memory: '{question}' -> '{answer}' (Intent: {intent})")
         
     except Exception as e:
+        PATTERN_BREAKER.record_failure()
+        UPSTREAM_ERRORS.inc(upstream="pattern_api", operation="upload")
         logger.warning(f"Failed to save pattern: {str(e)}")
 
 @app.post("/predict", response_model=AIResponse)
-async def predict_answer(request: AIRequest):
+def predict_answer(request: AIRequest):
     """
     Predict answer using Pattern Memory (1st) or AWS Bedrock (2nd).
+    Plain def: the pipeline blocks (boto3, requests), so FastAPI runs it in
+    its threadpool and the event loop stays free for /metrics and /health.
+    """
+    started = time.perf_counter()
+    path = "aws_error"
+    PREDICT_IN_FLIGHT.inc()
+    try:
+        response, path = _predict(request)
+        return FastJSONResponse(response)  # Serialized once, skipping the response_model pass
+    finally:
+        PREDICT_IN_FLIGHT.dec()
+        PREDICT_LATENCY.observe(time.perf_counter() - started, path=path)
+
+def _predict(request: AIRequest) -> tuple[AIResponse, str]:
+    """
+    Runs the prediction pipeline.
+
+    Returns:
+        (response, path) where path labels the route taken for metrics
     """
     logger.info(f"Prediction requested for: {request.question}")
 
+    # 0. Small select questions answered straight from the profile
+    profile_match = match_profile(request.question, request.options, request.userProfile)
+    if profile_match:
+        logger.info(f"Matched profile: {profile_match.answer}")
+        return profile_match, "profile_match"
+
     # 1. Check Memory
     memory_match = check_pattern_memory(request.question)
     if memory_match:
         logger.info(f"Found in memory: {memory_match.get('answer')}")
-        return AIResponse(
+        return snap_answer(AIResponse(
             answer=memory_match.get('answer', ''),
             confidence=0.95, # High confidence for memorized answers
             reasoning="Retrieved from Pattern Memory"
-        )
+        ), request.options), "memory_hit"
 
-    # 2. Ask AI (AWS Bedrock)
+    # 2. Ask AI (AWS Bedrock), cheapest suitable tier first
     try:
-        aws_region = os.environ.get('AWS_REGION', 'us-east-1')
+        bedrock = bedrock_client()
+        if bedrock is None:
+            return AIResponse(answer="", confidence=0, reasoning="AWS Credentials Missing"), "credentials_missing"
+
+        body = PROMPT_BUILDER.body(request.question, request.options, request.userProfile)
+        tiers = ROUTER.route(request.question, request.fieldType, request.options)
+
+        ai_response = None
+        for position, tier in enumerate(tiers):
+            try:
+                attempt = ask_model(bedrock, tier, body, request.options)
+            except Exception as e:
+                if ai_response is None:
+                    raise
+                # Escalation failed (circuit open, Bedrock error): keep the answer in hand
+                logger.warning(f"Escalation to {tier.name} failed, keeping the earlier answer: {str(e)}")
+                break
+            if attempt is not None and (
+                ai_response is None
+                or _answer_rank(attempt, request.options) >= _answer_rank(ai_response, request.options)
+            ):
+                ai_response = attempt
+
+            reason = ROUTER.escalation_reason(attempt, request.options)
+            if reason is None or position == len(tiers) - 1:
+                break
+            next_tier = tiers[position + 1]
+            ESCALATIONS.inc(from_tier=tier.name, to_tier=next_tier.name, reason=reason)
+            logger.info(f"Escalating {tier.name} -> {next_tier.name} ({reason})")
+
+        if ai_response is None:
+            return AIResponse(answer="", confidence=0, reasoning="AI JSON Parse Error"), "parse_error"
+
+        # 3. Save to Memory (an answer that matched none of the options would be replayed wrong)
+        if not request.options or ai_response.optionIndex is not None:
+            save_learned_pattern(
+                request.question,
+                ai_response.answer,
+                ai_response.intent or 'unknown',
+                ai_response.confidence
+            )
+
+        return ai_response, "model_call"
+
+    except Exception as e:
+        logger.error(f"AWS Bedrock error: {str(e)}")
+        return AIResponse(answer="", confidence=0, reasoning=f"AWS Error: {str(e)}"), "aws_error"
+
+def _answer_rank(response: AIResponse, options: list[str] | None) -> tuple[bool, bool, float]:
+    """
+    Sort key for answers from different tiers: accepted answers (no escalation
+    reason) first, then answers that matched an option, then confidence.
+    """
+    accepted = ROUTER.escalation_reason(response, options) is None
+    matched = not options or response.optionIndex is not None
+    return accepted, matched, response.confidence
+
+def bedrock_client():
+    """
+    Shared bedrock-runtime client (boto3 clients are thread-safe), the local
+    fake when AI_BACKEND=fake, or None if AWS credentials are missing.
+    Created on first use; warmup creates it at startup.
+    """
+    global _bedrock
+    if _bedrock is not None:
+        return _bedrock
+
+    if AI_BACKEND == "fake":
+        from ai.fake_backend import FakeBedrockClient
+        client = FakeBedrockClient()
+    else:
         aws_access_key = os.environ.get('AWS_ACCESS_KEY_ID')
         aws_secret_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
-        
         if not aws_access_key or not aws_secret_key:
-            return AIResponse(answer="", confidence=0, reasoning="AWS Credentials Missing")
+            return None
 
-        bedrock = boto3.client(
+        import boto3
+        client = boto3.client(
             service_name='bedrock-runtime',
-            region_name=aws_region,
+            region_name=os.environ.get('AWS_REGION', 'us-east-1'),
             aws_access_key_id=aws_access_key,
             aws_secret_access_key=aws_secret_key
         )
-        
-        options_str = f"Available Options: {', '.join(request.options)}" if request.options else "Free text input"
-        
-        # Define canonical intents
-        canonical_intents = """
-        AVAILABLE INTENTS:
-        personal.firstName, personal.lastName, personal.email, personal.phone, personal.linkedin, 
-        personal.city, personal.state, personal.country,
-        workAuthorization.authorizedUS, workAuthorization.needsSponsorship,
-        eeo.gender, eeo.race, eeo.veteran, eeo.disability
-        """
-        
-        prompt = f"""
-        You are a job application assistant.
-        USER PROFILE: {json.dumps(request.userProfile, indent=2)}
-        QUESTION: {request.question}
-        {options_str}
-        {canonical_intents}
-        
-        INSTRUCTIONS:
-        1. Select the BEST option or write the answer.
-        2. Identify the intent.
-        
-        RESPONSE FORMAT (JSON ONLY):
-        {{
-            "answer": "value",
-            "confidence": 0.0-1.0,
-            "reasoning": "why",
-            "intent": "intent.name"
-        }}
-        """
-        
-        body = json.dumps({
-            "inferenceConfig": {"max_new_tokens": 1000},
-            "messages": [{"role": "user", "content": [{"text": prompt}]}]
-        })
-        
-        model_id = "us.amazon.nova-lite-v1:0"
-        
-        response = bedrock.invoke_model(
-            body=body,
-            modelId=model_id,
-            accept="application/json",
-            contentType="application/json"
-        )
-        
-        response_body = json.loads(response.get("body").read())
-        content_text = response_body["output"]["message"]["content"][0]["text"]
-        
-        # Parse JSON from AI response
+
+    with _clients_lock:
+        if _bedrock is None:
+            _bedrock = client
+    return _bedrock
+
+def http_session():
+    """
+    Shared requests.Session for the pattern API, so searches and uploads reuse
+    keep-alive connections. Created on first use; warmup creates it at startup.
+    """
+    global _http
+    if _http is None:
+        with _clients_lock:
+            if _http is None:
+                import requests
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=16)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http = session
+    return _http
+
+def run_warmup() -> dict:
+    """
+    Creates the Bedrock client and pattern API session and opens their
+    connections, then marks the service ready. Failures are logged and
+    reported but do not block readiness (the request path retries lazily).
+    """
+    started = time.perf_counter()
+    for component, warm in (("bedrock", _warm_bedrock), ("pattern_api", _warm_pattern_api)):
+        component_started = time.perf_counter()
         try:
-            # Clean up potential markdown formatting
-            clean_text = content_text.replace("```json", "").replace("```", "").strip()
-            ai_data = json.loads(clean_text)
-            
-            # 3. Save to Memory
-            save_learned_pattern(
-                request.question, 
-                ai_data.get('answer'), 
-                ai_data.get('intent', 'unknown'),
-                ai_data.get('confidence', 0.5)
-            )
-            
-            return AIResponse(
-                answer=ai_data.get('answer', ''),
-                confidence=ai_data.get('confidence', 0.0),
-                reasoning=ai_data.get('reasoning', ''),
-                intent=ai_data.get('intent')
+            detail, ok = warm(), True
+        except Exception as e:
+            detail, ok = str(e), False
+            logger.warning(f"Warmup of {component} failed: {detail}")
+        seconds = time.perf_counter() - component_started
+        WARMUP_SECONDS.set(seconds, component=component)
+        WARMUP_REPORT[component] = {"ok": ok, "seconds": round(seconds, 3), "detail": detail}
+
+    logger.info(f"Warmup finished in {time.perf_counter() - started:.2f}s")
+    WARMUP_DONE.set()
+    return WARMUP_REPORT
+
+def _warm_bedrock() -> str:
+    client = bedrock_client()
+    if client is None:
+        return "skipped: AWS credentials missing"
+    if AI_BACKEND == "fake":
+        return "fake backend"
+
+    # An invalid model id fails validation server-side without running
+    # inference, but completes DNS, TLS and request signing on the pooled connection
+    try:
+        client.invoke_model(body=b"{}", modelId="warmup", accept="application/json",
+                            contentType="application/json")
+    except client.exceptions.ClientError as e:
+        return f"connected ({e.response['Error']['Code']})"
+    return "connected"
+
+def _warm_pattern_api() -> str:
+    session = http_session()
+    if not PATTERN_API_URL:
+        return "skipped: PATTERN_API_URL not set"
+
+    # Opens the keep-alive connection and primes the pattern store's search index
+    response = session.get(f"{PATTERN_API_URL}/search", params={'q': 'warmup'}, timeout=2.0)
+    return f"HTTP {response.status_code}"
+
+def ask_model(bedrock, tier: ModelTier, body: str, options: list[str] | None) -> AIResponse | None:
+    """
+    Asks one tier and returns its parsed, option-snapped answer (None if unparseable).
+    Records per-tier latency, calls and cost.
+    """
+    TIER_CALLS.inc(tier=tier.name)
+    with TIER_LATENCY.time(tier=tier.name):
+        content_text, usage = invoke_model(bedrock, tier.model_id, body)
+
+        # Parse JSON from AI response
+        ai_response, repaired = parse_ai_response(content_text)
+        outcome = "repaired" if repaired else "json"
+        if ai_response is None:
+            logger.warning("Unparseable AI response, re-asking for JSON only")
+            reask_text, reask_usage = reask_json(bedrock, tier.model_id, content_text)
+            usage = {key: usage[key] + reask_usage[key] for key in usage}
+            ai_response, _ = parse_ai_response(reask_text)
+            outcome = "reask"
+    TIER_COST.inc(tier.cost(usage), tier=tier.name)
+
+    if ai_response is None:
+        PARSE_OUTCOMES.inc(outcome="failed")
+        logger.error(f"Failed to parse AI JSON response ({tier.name})")
+        return None
+
+    PARSE_OUTCOMES.inc(outcome=outcome)
+    return snap_answer(ai_response, options)
+
+def invoke_model(bedrock, model_id: str, body: str) -> tuple[str, dict]:
+    """
+    Calls Bedrock and returns the text of the first output message and the token usage.
+    Raises CircuitOpenError without calling when Bedrock keeps failing.
+    """
+    if not BEDROCK_BREAKER.allow():
+        UPSTREAM_REJECTED.inc(upstream="bedrock")
+        raise CircuitOpenError(BEDROCK_BREAKER.name)
+
+    try:
+        with UPSTREAM_LATENCY.time(upstream="bedrock", operation="invoke_model"):
+            response = bedrock.invoke_model(
+                body=body,
+                modelId=model_id,
+                accept="application/json",
+                contentType="application/json"
             )
-            
-        except json.JSONDecodeError:
-            logger.error("Failed to parse AI JSON response")
-            return AIResponse(answer="", confidence=0, reasoning="AI JSON Parse Error")
-            
-    except Exception as e:
-        logger.error(f"AWS Bedrock error: {str(e)}")
-        return AIResponse(answer="", confidence=0, reasoning=f"AWS Error: {str(e)}")
+    except Exception:
+        BEDROCK_BREAKER.record_failure()
+        UPSTREAM_ERRORS.inc(upstream="bedrock", operation="invoke_model")
+        raise
+    BEDROCK_BREAKER.record_success()
+
+    response_body = json.loads(response.get("body").read())
+
+    usage = token_usage(response_body)
+    for token_type, count in usage.items():
+        if count:
+            MODEL_TOKENS.inc(count, type=token_type)
+    logger.info(f"Bedrock tokens ({model_id}): {usage['input']} in ({usage['cache_read']} cached), {usage['output']} out")
+
+    return response_body["output"]["message"]["content"][0]["text"], usage
+
+def reask_json(bedrock, model_id: str, content_text: str) -> tuple[str, dict]:
+    """
+    Cheap follow-up call asking the model to restate its previous output as
+    the bare JSON object, with a small output budget.
+    """
+    prompt = (
+        "Rewrite the following answer as a single JSON object with exactly the keys "
+        '"answer" (string), "confidence" (number 0-1), "reasoning" (string) and '
+        '"intent" (string). Output ONLY the JSON object.\n\n'
+        f"ANSWER:\n{content_text[:2000]}"
+    )
+    body = json.dumps({
+        "inferenceConfig": {"max_new_tokens": REASK_MAX_TOKENS, "temperature": 0},
+        "messages": [{"role": "user", "content": [{"text": prompt}]}]
+    })
+    return invoke_model(bedrock, model_id, body)
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok", "service": "ai-service"}
+    """Liveness: the process is up (does not wait for warmup)"""
+    return {
+        "status": "ok",
+        "service": "ai-service",
+        "breakers": {breaker.name: breaker.to_dict() for breaker in (PATTERN_BREAKER, BEDROCK_BREAKER)}
+    }
+
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness: 200 once startup warmup has finished, 503 before"""
+    if not WARMUP_DONE.is_set():
+        response.status_code = 503
+        return {"status": "warming_up"}
+    return {"status": "ready", "warmup": WARMUP_REPORT}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: /predict latency by path, upstream latency/errors, in-flight requests"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
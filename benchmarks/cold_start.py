@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Cold-start timing for the AI service.
+
+Starts `uvicorn app:app` in a fresh process and measures, from process spawn:
+time until /health answers (liveness), time until /ready answers 200 (warm),
+and the latency of the first and second /predict calls. Repeats for several
+runs and prints the median of each.
+
+The server runs with AI_BACKEND=fake unless --backend bedrock is given, so
+the timings do not depend on (or bill) a live model.
+
+Usage (from the repository root):
+    python -m benchmarks.cold_start                      # fake backend, no AWS needed
+    python -m benchmarks.cold_start --backend bedrock    # real model calls
+    python -m benchmarks.cold_start --no-warmup          # AI_WARMUP=false for comparison
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_REQUEST = {
+    "question": "Are you willing to relocate?",
+    "options": ["Yes", "No"],
+    "fieldType": "dropdown_custom",
+    "userProfile": {"firstName": "Jane", "lastName": "Doe"},
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _status(url: str, timeout: float = 1.0) -> int | None:
+    """HTTP status of a GET, or None if the server is not accepting connections yet"""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None
+
+
+def _wait_for(url: str, started: float, deadline: float, ok=lambda status: status is not None) -> float | None:
+    """Seconds since started until url satisfies ok(status), or None on deadline"""
+    while time.perf_counter() < deadline:
+        if ok(_status(url)):
+            return time.perf_counter() - started
+        time.sleep(0.02)
+    return None
+
+
+def _predict(base_url: str) -> float:
+    request = urllib.request.Request(
+        f"{base_url}/predict",
+        data=json.dumps(SAMPLE_REQUEST).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=60) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def run_once(warmup: bool, timeout: float, backend: str = "fake") -> dict:
+    """One cold start: spawn the server, time liveness/readiness/first predictions, stop it"""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "AI_BACKEND": backend, "AI_WARMUP": "true" if warmup else "false"}
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        live = _wait_for(f"{base_url}/health", started, deadline)
+        ready = _wait_for(f"{base_url}/ready", started, deadline, ok=lambda status: status == 200)
+        if live is None or ready is None:
+            raise RuntimeError(f"server did not become ready within {timeout}s")
+
+        return {
+            "live": live,
+            "ready": ready,
+            "first_predict": _predict(base_url),
+            "second_predict": _predict(base_url),
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="AI service cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts to measure")
+    parser.add_argument("--no-warmup", action="store_true", help="Start with AI_WARMUP=false")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-run startup timeout (s)")
+    parser.add_argument("--backend", choices=("fake", "bedrock"), default="fake",
+                        help="AI_BACKEND of the server (default: fake)")
+    args = parser.parse_args(argv)
+
+    runs = [run_once(not args.no_warmup, args.timeout, args.backend) for _ in range(args.runs)]
+
+    print(f"{'metric':<18}{'median (s)':>12}{'min (s)':>10}{'max (s)':>10}")
+    for metric in ("live", "ready", "first_predict", "second_predict"):
+        values = [run[metric] for run in runs]
+        print(f"{metric:<18}{statistics.median(values):>12.3f}{min(values):>10.3f}{max(values):>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+/*
+ * Greenhouse widget stand-ins for the offline benchmark fixtures.
+ *
+ * Reproduces the DOM and keyboard behaviour the executors and scanner rely on:
+ * - React-Select comboboxes (class names, aria attributes, contains-filter, ENTER to select)
+ * - Upload sections with a hidden file input, progress bar and XHR upload
+ * - Button-style radio groups (role="radio" + aria-checked)
+ * - Multi-step forms revealed by "Next" buttons
+ * - Question options taken from the embedded job post JSON when data-options is absent
+ */
+(function () {
+    var uid = 0;
+
+    // Options for a question field from the embedded job post (window.__remixContext)
+    function embeddedOptions(name) {
+        var context = window.__remixContext || {};
+        var loaderData = (context.state && context.state.loaderData) || {};
+        for (var route in loaderData) {
+            var questions = (loaderData[route].jobPost || {}).questions || [];
+            for (var i = 0; i < questions.length; i++) {
+                var fields = questions[i].fields || [];
+                for (var j = 0; j < fields.length; j++) {
+                    if (fields[j].name === name) {
+                        return (fields[j].values || []).map(function (v) { return v.label; });
+                    }
+                }
+            }
+        }
+        return [];
+    }
+
+    function buildSelect(host) {
+        var n = uid++;
+        var inputId = host.getAttribute('data-input-id');
+        var options = host.hasAttribute('data-options')
+            ? JSON.parse(host.getAttribute('data-options'))
+            : embeddedOptions(inputId);
+        var lazy = host.hasAttribute('data-async');
+
+        host.className = 'select__container';
+        host.innerHTML =
+            '<div class="select__control">' +
+                '<div class="select__value-container">' +
+                    '<div class="select__placeholder">Select...</div>' +
+                    '<div class="select__input-container">' +
+                        '<input type="text" class="select__input" role="combobox" autocomplete="off" ' +
+                        'aria-autocomplete="list" aria-expanded="false" aria-haspopup="true">' +
+                    '</div>' +
+                '</div>' +
+                '<div class="select__indicators"><span class="select__indicator">&#9662;</span></div>' +
+            '</div>';
+
+        var input = host.querySelector('input');
+        input.id = inputId;
+        input.setAttribute('aria-labelledby', input.id + '-label');
+        if (host.hasAttribute('data-required')) input.setAttribute('aria-required', 'true');
+
+        var valueBox = host.querySelector('.select__value-container');
+        var placeholder = host.querySelector('.select__placeholder');
+        var menu = null, filtered = [], focused = 0;
+
+        function optionId(index) {
+            return 'react-select-' + n + '-option-' + index;
+        }
+
+        function render() {
+            if (!menu) return;
+            menu.innerHTML = '';
+            filtered.forEach(function (index, position) {
+                var node = document.createElement('div');
+                node.id = optionId(index);
+                node.setAttribute('role', 'option');
+                node.className = 'select__option' + (position === focused ? ' select__option--is-focused' : '');
+                node.textContent = options[index];
+                node.addEventListener('mousedown', function (e) {
+                    e.preventDefault();
+                    choose(index);
+                });
+                menu.appendChild(node);
+            });
+            if (!filtered.length) {
+                menu.innerHTML = '<div class="select__menu-notice">No options</div>';
+            }
+            if (filtered.length) {
+                input.setAttribute('aria-activedescendant', optionId(filtered[focused]));
+            } else {
+                input.removeAttribute('aria-activedescendant');
+            }
+        }
+
+        function filter() {
+            var query = input.value.trim().toLowerCase();
+            filtered = [];
+            // Async menus (school pickers) only load options once the user types
+            if (!lazy || query) {
+                options.forEach(function (option, index) {
+                    if (option.toLowerCase().indexOf(query) !== -1) filtered.push(index);
+                });
+            }
+            focused = 0;
+            render();
+        }
+
+        function open() {
+            if (menu) return;
+            menu = document.createElement('div');
+            menu.className = 'select__menu';
+            menu.setAttribute('role', 'listbox');
+            menu.id = 'react-select-' + n + '-listbox';
+            host.appendChild(menu);
+            input.setAttribute('aria-expanded', 'true');
+            input.setAttribute('aria-controls', menu.id);
+            filter();
+        }
+
+        function close() {
+            if (!menu) return;
+            menu.remove();
+            menu = null;
+            input.setAttribute('aria-expanded', 'false');
+            input.removeAttribute('aria-controls');
+            input.removeAttribute('aria-activedescendant');
+        }
+
+        function choose(index) {
+            input.value = '';
+            var single = host.querySelector('.select__single-value');
+            if (!single) {
+                single = document.createElement('div');
+                single.className = 'select__single-value';
+                valueBox.insertBefore(single, valueBox.firstChild);
+            }
+            single.textContent = options[index];
+            placeholder.style.display = 'none';
+            close();
+        }
+
+        host.querySelector('.select__control').addEventListener('mousedown', function (e) {
+            if (e.target !== input) e.preventDefault();
+            input.focus();
+            open();
+        });
+
+        input.addEventListener('input', function () {
+            open();
+            filter();
+        });
+
+        input.addEventListener('keydown', function (e) {
+            if (e.key === 'ArrowDown') {
+                e.preventDefault();
+                if (!menu) { open(); return; }
+                focused = Math.min(focused + 1, filtered.length - 1);
+                render();
+            } else if (e.key === 'ArrowUp') {
+                e.preventDefault();
+                focused = Math.max(focused - 1, 0);
+                render();
+            } else if (e.key === 'Enter') {
+                if (menu && filtered.length) {
+                    e.preventDefault();
+                    choose(filtered[focused]);
+                }
+            } else if (e.key === 'Escape') {
+                close();
+            }
+        });
+
+        input.addEventListener('blur', function () {
+            input.value = '';
+            close();
+        });
+    }
+
+    function buildUpload(section) {
+        var input = section.querySelector('input[type="file"]');
+        var filename = section.querySelector('.filename');
+        var progress = section.querySelector('.upload-progress');
+
+        section.querySelector('button.attach').addEventListener('click', function (e) {
+            e.preventDefault();
+            input.click();
+        });
+
+        input.addEventListener('change', function () {
+            if (!input.files.length) return;
+            var file = input.files[0];
+            var body = new FormData();
+            body.append('file', file);
+
+            filename.textContent = '';
+            progress.hidden = false;
+
+            var xhr = new XMLHttpRequest();
+            xhr.open('POST', '/upload');
+            xhr.onload = function () {
+                progress.hidden = true;
+                filename.textContent = file.name;
+            };
+            xhr.send(body);
+        });
+    }
+
+    function buildButtonRadios(group) {
+        var buttons = group.querySelectorAll('[role="radio"]');
+        Array.prototype.forEach.call(buttons, function (button) {
+            button.addEventListener('click', function (e) {
+                e.preventDefault();
+                Array.prototype.forEach.call(buttons, function (other) {
+                    other.setAttribute('aria-checked', other === button ? 'true' : 'false');
+                });
+            });
+        });
+    }
+
+    function buildSteps() {
+        Array.prototype.forEach.call(document.querySelectorAll('[data-next]'), function (button) {
+            button.addEventListener('click', function (e) {
+                e.preventDefault();
+                var current = button.closest('.step');
+                var next = document.getElementById(button.getAttribute('data-next'));
+                // Steps render after a short delay, like a client-side route change
+                setTimeout(function () {
+                    current.hidden = true;
+                    next.hidden = false;
+                }, 150);
+            });
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        Array.prototype.forEach.call(document.querySelectorAll('[data-react-select]'), buildSelect);
+        Array.prototype.forEach.call(document.querySelectorAll('[data-upload]'), buildUpload);
+        Array.prototype.forEach.call(document.querySelectorAll('[role="radiogroup"]'), buildButtonRadios);
+        buildSteps();
+    });
+})();
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the scanner and executors.
+
+Serves the saved Greenhouse fixture pages from a local HTTP server, runs
+FormScanner.scan_application and every executor in executor.EXECUTORS against
+them in headless Chrome, and reports wall time, WebDriver command count and
+success rate per field type. Results are compared against the committed
+baseline (benchmarks/baseline.json) so performance regressions fail the run.
+A missing baseline fails the run too (exit code 2) unless --no-baseline asks
+for a report without comparison; re-record it with --update-baseline when the
+gate moves to a different machine.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --update-baseline
+    python -m benchmarks.run_benchmarks --no-baseline    # report only, no regression gate
+    python -m benchmarks.run_benchmarks --fixtures greenhouse_multistep --output bench_output.txt
+    python -m benchmarks.run_benchmarks --static-only   # browserless static scanner only
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from driver import create_driver
+from executor import EXECUTORS
+from instrumentation import RECORDER, span
+from models import Action
+from scanner import FormScanner
+from scanner.static_scanner import scan_html
+from matching import normalize
+from verifier import verify_plan
+
+logger = logging.getLogger(__name__)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# Simulated server-side processing time for Greenhouse resume uploads
+UPLOAD_DELAY = 0.3
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    """Serves fixture files and accepts uploads like Greenhouse's upload endpoint"""
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        time.sleep(UPLOAD_DELAY)
+
+        body = json.dumps({"status": "ok", "bytes": length}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("fixture server: " + format, *args)
+
+
+class FixtureServer:
+    """Runs the fixture HTTP server on a free local port for the duration of a with-block"""
+
+    def __init__(self, directory: str = FIXTURES_DIR):
+        handler = partial(FixtureRequestHandler, directory=directory)
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def load_fixtures(names: list[str] | None = None) -> dict[str, dict]:
+    """Loads fixture specs (page, expected questions, fill plan actions) by name"""
+    fixtures = {}
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        name, ext = os.path.splitext(filename)
+        if ext != ".json" or (names and name not in names):
+            continue
+        with open(os.path.join(FIXTURES_DIR, filename), encoding="utf-8") as f:
+            fixtures[name] = json.load(f)
+    return fixtures
+
+
+def bench_scan(driver, name: str, url: str, fixture: dict) -> dict:
+    """Scans a fixture page and scores the questions found against the expected labels"""
+    scanner = FormScanner(driver)
+
+    with RECORDER.job(f"scan:{name}") as trace:
+        started = time.perf_counter()
+        result = scanner.scan_application(url)
+        elapsed = time.perf_counter() - started
+
+    found = {normalize(q["questionText"]) for q in result["questions"]}
+    expected = fixture["expectedQuestions"]
+    hits = sum(1 for label in expected if any(normalize(label) in text for text in found))
+
+    return {
+        "time": round(elapsed, 3),
+        "commands": trace.commands,
+        "questions": result["total"],
+        "success_rate": round(hits / len(expected), 3) if expected else 1.0,
+        "phases": trace.to_dict()["by_scope"],
+    }
+
+
+def bench_static(name: str, fixture: dict, repeat: int = 20) -> dict:
+    """Static (browserless) scan of the fixture HTML: timing, coverage, and whether Selenium is still needed"""
+    with open(os.path.join(FIXTURES_DIR, fixture["page"]), encoding="utf-8") as f:
+        html = f.read()
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = scan_html(html, name)
+    elapsed = (time.perf_counter() - started) / repeat
+
+    found = {normalize(q["questionText"]) for q in result["questions"]}
+    expected = fixture["expectedQuestions"]
+    hits = sum(1 for label in expected if any(normalize(label) in text for text in found))
+
+    return {
+        "time": round(elapsed, 5),
+        "questions": result["total"],
+        "success_rate": round(hits / len(expected), 3) if expected else 1.0,
+        "complete": result["complete"],
+        "unresolved": result["unresolved"],
+    }
+
+
+def bench_fill(driver, name: str, url: str, fixture: dict) -> list[dict]:
+    """Runs every action of the fixture plan through its executor, then verifies the page"""
+    driver.get(url)
+    actions = [Action(**spec) for spec in fixture["actions"]]
+    records = []
+
+    for action in actions:
+        fill = EXECUTORS[action.type]
+        value = action.value
+        kwargs = {}
+        if action.type == "input_file":
+            value = os.path.join(FIXTURES_DIR, value)
+            kwargs["fileName"] = action.fileName
+
+        with RECORDER.job(f"fill:{name}:{action.id}") as trace, span(executor=action.type, action=action.id):
+            started = time.perf_counter()
+            ok, message = fill(driver, action.selector, value, **kwargs)
+            elapsed = time.perf_counter() - started
+
+        records.append({
+            "id": action.id,
+            "type": action.type,
+            "time": elapsed,
+            "commands": trace.commands,
+            "reported": ok,
+            "message": message,
+        })
+
+    verification = verify_plan(driver, actions)
+    for record in records:
+        record["success"] = record["reported"] and verification["results"].get(record["id"], False)
+
+    return records
+
+
+def summarize_fill(records: list[dict]) -> dict[str, dict]:
+    """Aggregates fill records per field type"""
+    summary = {}
+    for record in records:
+        entry = summary.setdefault(record["type"], {"count": 0, "time": 0.0, "commands": 0, "successes": 0})
+        entry["count"] += 1
+        entry["time"] += record["time"]
+        entry["commands"] += record["commands"]
+        entry["successes"] += 1 if record["success"] else 0
+
+    return {
+        field_type: {
+            "count": entry["count"],
+            "time": round(entry["time"], 3),
+            "mean_time": round(entry["time"] / entry["count"], 3),
+            "mean_commands": round(entry["commands"] / entry["count"], 1),
+            "success_rate": round(entry["successes"] / entry["count"], 3),
+        }
+        for field_type, entry in sorted(summary.items())
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, time_tolerance: float,
+                        command_tolerance: float, time_slack: float = 0.0) -> list[str]:
+    """
+    Lists regressions of results against baseline.
+
+    Wall time may grow by time_tolerance plus time_slack seconds (so scheduling
+    noise on sub-100ms timings does not fail the gate) and command counts by
+    command_tolerance (fractions of the baseline); success rates may not drop at all.
+    """
+    regressions = []
+
+    def check(label: str, current: dict, base: dict, time_key: str, command_key: str):
+        if current.get("success_rate", 0) < base.get("success_rate", 0):
+            regressions.append(f"{label}: success rate {current['success_rate']} < {base['success_rate']}")
+        if current.get(command_key, 0) > base.get(command_key, 0) * (1 + command_tolerance):
+            regressions.append(f"{label}: commands {current[command_key]} > {base[command_key]}")
+        if current.get(time_key, 0) > base.get(time_key, 0) * (1 + time_tolerance) + time_slack:
+            regressions.append(f"{label}: time {current[time_key]}s > {base[time_key]}s")
+
+    for fixture, current in results.get("scan", {}).items():
+        if fixture in baseline.get("scan", {}):
+            check(f"scan {fixture}", current, baseline["scan"][fixture], "time", "commands")
+
+    for field_type, current in results.get("fill", {}).items():
+        if field_type in baseline.get("fill", {}):
+            check(f"fill {field_type}", current, baseline["fill"][field_type], "mean_time", "mean_commands")
+
+    return regressions
+
+
+def print_report(results: dict):
+    """Prints the scan and fill tables"""
+    if results["scan"]:
+        print(f"\n{'='*72}")
+        print("SCAN")
+        print('='*72)
+        print(f"{'fixture':<28}{'time (s)':>10}{'commands':>10}{'questions':>11}{'success':>10}")
+        for fixture, row in results["scan"].items():
+            print(f"{fixture:<28}{row['time']:>10.3f}{row['commands']:>10}{row['questions']:>11}{row['success_rate']:>10.0%}")
+
+    if results.get("static"):
+        print(f"\n{'='*72}")
+        print("STATIC SCAN (no browser)")
+        print('='*72)
+        print(f"{'fixture':<28}{'time (ms)':>10}{'questions':>11}{'success':>10}{'fallback':>10}")
+        for fixture, row in results["static"].items():
+            print(f"{fixture:<28}{row['time'] * 1000:>10.2f}{row['questions']:>11}{row['success_rate']:>10.0%}"
+                  f"{'no' if row['complete'] else 'yes':>10}")
+
+    if results["fill"]:
+        print(f"\n{'='*72}")
+        print("FILL (per field type)")
+        print('='*72)
+        print(f"{'field type':<20}{'count':>7}{'mean (s)':>10}{'total (s)':>11}{'commands':>10}{'success':>10}")
+        for field_type, row in results["fill"].items():
+            print(f"{field_type:<20}{row['count']:>7}{row['mean_time']:>10.3f}{row['time']:>11.3f}"
+                  f"{row['mean_commands']:>10}{row['success_rate']:>10.0%}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline scanner/executor benchmarks")
+    parser.add_argument("--fixtures", nargs="*", help="Fixture names to run (default: all)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--no-baseline", action="store_true", help="Report only, skip the baseline comparison")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed wall time growth (fraction)")
+    parser.add_argument("--time-slack", type=float, default=0.05, help="Allowed wall time growth on top (s)")
+    parser.add_argument("--command-tolerance", type=float, default=0.1, help="Allowed command count growth (fraction)")
+    parser.add_argument("--output", help="Write the full results as JSON to this path")
+    parser.add_argument("--skip-scan", action="store_true", help="Only benchmark the executors")
+    parser.add_argument("--skip-fill", action="store_true", help="Only benchmark the scanner")
+    parser.add_argument("--static-only", action="store_true", help="Only benchmark the static scanner (no browser)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print("No fixtures found")
+        return 1
+
+    results = {"scan": {}, "fill": {}, "actions": {}, "static": {}}
+    for name, fixture in fixtures.items():
+        results["static"][name] = bench_static(name, fixture)
+
+    if args.static_only:
+        print_report(results)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2, default=str)
+        return 0
+
+    driver = create_driver(headless=True, use_existing_browser=False, instrument=True)
+
+    try:
+        with FixtureServer() as server:
+            fill_records = []
+            for name, fixture in fixtures.items():
+                url = f"{server.base_url}/{fixture['page']}"
+                if not args.skip_scan:
+                    results["scan"][name] = bench_scan(driver, name, url, fixture)
+                if not args.skip_fill:
+                    records = bench_fill(driver, name, url, fixture)
+                    results["actions"][name] = records
+                    fill_records.extend(records)
+            results["fill"] = summarize_fill(fill_records)
+            results["webdriver"] = RECORDER.snapshot()
+    finally:
+        driver.quit()
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, default=str)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "scan": {name: {k: v for k, v in row.items() if k != "phases"} for name, row in results["scan"].items()},
+                "fill": results["fill"],
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Baseline updated: {args.baseline}")
+        return 0
+
+    if args.no_baseline:
+        print("\n⚪ No comparison: baseline check skipped (--no-baseline)")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n❌ No baseline at {args.baseline}: nothing to compare against. Record one on real Chrome "
+              f"with --update-baseline, or pass --no-baseline for a report without comparison")
+        return 2
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(results, baseline, args.time_tolerance, args.command_tolerance,
+                                      args.time_slack)
+    if regressions:
+        print("\n❌ Performance regressions:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+JSON encoding micro-benchmark for the AI service responses.
+
+Encodes realistic payloads - a /predict AIResponse, ExecutionResponses and
+scan results of increasing size, and a 100-form batch - with FastAPI's default
+response path (response_model validation + jsonable_encoder + json.dumps) and
+with responses.FastJSONResponse, and prints median encode time and body size.
+
+Usage (from the repository root):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --repeat 500
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from models import AIResponse, ExecutionResponse
+from responses import FastJSONResponse
+
+COUNTRIES = [f"Country {i:03d}" for i in range(200)]
+
+
+def scan_result(questions: int) -> dict:
+    """Scanner-style result: a mix of text, select, custom dropdown, radio and checkbox fields"""
+    kinds = [
+        ("text", None),
+        ("email", None),
+        ("textarea", None),
+        ("select", ["New York, NY", "San Francisco, CA", "Remote (US)", "London, United Kingdom"]),
+        ("dropdown_custom", ["Yes", "No"]),
+        ("dropdown_custom", COUNTRIES),
+        ("radio", ["Yes", "No", "Open to discussion"]),
+        ("checkbox", ["Yes", "No"]),
+    ]
+    items = []
+    for i in range(questions):
+        field_type, options = kinds[i % len(kinds)]
+        items.append({
+            "questionText": f"Question {i}: are you legally authorized to work in the United States? *",
+            "fieldType": field_type,
+            "options": options,
+            "required": i % 3 == 0,
+            "selector": f"#question_{61968800 + i}",
+            "step": 1 + i // 20,
+        })
+    return {
+        "url": "https://job-boards.greenhouse.io/example/jobs/4410021",
+        "questions": items,
+        "total": len(items),
+        "dependencies": [],
+        "cached": False,
+    }
+
+
+def execution_response(actions: int) -> ExecutionResponse:
+    results = {f"question_{i}": ("success" if i % 10 else "failed") for i in range(actions)}
+    errors = {key: "Option 'Yes' not found in dropdown" for key, value in results.items() if value == "failed"}
+    return ExecutionResponse(status="completed", results=results, errors=errors)
+
+
+PAYLOADS = {
+    "predict (AIResponse)": AIResponse(
+        answer="Yes", confidence=0.93, reasoning="Profile states US citizenship", intent="work_auth.us",
+        optionIndex=0, matchScore=1.0,
+    ),
+    "execution, 50 actions": execution_response(50),
+    "execution, 500 actions": execution_response(500),
+    "scan, 40 questions": scan_result(40),
+    "scan, 200 questions": scan_result(200),
+    "batch, 100 scans x 40": [scan_result(40) for _ in range(100)],
+}
+
+
+_ADAPTERS = {}  # FastAPI builds the response field once per route
+
+
+def fastapi_default(content) -> bytes:
+    """What FastAPI does for a model returned from an endpoint with response_model"""
+    if isinstance(content, BaseModel):
+        adapter = _ADAPTERS.setdefault(type(content), TypeAdapter(type(content)))
+        content = adapter.dump_python(adapter.validate_python(content), mode="json")
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast(content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def measure(encode, content, repeat: int) -> tuple[float, int]:
+    """Median seconds per encode and body size"""
+    body = encode(content)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode(content)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), len(body)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="JSON response encoding micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=200, help="Encodes per payload and encoder")
+    args = parser.parse_args(argv)
+
+    print(f"{'payload':<26}{'bytes':>10}{'fast bytes':>12}{'default (us)':>14}{'fast (us)':>12}{'speedup':>10}")
+    for name, content in PAYLOADS.items():
+        default_time, default_size = measure(fastapi_default, content, args.repeat)
+        fast_time, fast_size = measure(fast, content, args.repeat)
+        print(f"{name:<26}{default_size:>10}{fast_size:>12}{default_time * 1e6:>14.1f}{fast_time * 1e6:>12.1f}"
+              f"{default_time / fast_time:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
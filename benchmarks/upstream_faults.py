@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Fault-injecting stand-in for the Pattern Learning API.
+
+Serves /search and /upload like the pattern API, with configurable latency,
+error rate and outage, so the AI service's circuit breakers and hedged
+pattern searches can be exercised locally without the real upstream.
+
+Usage (from the repository root):
+    # Stand-in server only (point PATTERN_API_URL at it)
+    python -m benchmarks.upstream_faults serve --port 3001 --stall-rate 0.1 --error-rate 0.3
+
+    # Scenario: healthy -> outage -> recovery, printing latency and breaker state
+    python -m benchmarks.upstream_faults scenario --hedge-delay 0.2
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class FaultConfig:
+    """Mutable fault settings shared with the request handler threads"""
+
+    def __init__(self, latency: float = 0.0, stall_rate: float = 0.0, stall: float = 1.5,
+                 error_rate: float = 0.0, down: bool = False, seed: int | None = None):
+        self.latency = latency
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.error_rate = error_rate
+        self.down = down
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next_fault(self) -> tuple[float, bool]:
+        """(delay seconds, fail) for the next request"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency
+            if self._random.random() < self.stall_rate:
+                delay += self.stall
+            fail = self.down or self._random.random() < self.error_rate
+        return delay, fail
+
+
+class PatternApiHandler(BaseHTTPRequestHandler):
+    """Answers like the pattern API after the configured delay, or with a 503"""
+
+    config: FaultConfig = None
+
+    def _reply(self, body: dict):
+        delay, fail = self.config.next_fault()
+        time.sleep(delay)
+
+        status = 503 if fail else 200
+        payload = json.dumps({"error": "injected fault"} if fail else body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.endswith("/search"):
+            self.send_error(404)
+            return
+        question = parse_qs(url.query).get("q", [""])[0]
+        patterns = [{"question": question, "answer": "Yes", "intent": "stub"}] if "known" in question else []
+        self._reply({"patterns": patterns})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self._reply({"status": "ok"})
+
+    def log_message(self, format, *args):
+        logger.debug("pattern stand-in: " + format, *args)
+
+
+class FaultServer:
+    """Runs the stand-in on a local port for the duration of a with-block"""
+
+    def __init__(self, config: FaultConfig, port: int = 0):
+        handler = type("Handler", (PatternApiHandler,), {"config": config})
+        self.config = config
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/patterns"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def run_scenario(calls: int, hedge_delay: float, reset_timeout: float) -> list[dict]:
+    """
+    Drives app.check_pattern_memory through three phases against the stand-in:
+    healthy with occasional stalls (slow tail), outage, and recovery. Returns one row per phase.
+    """
+    import app
+    from ai import CircuitBreaker
+
+    config = FaultConfig(latency=0.02, seed=7)
+    rows = []
+
+    with FaultServer(config) as server:
+        app.PATTERN_API_URL = server.base_url
+        app.PATTERN_HEDGE_DELAY = hedge_delay
+        app.PATTERN_BREAKER = CircuitBreaker("pattern_api", reset_timeout=reset_timeout)
+
+        phases = [
+            ("healthy", dict(latency=0.02, stall_rate=0.2, error_rate=0.0, down=False)),
+            ("outage", dict(latency=1.0, stall_rate=0.0, error_rate=1.0, down=True)),
+            ("recovery", dict(latency=0.02, stall_rate=0.0, error_rate=0.0, down=False)),
+        ]
+        for phase, settings in phases:
+            for key, value in settings.items():
+                setattr(config, key, value)
+            if phase == "recovery":
+                time.sleep(reset_timeout)
+
+            served_before = config.requests
+            latencies = []
+            for i in range(calls):
+                started = time.perf_counter()
+                app.check_pattern_memory(f"known question {i}")
+                latencies.append(time.perf_counter() - started)
+
+            latencies.sort()
+            rows.append({
+                "phase": phase,
+                "calls": calls,
+                "upstream_requests": config.requests - served_before,
+                "p50": round(latencies[len(latencies) // 2], 3),
+                "max": round(latencies[-1], 3),
+                "breaker": app.PATTERN_BREAKER.to_dict(),
+            })
+
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fault-injecting pattern API stand-in")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Run the stand-in server")
+    serve.add_argument("--port", type=int, default=3001)
+    serve.add_argument("--latency", type=float, default=0.0, help="Base response delay (s)")
+    serve.add_argument("--stall-rate", type=float, default=0.0, help="Fraction of requests that stall")
+    serve.add_argument("--stall", type=float, default=1.5, help="Extra delay of a stalled request (s)")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    serve.add_argument("--down", action="store_true", help="Fail every request")
+
+    scenario = sub.add_parser("scenario", help="Run the healthy/outage/recovery scenario")
+    scenario.add_argument("--calls", type=int, default=20, help="Pattern searches per phase")
+    scenario.add_argument("--hedge-delay", type=float, default=0.2, help="PATTERN_HEDGE_DELAY (0 = off)")
+    scenario.add_argument("--reset-timeout", type=float, default=1.0, help="Breaker open duration (s)")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == "serve":
+        config = FaultConfig(args.latency, args.stall_rate, args.stall, args.error_rate, args.down)
+        with FaultServer(config, args.port) as server:
+            print(f"Pattern API stand-in at {server.base_url} (Ctrl+C to stop)")
+            try:
+                server.thread.join()
+            except KeyboardInterrupt:
+                pass
+        return 0
+
+    rows = run_scenario(args.calls, args.hedge_delay, args.reset_timeout)
+    print(f"{'phase':<10}{'calls':>7}{'upstream':>10}{'p50 (s)':>10}{'max (s)':>10}  breaker")
+    for row in rows:
+        breaker = row["breaker"]
+        print(f"{row['phase']:<10}{row['calls']:>7}{row['upstream_requests']:>10}{row['p50']:>10.3f}"
+              f"{row['max']:>10.3f}  {breaker['state']} (opens={breaker['opens']}, rejected={breaker['rejected']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
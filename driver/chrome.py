@@ -2,18 +2,23 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
+from instrumentation import instrument_driver
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
-def create_driver(headless: bool = False, use_existing_browser: bool = True) -> webdriver.Chrome:
+def create_driver(headless: bool = False, use_existing_browser: bool = True, instrument: bool | None = None,
+                  user_data_dir: str | None = None) -> webdriver.Chrome:
     """
     Creates a Chrome WebDriver with anti-detection settings.
     
     Args:
         headless: Run in headless mode (default: False for Greenhouse)
         use_existing_browser: Connect to existing Chrome instance via CDP (default: True)
+        instrument: Count and time every WebDriver command (default: WEBDRIVER_INSTRUMENTATION env var)
+        user_data_dir: Chrome profile directory for the separate-profile fallback
+            (default: ./chrome_profile; concurrent browsers each need their own)
         
     Returns:
         Configured Chrome WebDriver instance
@@ -63,7 +68,7 @@ def create_driver(headless: bool = False, use_existing_browser: bool = True) ->
                 driver.implicitly_wait(0)
                 driver.set_page_load_timeout(30)
                 
-                return driver
+                return _instrument(driver, instrument)
             else:
                 logger.warning("⚠️ Port 9222 not accessible. Chrome not started with --remote-debugging-port=9222")
                 logger.warning("Falling back to separate Chrome profile...")
@@ -73,7 +78,7 @@ def create_driver(headless: bool = False, use_existing_browser: bool = True) ->
     
     # Fallback: Use persistent profile for session persistence (old method)
     logger.info("Starting Chrome with separate profile...")
-    user_data_dir = os.path.join(os.getcwd(), "chrome_profile")
+    user_data_dir = user_data_dir or os.path.join(os.getcwd(), "chrome_profile")
     options.add_argument(f"--user-data-dir={user_data_dir}")
     
     # Anti-detection flags
@@ -119,5 +124,15 @@ def create_driver(headless: bool = False, use_existing_browser: bool = True) ->
     driver.implicitly_wait(0)  # We use explicit waits only
     driver.set_page_load_timeout(30)
     
+    return _instrument(driver, instrument)
+
+def _instrument(driver: webdriver.Chrome, instrument: bool | None) -> webdriver.Chrome:
+    """Wraps the driver with command instrumentation when enabled"""
+    if instrument is None:
+        instrument = os.environ.get('WEBDRIVER_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')
+    
+    if instrument:
+        logger.info("WebDriver command instrumentation enabled")
+        return instrument_driver(driver)
     return driver
 
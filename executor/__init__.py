@@ -18,3 +18,5 @@ EXECUTORS = {
     "dropdown_custom": fill_dropdown_custom,
     "click": click_element,
 }
+
+from .runner import run_plan, PlanCheckpoint
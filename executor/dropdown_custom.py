@@ -4,178 +4,216 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from matching import best_match, normalize
+from verifier.verify import REACT_SELECT_JS
 import time
+import logging
+import unicodedata
 
-def fill_dropdown_custom(driver: WebDriver, selector: str, value: str, max_retries: int = 3) -> tuple[bool, str]:
+logger = logging.getLogger(__name__)
+
+# Returns {source, options, values} for the combobox's menu.
+# Prefers the React-Select `options` prop (complete, not virtualized, with option
+# values) and falls back to the rendered [role="option"] nodes of the open menu.
+# Option nodes are only read inside the combobox's own listbox/menu.
+READ_OPTIONS_SCRIPT = REACT_SELECT_JS + """
+var input = arguments[0];
+
+var props = selectPropOptions(input);
+if (props) return {source: 'props', options: props.labels, values: props.values};
+
+var listbox = null;
+var listId = input.getAttribute('aria-controls') || input.getAttribute('aria-owns');
+if (listId) listbox = document.getElementById(listId);
+if (!listbox) {
+    var root = selectRoot(input);
+    listbox = root && root.querySelector('[role="listbox"], [class*="menu"]');
+}
+if (!listbox) return {source: 'dom', options: []};
+var nodes = listbox.querySelectorAll('[role="option"], [class*="option"]');
+var seen = {}, options = [];
+Array.prototype.forEach.call(nodes, function(n) {
+    var text = (n.innerText || n.textContent || '').trim();
+    if (text && !seen[text]) { seen[text] = true; options.push(text); }
+});
+return {source: 'dom', options: options};
+"""
+
+# Text of the option React-Select currently highlights (the one ENTER would pick).
+# aria-selected marks the *selected* option in v5, so it is only a last resort.
+FOCUSED_OPTION_SCRIPT = REACT_SELECT_JS + """
+var input = arguments[0];
+var id = input.getAttribute('aria-activedescendant');
+var node = id ? document.getElementById(id) : null;
+var root = node ? null : selectRoot(input);
+if (root) {
+    node = root.querySelector('[class*="option--is-focused"]')
+        || root.querySelector('[class*="option"][aria-selected="true"]');
+}
+return node ? (node.innerText || node.textContent || '').trim() : null;
+"""
+
+# Reads the selected label from the single-value node plus the open/closed state
+SELECTED_VALUE_SCRIPT = REACT_SELECT_JS + """
+var input = arguments[0];
+var root = selectRoot(input);
+var node = root && root.querySelector(
+    '[class*="singleValue"], [class*="single-value"], [class*="multi-value__label"], [class*="multiValue"]'
+);
+return {
+    expanded: input.getAttribute('aria-expanded'),
+    label: node ? (node.innerText || node.textContent || '').trim() : null,
+    value: input.value
+};
+"""
+
+
+def fill_dropdown_custom(driver: WebDriver, selector: str, value: str, max_retries: int = 3,
+                         min_score: float = 0.6) -> tuple[bool, str]:
     """
     Fills a React-Select / Greenhouse custom dropdown using KEYBOARD ONLY.
-    
+
     ⚠️ CRITICAL: This is the most important function for Greenhouse forms.
-    
+
     Greenhouse dropdowns:
     - Use React-Select library
     - Have <input role="combobox">
     - Options are NOT in DOM until opened
     - Options are virtualized (only visible ones rendered)
     - Use aria-expanded to indicate open/closed state
-    
+
     STRATEGY (KEYBOARD-DRIVEN):
-    1. Focus the combobox input
-    2. Click to activate (triggers aria-expanded="true")
-    3. Type the exact option text
-    4. Wait for React to filter/highlight the option
-    5. Press ENTER to select
-    6. Verify selection via input value or visible label
-    
+    1. Focus the combobox input and open the menu
+    2. Prefetch the option list once (React-Select `options` prop, else rendered options)
+    3. Pick the best-matching option text with the fuzzy matcher
+    4. Type only the shortest prefix that makes it the highlighted option
+    5. Press ENTER once the target is highlighted (else type the full label first)
+    6. Confirm by reading the selected single-value node
+
     ❌ DO NOT:
     - Click <li> elements (they're virtualized)
-    - Query option lists (not in DOM)
     - Use XPath for values
-    
+
     ✅ DO:
     - Use keyboard navigation only
-    - Type exact match text
     - Wait for aria-expanded changes
-    - Verify via input value or aria attributes
-    
+    - Verify via the rendered single value
+
     Args:
         driver: Selenium WebDriver instance
         selector: CSS selector for the combobox input (e.g., #question_61968829)
-        value: Exact option text to select (e.g., "No", "Yes", "I don't wish to answer")
+        value: Option text to select (e.g., "No", "Yes", "I don't wish to answer")
         max_retries: Number of retry attempts
-        
+        min_score: Lowest match score accepted (0-1)
+
     Returns:
         (success: bool, error_message: str)
     """
     for attempt in range(max_retries):
         try:
             wait = WebDriverWait(driver, 10)
-            
+
             # Find the combobox input
             # Greenhouse uses: <input id="question_XXX" role="combobox" aria-expanded="false">
             combobox = wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, selector))
             )
-            
+
             # Verify it's actually a combobox
             role = combobox.get_attribute("role")
             if role != "combobox":
                 # Might be an ID on a wrapper, try to find combobox inside
                 try:
-                    parent = driver.find_element(By.CSS_SELECTOR, selector)
-                    combobox = parent.find_element(By.CSS_SELECTOR, 'input[role="combobox"]')
+                    combobox = combobox.find_element(By.CSS_SELECTOR, 'input[role="combobox"]')
                 except:
                     return False, f"Element is not a combobox (role={role})"
-            
-            # Scroll into view
+
+            # Scroll into view, clear and open the menu
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", combobox)
-            time.sleep(0.3)
-            
-            # Clear any existing value
             combobox.clear()
-            time.sleep(0.2)
-            
-            # Focus the combobox
             combobox.click()
-            time.sleep(0.4)
-            
-            # Wait for dropdown to open (aria-expanded="true")
+
             try:
-                WebDriverWait(driver, 3).until(
+                WebDriverWait(driver, 3, poll_frequency=0.1).until(
                     lambda d: combobox.get_attribute("aria-expanded") == "true"
                 )
             except TimeoutException:
                 # Try clicking again if it didn't open
                 combobox.click()
-                time.sleep(0.4)
-            
-            
-            # Type the exact option text
-            # React-Select will filter options as we type
-            combobox.send_keys(value)
-            time.sleep(0.5)  # Wait for React to filter options
-            
-            # Press ENTER to select the highlighted/filtered option
-            combobox.send_keys(Keys.ENTER)
-            time.sleep(0.4)
-            
-            # Check if selection worked
-            aria_expanded = combobox.get_attribute("aria-expanded")
-            input_value = combobox.get_attribute("value")
-            
-            # If dropdown is still open, try partial matching (for phone country selectors)
-            if aria_expanded == "true" and not input_value:
-                # Clear what we typed
-                combobox.send_keys(Keys.CONTROL + "a")
-                time.sleep(0.1)
-                combobox.send_keys(Keys.BACKSPACE)
+
+            # Prefetch the option list once and pick the target option
+            menu = driver.execute_script(READ_OPTIONS_SCRIPT, combobox)
+            options = menu.get("options") or []
+            match = best_match(value, options, min_score)
+
+            if match:
+                # Retries type the full label in case the prefetched list was incomplete
+                keys, downs = _keystrokes_for(match.index, options, menu.get("values"), shortest=(attempt == 0))
+                target = match.text
+            else:
+                # Options not rendered yet (async menus) - type the value and read again
+                keys, downs, target = value, 0, None
+
+            combobox.send_keys(keys)
+
+            if target is None:
                 time.sleep(0.3)
-                
-                # For phone country selectors, try typing just first few chars
-                # e.g., "United States" → type "United" and press ENTER
-                short_value = value.split()[0] if ' ' in value else value[:min(len(value), 6)]
-                combobox.send_keys(short_value)
-                time.sleep(0.5)
-                combobox.send_keys(Keys.ENTER)
-                time.sleep(0.4)
-            
-            # Verify selection
-            # Method 1: Check if input value matches
-            input_value = combobox.get_attribute("value")
-            if input_value and value.lower() in input_value.lower():
-                return True, ""
-            
-            # Method 2: Check if aria-expanded is now false (dropdown closed = selection made)
-            aria_expanded = combobox.get_attribute("aria-expanded")
-            if aria_expanded == "false":
-                # Dropdown closed, likely selected
-                # Double-check by reading the value again
-                time.sleep(0.2)
-                input_value = combobox.get_attribute("value")
-                if input_value and value.lower() in input_value.lower():
-                    return True, ""
-            
-            # Method 3: Look for selected value display in parent container
-            try:
-                parent = combobox.find_element(By.XPATH, "./ancestor::div[contains(@class, 'css-')]")
-                parent_text = parent.text
-                if value in parent_text:
-                    return True, ""
-            except:
-                pass
-            
-            # Method 4: Check aria-activedescendant
-            active_id = combobox.get_attribute("aria-activedescendant")
-            if active_id:
-                try:
-                    active_option = driver.find_element(By.ID, active_id)
-                    if value.lower() in active_option.text.lower():
-                        return True, ""
-                except:
-                    pass
-            
-            # If we got here and dropdown is closed, assume success
-            if aria_expanded == "false":
+                menu = driver.execute_script(READ_OPTIONS_SCRIPT, combobox)
+                options = menu.get("options") or []
+                match = best_match(value, options, min_score)
+                if not match:
+                    combobox.send_keys(Keys.ESCAPE)
+                    if attempt < max_retries - 1:
+                        continue
+                    return False, f"No option found matching: {value}"
+                target = match.text
+
+            for _ in range(downs):
+                combobox.send_keys(Keys.ARROW_DOWN)
+
+            # Wait for React to highlight the target option. If the predicted filter was
+            # wrong, type the full label instead; ENTER is only pressed on the target.
+            focused = _wait_for_focused(driver, combobox, target)
+            if not focused and keys != target:
+                _, downs = _keystrokes_for(match.index, options, menu.get("values"), shortest=False)
+                combobox.send_keys(Keys.BACKSPACE * len(keys) + target)
+                for _ in range(downs):
+                    combobox.send_keys(Keys.ARROW_DOWN)
+                focused = _wait_for_focused(driver, combobox, target)
+
+            if not focused:
+                combobox.send_keys(Keys.ESCAPE)
+                if attempt < max_retries - 1:
+                    continue
+                return False, f"Option '{target}' was not highlighted after typing"
+
+            combobox.send_keys(Keys.ENTER)
+
+            # Confirm by reading the rendered single value
+            selected = _wait_for_selection(driver, combobox, target)
+            if selected is not None and normalize(selected) == normalize(target):
+                logger.debug(
+                    f"Selected '{target}' for '{value}' via {menu.get('source')} options "
+                    f"({match.method}, score {match.score:.2f}, typed {len(keys)} chars)"
+                )
                 return True, ""
-            
+
             # Otherwise retry
             if attempt < max_retries - 1:
-                # Clear and try again
                 try:
                     combobox.send_keys(Keys.ESCAPE)  # Close dropdown
-                    time.sleep(0.3)
                 except:
                     pass
                 continue
-                
-            return False, f"Could not verify selection of '{value}'"
-                
+
+            return False, f"Could not verify selection of '{target}' (displayed: '{selected}')"
+
         except TimeoutException:
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
             return False, f"Combobox not found: {selector}"
-            
+
         except Exception as e:
             if attempt < max_retries - 1:
                 time.sleep(0.5)
@@ -186,5 +224,78 @@ def fill_dropdown_custom(driver: WebDriver, selector: str, value: str, max_retri
                     pass
                 continue
             return False, f"Error: {str(e)}"
-    
+
     return False, "Max retries exceeded"
+
+
+def _keystrokes_for(target_index: int, options: list[str], values: list[str] | None = None,
+                    shortest: bool = True) -> tuple[str, int]:
+    """
+    Computes the shortest text to type so that target is highlighted.
+
+    Mirrors React-Select's default filter: an option stays when "<label> <value>"
+    contains the typed text (trimmed, case- and accent-insensitive, punctuation
+    kept), and the first one is highlighted. If no prefix of the target's label
+    puts it first, the full label is typed and the number of ARROW_DOWN presses
+    needed to reach it is returned. With shortest=False the full label is always
+    typed. Values are only known from the options prop; without them the
+    prediction may be off, which the caller detects before pressing ENTER.
+
+    Returns:
+        (text to type, ARROW_DOWN presses)
+    """
+    target = options[target_index]
+    if values and len(values) == len(options):
+        candidates = [_filter_text(f"{label} {value}") for label, value in zip(options, values)]
+    else:
+        candidates = [_filter_text(label) for label in options]
+
+    for length in range(1, len(target) + 1 if shortest else 0):
+        prefix = target[:length]
+        if prefix[-1].isspace():
+            continue
+
+        needle = _filter_text(prefix)
+        if not needle:
+            continue
+
+        filtered = [i for i, candidate in enumerate(candidates) if needle in candidate]
+        if filtered and filtered[0] == target_index:
+            return prefix, 0
+
+    needle = _filter_text(target)
+    filtered = [i for i, candidate in enumerate(candidates) if needle in candidate]
+    downs = filtered.index(target_index) if target_index in filtered else 0
+    return target, downs
+
+
+def _filter_text(text: str) -> str:
+    """React-Select's createFilter defaults: trim, lower case, strip accents"""
+    text = unicodedata.normalize("NFD", str(text).strip().lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def _wait_for_focused(driver: WebDriver, combobox, target: str, timeout: float = 1.0):
+    """Polls until the highlighted option is the target (or timeout)"""
+    wanted = normalize(target)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        focused = driver.execute_script(FOCUSED_OPTION_SCRIPT, combobox)
+        if focused and normalize(focused) == wanted:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _wait_for_selection(driver: WebDriver, combobox, target: str, timeout: float = 1.5) -> str | None:
+    """Polls the single-value node until it shows the target, returning the last label seen"""
+    wanted = normalize(target)
+    deadline = time.monotonic() + timeout
+    label = None
+    while time.monotonic() < deadline:
+        state = driver.execute_script(SELECTED_VALUE_SCRIPT, combobox)
+        label = state.get("label")
+        if label and normalize(label) == wanted:
+            break
+        time.sleep(0.05)
+    return label
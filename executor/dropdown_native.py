@@ -1,26 +1,56 @@
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from matching import OptionMatch, score_option
 import time
+import logging
 
-def fill_dropdown_native(driver: WebDriver, selector: str, value: str, max_retries: int = 3) -> tuple[bool, str]:
+logger = logging.getLogger(__name__)
+
+# Scrolls the <select> into view and returns [text, value, disabled] for every option
+READ_OPTIONS_SCRIPT = """
+var select = arguments[0];
+select.scrollIntoView({block: 'center'});
+return Array.prototype.map.call(select.options, function(o) {
+    return [o.text, o.value, o.disabled];
+});
+"""
+
+# Selects the option at the given index, fires input/change and reports what is selected
+SELECT_INDEX_SCRIPT = """
+var select = arguments[0], index = arguments[1];
+select.selectedIndex = index;
+select.dispatchEvent(new Event('input', {bubbles: true}));
+select.dispatchEvent(new Event('change', {bubbles: true}));
+var selected = select.options[select.selectedIndex];
+return [select.selectedIndex, selected ? selected.text : null];
+"""
+
+
+def fill_dropdown_native(driver: WebDriver, selector: str, value: str, max_retries: int = 3,
+                         min_score: float = 0.6) -> tuple[bool, str]:
     """
     Selects an option from a native <select> dropdown.
-    
+
     Used for:
     - Standard HTML <select> elements
     - Simple dropdowns
-    
+
+    All option texts/values are read in one script call and ranked in Python
+    (exact, case-insensitive, normalised, token overlap, fuzzy); the winner is
+    then selected by index in a second call.
+
     Args:
         driver: Selenium WebDriver instance
         selector: CSS selector for the <select> element
         value: Option text or value to select
         max_retries: Number of retry attempts
-        
+        min_score: Lowest match score accepted (0-1)
+
     Returns:
-        (success: bool, error_message: str)
+        (success: bool, message: str) - on success the message reports the chosen option and score
     """
     for attempt in range(max_retries):
         try:
@@ -28,63 +58,59 @@ def fill_dropdown_native(driver: WebDriver, selector: str, value: str, max_retri
             element = wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, selector))
             )
-            
-            # Scroll into view
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.3)
-            
-            # Create Select object
-            select = Select(element)
-            
-            # Try selecting by visible text first
-            try:
-                select.select_by_visible_text(value)
-                time.sleep(0.3)
-                
-                # Verify selection
-                selected_option = select.first_selected_option
-                if selected_option.text == value or selected_option.get_attribute("value") == value:
-                    return True, ""
-            except:
-                pass
-            
-            # Try selecting by value
-            try:
-                select.select_by_value(value)
-                time.sleep(0.3)
-                
-                # Verify selection
-                selected_option = select.first_selected_option
-                if selected_option.text == value or selected_option.get_attribute("value") == value:
-                    return True, ""
-            except:
-                pass
-            
-            # Try partial match on visible text
-            for option in select.options:
-                if value.lower() in option.text.lower():
-                    select.select_by_visible_text(option.text)
-                    time.sleep(0.3)
-                    
-                    # Verify
-                    selected_option = select.first_selected_option
-                    if selected_option.text == option.text:
-                        return True, ""
-            
+
+            options = driver.execute_script(READ_OPTIONS_SCRIPT, element)
+            match = _rank_select_options(str(value), options)
+
+            if not match or match.score < min_score:
+                if attempt < max_retries - 1:
+                    time.sleep(0.5)
+                    continue
+                return False, f"No option found matching: {value}"
+
+            selected_index, selected_text = driver.execute_script(SELECT_INDEX_SCRIPT, element, match.index)
+
+            # Verify selection
+            if selected_index == match.index:
+                logger.debug(f"Selected '{match.text}' for '{value}' ({match.method}, score {match.score:.2f})")
+                return True, f"Selected '{match.text}' ({match.method}, score {match.score:.2f})"
+
             if attempt < max_retries - 1:
                 continue
-            return False, f"No option found matching: {value}"
-                
+            return False, f"Selection mismatch: expected '{match.text}', got '{selected_text}'"
+
         except TimeoutException:
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
             return False, f"Dropdown not found: {selector}"
-            
+
         except Exception as e:
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
             return False, f"Error: {str(e)}"
-    
+
     return False, "Max retries exceeded"
+
+
+def _rank_select_options(value: str, options: list) -> OptionMatch | None:
+    """
+    Picks the best enabled option, scoring each against both its text and value attribute.
+    """
+    best = None
+    for index, (text, option_value, disabled) in enumerate(options):
+        if disabled:
+            continue
+
+        score, method = score_option(value, text or "")
+        if option_value:
+            value_score, value_method = score_option(value, option_value)
+            if value_score > score:
+                score, method = value_score, value_method
+
+        candidate = OptionMatch(index, text, score, method)
+        if score > 0 and (best is None or score > best.score):
+            best = candidate
+
+    return best
@@ -1,28 +1,139 @@
 import base64
+import json
 import tempfile
 import os
+import shutil
 import time
+import logging
+from typing import NamedTuple
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-def fill_input_file(driver: WebDriver, selector: str, value: str, max_retries: int = 3, fileName: str = None) -> tuple[bool, str]:
+logger = logging.getLogger(__name__)
+
+# Greenhouse IDs to try when the plan's selector no longer matches
+GREENHOUSE_FALLBACK_IDS = {
+    "resume": ["resume", "resume_upload", "file_resume"],
+    "cover": ["cover_letter", "cover_letter_upload", "file_cover_letter"],
+}
+
+# Reads the upload state of a file input and its surrounding upload widget.
+# Resource timing entries only appear once a request has finished, so `requests`
+# counts XHR/fetch uploads completed since the file was attached. Only requests
+# whose URL looks like a file upload count: other fields are filled while an
+# upload runs, and their requests (e.g. the school search) say nothing about it.
+# `native` marks a plain, visible file input (no JS upload widget): the browser
+# shows the chosen file itself and the file is sent with the form.
+UPLOAD_STATE_SCRIPT = """
+var el = arguments[0], name = arguments[1], since = arguments[2];
+var UPLOAD_URL = /upload|attach|presign|s3[.-]|amazonaws|storage\.googleapis|blob|resume|cover_letter/i;
+var state = {files: el.files ? el.files.length : 0, shown: false, busy: false, requests: 0, native: false};
+var rect = el.getBoundingClientRect(), style = getComputedStyle(el);
+state.native = rect.width > 10 && rect.height > 10 && style.visibility !== 'hidden' && parseFloat(style.opacity) > 0;
+var root = el.closest('.field, fieldset, [data-source], [id$="_section"], [class*="upload"]') || el.parentElement;
+if (root) {
+    state.shown = !!name && (root.innerText || '').indexOf(name) !== -1;
+    var indicators = root.querySelectorAll(
+        '[aria-busy="true"], [role="progressbar"], [class*="progress"], [class*="uploading"], [class*="spinner"]'
+    );
+    state.busy = Array.prototype.some.call(indicators, function(n) { return n.getClientRects().length > 0; });
+}
+var entries = performance.getEntriesByType('resource');
+for (var i = entries.length - 1; i >= 0 && entries[i].startTime >= since; i--) {
+    if ((entries[i].initiatorType === 'xmlhttprequest' || entries[i].initiatorType === 'fetch')
+            && UPLOAD_URL.test(entries[i].name)) {
+        state.requests++;
+    }
+}
+return state;
+"""
+
+
+class PendingUpload(NamedTuple):
+    """A file attached to its input whose upload has not been confirmed yet"""
+    element: object
+    selector: str
+    file_name: str
+    since: float  # performance.now() in the page when the file was attached
+    started_at: float  # time.monotonic()
+
+
+def fill_input_file(driver: WebDriver, selector: str, value: str, max_retries: int = 3, fileName: str = None,
+                    timeout: float = 30.0) -> tuple[bool, str]:
     """
     Uploads a file via <input type="file">.
     Handles both direct file paths and Base64 encoded data.
+
+    Files are attached through the DevTools protocol (DOM.setFileInputFiles) when the
+    driver supports it, so hidden Greenhouse inputs are used as-is. Completion is
+    detected from the upload widget / network activity instead of fixed sleeps.
+
+    Args:
+        driver: Selenium WebDriver instance
+        selector: CSS selector for the file input
+        value: File path or data: URL with Base64 content
+        max_retries: Number of retry attempts
+        fileName: File name to use for Base64 uploads
+        timeout: Seconds to wait for the upload to finish
+
+    Returns:
+        (success: bool, message: str) - on success the message reports the upload duration
+    """
+    abs_path, temp_dir, error = prepare_file(value, fileName)
+    if error:
+        return False, error
+
+    try:
+        for attempt in range(max_retries):
+            try:
+                upload = start_upload(driver, selector, abs_path)
+
+                # Wait for Greenhouse to accept the file
+                ok, message = finish_upload(driver, upload, timeout)
+                if ok:
+                    return True, message
+
+                if attempt < max_retries - 1:
+                    continue
+                return False, message
+
+            except TimeoutException:
+                if attempt < max_retries - 1:
+                    time.sleep(0.5)
+                    continue
+                return False, f"File input not found: {selector}"
+
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    time.sleep(0.5)
+                    continue
+                return False, f"Error: {str(e)}"
+    finally:
+        cleanup_file(temp_dir)
+
+    return False, "Max retries exceeded"
+
+
+def prepare_file(value: str, fileName: str = None) -> tuple[str | None, str | None, str | None]:
+    """
+    Resolves the plan value to a file on disk, decoding Base64 data URLs into a temp directory.
+
+    Returns:
+        (absolute path, temp dir to remove afterwards or None, error or None)
     """
     file_path = value
     temp_dir = None
-    
+
     # Check if value is Base64 data
     if isinstance(value, str) and value.startswith("data:") and ";base64," in value:
         try:
             # Extract header and data
             header, encoded = value.split(",", 1)
             file_data = base64.b64decode(encoded)
-            
+
             # Determine extension from mime type
             mime_type = header.split(";")[0].split(":")[1]
             suffix = ".pdf"
@@ -30,113 +141,152 @@ def fill_input_file(driver: WebDriver, selector: str, value: str, max_retries: i
                 suffix = ".docx"
             elif "text" in mime_type:
                 suffix = ".txt"
-            
+
             # Use provided fileName if available, otherwise generic
             final_name = fileName if fileName else f"upload_{int(time.time())}{suffix}"
-            
+
             # Ensure it has the correct extension
             if not final_name.endswith(suffix):
                 final_name += suffix
-            
+
             # Create a temporary directory to host the file with correct name
             temp_dir = tempfile.mkdtemp()
             file_path = os.path.join(temp_dir, final_name)
-            
+
             with open(file_path, "wb") as f:
                 f.write(file_data)
-                
+
         except Exception as e:
-            return False, f"Failed to decode Base64 file data: {str(e)}"
+            cleanup_file(temp_dir)
+            return None, None, f"Failed to decode Base64 file data: {str(e)}"
 
     # Validate file exists
     if not os.path.exists(file_path):
-        return False, f"File not found: {file_path}"
-    
+        cleanup_file(temp_dir)
+        return None, None, f"File not found: {file_path}"
+
     # Convert to absolute path
-    abs_path = os.path.abspath(file_path)
-    
+    return os.path.abspath(file_path), temp_dir, None
+
+
+def cleanup_file(temp_dir: str | None):
+    """Removes a temp directory created by prepare_file"""
+    if temp_dir:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def start_upload(driver: WebDriver, selector: str, abs_path: str) -> PendingUpload:
+    """
+    Attaches the file and returns without waiting for the upload to finish.
+
+    Raises:
+        TimeoutException: The file input was not found
+    """
+    element, css = _find_file_input(driver, selector)
+
+    started_at = time.monotonic()
+    since = driver.execute_script("return performance.now();")
+
+    # Attach the file without touching the input's styles
+    if not _set_files_cdp(driver, css, abs_path):
+        element.send_keys(abs_path)
+
+    return PendingUpload(element, selector, os.path.basename(abs_path), since, started_at)
+
+
+def finish_upload(driver: WebDriver, upload: PendingUpload, timeout: float = 30.0) -> tuple[bool, str]:
+    """Waits for a started upload to be accepted (see _wait_for_upload)"""
+    ok, error = _wait_for_upload(driver, upload.element, upload.file_name, upload.since, timeout)
+    duration = time.monotonic() - upload.started_at
+
+    if ok:
+        logger.info(f"Uploaded '{upload.file_name}' to {upload.selector} in {duration:.2f}s")
+        return True, f"Uploaded in {duration:.2f}s"
+    return False, error
+
+
+def file_input_selectors(selector: str) -> list[str]:
+    """The plan's selector followed by the Greenhouse fallback IDs that apply to it"""
+    selectors = [selector]
+    for key, ids in GREENHOUSE_FALLBACK_IDS.items():
+        if key in selector.lower():
+            selectors.extend(f'[id="{gid}"]' for gid in ids)
+    return selectors
+
+
+def _find_file_input(driver: WebDriver, selector: str):
+    """
+    Locates the file input, falling back to common Greenhouse IDs.
+
+    Returns:
+        (element, css) where css is a selector that matches the returned element
+    """
+    wait = WebDriverWait(driver, 10)
     try:
-        for attempt in range(max_retries):
+        element = wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+        )
+        return element, selector
+    except TimeoutException:
+        # Greenhouse fallback
+        for css in file_input_selectors(selector)[1:]:
             try:
-                wait = WebDriverWait(driver, 10)
-                
-                try:
-                    # Wait for element or fallback for Greenhouse
-                    element = wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                except TimeoutException:
-                    # Greenhouse fallback
-                    if "resume" in selector.lower():
-                        # Try all common Greenhouse IDs
-                        for gid in ["resume", "resume_upload", "file_resume"]:
-                            try:
-                                element = driver.find_element(By.ID, gid)
-                                break
-                            except: continue
-                    elif "cover" in selector.lower():
-                        for gid in ["cover_letter", "cover_letter_upload", "file_cover_letter"]:
-                            try:
-                                element = driver.find_element(By.ID, gid)
-                                break
-                            except: continue
-                    
-                    if not 'element' in locals():
-                        raise
-                
-                # Make visible if hidden (EXTREMELY Aggressive version)
-                driver.execute_script(
-                    """
-                    var el = arguments[0];
-                    el.style.display = 'block';
-                    el.style.visibility = 'visible';
-                    el.style.opacity = '1';
-                    el.style.width = '100px';
-                    el.style.height = '100px';
-                    el.style.position = 'fixed';
-                    el.style.top = '0';
-                    el.style.left = '0';
-                    el.style.zIndex = '1000000';
-                    el.style.clip = 'auto';
-                    el.style.overflow = 'visible';
-                    el.classList.remove('visually-hidden');
-                    el.classList.remove('hidden');
-                    """,
-                    element
-                )
-                time.sleep(0.5)
-                
-                # Send file path directly
-                element.send_keys(abs_path)
-                time.sleep(1.0)
-                
-                # Trigger change event (Crucial for Greenhouse)
-                driver.execute_script("arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", element)
-                
-                # Wait for upload to complete (Greenhouse can be slow)
-                time.sleep(3.0)
-                
+                return driver.find_element(By.CSS_SELECTOR, css), css
+            except NoSuchElementException:
+                continue
+        raise
+
+
+def _set_files_cdp(driver: WebDriver, css: str, abs_path: str) -> bool:
+    """
+    Sets the input's files through DOM.setFileInputFiles.
+    Chrome dispatches input/change itself, so no synthetic events are needed.
+
+    Returns:
+        False if the driver has no CDP access or the call failed
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+
+    try:
+        result = driver.execute_cdp_cmd(
+            "Runtime.evaluate",
+            {"expression": f"document.querySelector({json.dumps(css)})"}
+        )
+        object_id = result.get("result", {}).get("objectId")
+        if not object_id:
+            return False
+
+        driver.execute_cdp_cmd("DOM.setFileInputFiles", {"files": [abs_path], "objectId": object_id})
+        return True
+    except Exception as e:
+        logger.debug(f"CDP file upload unavailable, using send_keys: {e}")
+        return False
+
+
+def _wait_for_upload(driver: WebDriver, element, file_name: str, since: float, timeout: float) -> tuple[bool, str]:
+    """
+    Polls the upload widget until the file is accepted.
+
+    Requires a positive completion signal while no progress indicator is showing:
+    the widget displays the file name (also for widgets that clear the input after
+    reading the file), or the input holds the file and either an upload request
+    completed or the input is a plain visible one with no widget to wait for.
+    """
+    deadline = time.monotonic() + timeout
+    state = {}
+
+    while time.monotonic() < deadline:
+        state = driver.execute_script(UPLOAD_STATE_SCRIPT, element, file_name, since)
+
+        if not state.get("busy"):
+            if state.get("shown"):
                 return True, ""
-                    
-            except TimeoutException:
-                if attempt < max_retries - 1:
-                    time.sleep(0.5)
-                    continue
-                return False, f"File input not found: {selector}"
-                
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    time.sleep(0.5)
-                    continue
-                return False, f"Error: {str(e)}"
-    finally:
-        # Clean up temporary file and directory
-        if temp_dir:
-            try:
-                import shutil
-                shutil.rmtree(temp_dir)
-            except:
-                pass
-    
-    return False, "Max retries exceeded"
+            if state.get("files") and (state.get("requests") or state.get("native")):
+                return True, ""
+
+        time.sleep(0.1)
 
+    if not state.get("files"):
+        return False, f"File was not attached to input: {file_name}"
+    return False, f"Upload did not finish within {timeout:.0f}s: {file_name}"
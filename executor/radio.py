@@ -3,119 +3,127 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from matching import score_option
+from verifier.verify import RADIO_GROUP_JS
 import time
+import logging
 
-def fill_radio(driver: WebDriver, selector: str, value: str, max_retries: int = 3) -> tuple[bool, str]:
+logger = logging.getLogger(__name__)
+
+# Resolves the whole radio group in one call (group resolution, labels and the
+# checked test are shared with the verifier).
+# Returns [{el, value, id, checked, label}] for every option.
+READ_GROUP_SCRIPT = RADIO_GROUP_JS + """
+return radioItems(arguments[0]).map(function(item) {
+    return {
+        el: item,
+        value: radioValue(item),
+        id: item.id || '',
+        checked: radioChecked(item),
+        label: radioLabel(item)
+    };
+});
+"""
+
+
+def fill_radio(driver: WebDriver, selector: str, value: str, max_retries: int = 3,
+               min_score: float = 0.6) -> tuple[bool, str]:
     """
     Selects a radio button.
-    
+
     Strategy:
-    1. Find all radio inputs in the group (by name attribute)
-    2. Match by value or associated label text
-    3. Click the matching radio button
-    
+    1. Fetch every option in the group (value, id, checked state, label text) in one script call
+    2. Rank options against the desired value by value attribute and label text
+    3. Click the best match and verify by re-reading the group
+
+    Works for native radio inputs, ARIA [role="radio"] items and Greenhouse's
+    button-style radio widgets.
+
     Args:
         driver: Selenium WebDriver instance
         selector: CSS selector for the radio group or specific input
         value: Value to select (matches value attribute or label text)
         max_retries: Number of retry attempts
-        
+        min_score: Lowest match score accepted (0-1)
+
     Returns:
         (success: bool, error_message: str)
     """
     for attempt in range(max_retries):
         try:
             wait = WebDriverWait(driver, 10)
-            
+
             # Find the radio button element
             element = wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, selector))
             )
-            
-            # Get the name attribute to find all radios in the group
-            name = element.get_attribute("name")
-            
-            if name:
-                # Find all radio buttons with this name
-                radios = driver.find_elements(By.CSS_SELECTOR, f'input[type="radio"][name="{name}"]')
-                
-                # Try to match by value attribute first
-                for radio in radios:
-                    if radio.get_attribute("value") == value:
-                        # Scroll into view
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", radio)
-                        time.sleep(0.3)
-                        
-                        # Click (use JavaScript if element is not interactable)
-                        try:
-                            radio.click()
-                        except:
-                            driver.execute_script("arguments[0].click();", radio)
-                        
-                        time.sleep(0.3)
-                        
-                        # Verify selection
-                        if radio.is_selected():
-                            return True, ""
-                        else:
-                            if attempt < max_retries - 1:
-                                continue
-                            return False, "Radio button not selected after click"
-                
-                # Try to match by associated label text
-                for radio in radios:
-                    radio_id = radio.get_attribute("id")
-                    if radio_id:
-                        try:
-                            label = driver.find_element(By.CSS_SELECTOR, f'label[for="{radio_id}"]')
-                            if value.lower() in label.text.lower():
-                                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", radio)
-                                time.sleep(0.3)
-                                
-                                try:
-                                    radio.click()
-                                except:
-                                    driver.execute_script("arguments[0].click();", radio)
-                                
-                                time.sleep(0.3)
-                                
-                                if radio.is_selected():
-                                    return True, ""
-                        except:
-                            continue
-                
+
+            group = driver.execute_script(READ_GROUP_SCRIPT, element)
+            if not group:
                 if attempt < max_retries - 1:
+                    time.sleep(0.5)
+                    continue
+                return False, f"No radio options found for: {selector}"
+
+            index = _pick_option(str(value), group, min_score)
+            if index is None:
+                if attempt < max_retries - 1:
+                    time.sleep(0.5)
                     continue
                 return False, f"No radio button found matching value: {value}"
-            else:
-                # Single radio, just click it
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                time.sleep(0.3)
-                
+
+            option = group[index]
+            if not option["checked"]:
+                radio = option["el"]
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", radio)
+
+                # Click (use JavaScript if element is not interactable)
                 try:
-                    element.click()
+                    radio.click()
                 except:
-                    driver.execute_script("arguments[0].click();", element)
-                
-                time.sleep(0.3)
-                
-                if element.is_selected():
-                    return True, ""
-                else:
-                    if attempt < max_retries - 1:
-                        continue
-                    return False, "Radio button not selected"
-                
+                    driver.execute_script("arguments[0].click();", radio)
+
+                # Verify selection
+                group = driver.execute_script(READ_GROUP_SCRIPT, element)
+
+            if index < len(group) and group[index]["checked"]:
+                logger.debug(f"Selected radio '{group[index]['label'] or group[index]['value']}' for '{value}'")
+                return True, ""
+
+            if attempt < max_retries - 1:
+                continue
+            return False, "Radio button not selected after click"
+
         except TimeoutException:
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
             return False, f"Radio button not found: {selector}"
-            
+
         except Exception as e:
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
             return False, f"Error: {str(e)}"
-    
+
     return False, "Max retries exceeded"
+
+
+def _pick_option(value: str, group: list[dict], min_score: float) -> int | None:
+    """
+    Ranks group options by their value attribute and label text.
+    A single-option group is selected regardless of its label.
+    """
+    if len(group) == 1:
+        return 0
+
+    best_index, best_score = None, 0.0
+    for index, option in enumerate(group):
+        score = max(
+            score_option(value, option.get("value") or "")[0],
+            score_option(value, option.get("label") or "")[0],
+        )
+        if score > best_score:
+            best_index, best_score = index, score
+
+    return best_index if best_score >= min_score else None
@@ -0,0 +1,380 @@
+"""
+Fill-plan runner with resumable checkpoints.
+
+Every action's outcome is written to a checkpoint file as soon as it
+finishes. When a plan is run again after a failure (stale elements, a
+crashed browser), one bulk read of the page (verify_plan) finds the fields
+that already hold their expected value; those are skipped and only the
+remaining actions are executed, so a retry does not re-type fields or
+re-upload files that already succeeded.
+
+Scheduling: the plan is cut into segments at click actions (Next/Submit
+buttons keep their position). Within a segment, file uploads are attached
+first and left to finish in the background, required fields are filled
+before optional ones, and required uploads are awaited before the optional
+fields. A required field that fails while its element is on the page aborts
+the run at once (fail fast); one whose element is missing is retried after
+the optional fields, which may be what reveals it.
+"""
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from instrumentation import span
+from models import Action, ExecutionResponse, FillPlan
+from verifier import verify_plan
+from . import EXECUTORS
+from .input_file import (
+    PendingUpload, cleanup_file, file_input_selectors, finish_upload, prepare_file, start_upload
+)
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.getcwd(), "fill_checkpoints")
+
+# Seconds to wait for an action's element before it counts as missing
+PRESENCE_TIMEOUT = 3.0
+
+PRESENCE_SCRIPT = """
+return arguments[0].some(function(selector) {
+    try { return !!document.querySelector(selector); } catch (e) { return false; }
+});
+"""
+
+
+class PlanCheckpoint:
+    """
+    Per-action results of one fill plan, persisted as JSON after every action.
+
+    Args:
+        path: Checkpoint file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.results = {}  # action id -> success/failed/skipped
+        self.errors = {}
+        self._load()
+
+    @classmethod
+    def for_plan(cls, plan: FillPlan, directory: str = DEFAULT_CHECKPOINT_DIR) -> "PlanCheckpoint":
+        """Checkpoint keyed by job URL and plan contents (a changed plan starts fresh)"""
+        digest = hashlib.sha256(plan.model_dump_json().encode('utf-8')).hexdigest()[:24]
+        return cls(os.path.join(directory, f"{digest}.json"))
+
+    @property
+    def resuming(self) -> bool:
+        return bool(self.results)
+
+    def record(self, action_id: str, status: str, error: str | None = None):
+        self.results[action_id] = status
+        if error:
+            self.errors[action_id] = error
+        else:
+            self.errors.pop(action_id, None)
+        self._save()
+
+    def clear(self):
+        """Forgets the plan (called once every action succeeded)"""
+        self.results, self.errors = {}, {}
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.results = data.get('results', {})
+        self.errors = data.get('errors', {})
+
+    def _save(self):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename: a crash mid-write must not corrupt the checkpoint
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'results': self.results, 'errors': self.errors, 'updated': time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+
+def run_plan(driver: WebDriver, plan: FillPlan, checkpoint: PlanCheckpoint | None = None,
+             navigate: bool = False, prioritize: bool = True, fail_fast: bool = True,
+             upload_timeout: float = 30.0) -> ExecutionResponse:
+    """
+    Executes a fill plan, resuming from the checkpoint if one exists.
+
+    Args:
+        driver: Selenium WebDriver instance
+        plan: Fill plan
+        checkpoint: Where per-action results are persisted (None: not persisted)
+        navigate: Load plan.jobUrl first (e.g. resuming in a fresh browser)
+        prioritize: Required fields first, uploads in the background (False: plan order)
+        fail_fast: Stop at the first irrecoverable failure of a required action
+        upload_timeout: Seconds to wait for each upload to finish
+
+    Returns:
+        ExecutionResponse - 'failed' if a required action failed or the run was
+        aborted (actions that did not run are reported as skipped)
+    """
+    if navigate:
+        with span(phase="fill.load"):
+            driver.get(plan.jobUrl)
+
+    done = set()
+    if checkpoint is not None and checkpoint.resuming:
+        done = _already_filled(driver, plan.actions, checkpoint)
+        logger.info(f"Resuming plan: {len(done)}/{len(plan.actions)} action(s) already hold their value")
+
+    run = _PlanRun(driver, checkpoint, fail_fast, upload_timeout)
+    for action_id in done:
+        run.results[action_id] = "success"
+
+    todo = [action for action in plan.actions if action.id not in done]
+    if prioritize:
+        for segment, barrier in _segments(todo):
+            run.run_segment(segment)
+            if barrier is not None and not run.aborted:
+                run.execute(barrier)
+            if run.aborted:
+                break
+    else:
+        for action in todo:
+            run.execute(action)
+            if run.aborted:
+                break
+
+    for action in plan.actions:
+        if action.id not in run.results:
+            run.results[action.id] = "skipped"
+            run.errors[action.id] = f"Not run: {run.aborted}"
+
+    results = {action.id: run.results[action.id] for action in plan.actions}
+    failed_required = [a.id for a in plan.actions if a.required and results[a.id] != "success"]
+    status = "failed" if failed_required or run.aborted else "completed"
+    if run.aborted:
+        logger.error(f"Plan aborted ({run.aborted}); checkpoint kept for resume")
+
+    if checkpoint is not None and all(result == "success" for result in results.values()):
+        checkpoint.clear()
+
+    return ExecutionResponse(status=status, results=results, errors=run.errors)
+
+
+def _segments(actions: list[Action]) -> list[tuple[list[Action], Action | None]]:
+    """Splits actions at clicks: [(fields before the click, click), ..., (trailing fields, None)]"""
+    segments, current = [], []
+    for action in actions:
+        if action.type == "click":
+            segments.append((current, action))
+            current = []
+        else:
+            current.append(action)
+    if current:
+        segments.append((current, None))
+    return segments
+
+
+class _PlanRun:
+    """Results and abort state of one run_plan call"""
+
+    def __init__(self, driver: WebDriver, checkpoint: PlanCheckpoint | None, fail_fast: bool,
+                 upload_timeout: float):
+        self.driver = driver
+        self.checkpoint = checkpoint
+        self.fail_fast = fail_fast
+        self.upload_timeout = upload_timeout
+        self.results = {}
+        self.errors = {}
+        self.aborted = None  # reason, once the run has stopped
+
+    def run_segment(self, actions: list[Action]):
+        """Uploads started first, required fields, required uploads, optional fields, optional uploads"""
+        uploads = {}  # action id -> (action, PendingUpload, temp dir)
+        fields = []
+        for action in sorted(actions, key=lambda a: not a.required):
+            if action.type == "input_file":
+                started = self._start_upload(action)
+                if started:
+                    uploads[action.id] = started
+                    continue
+            fields.append(action)  # Includes uploads that could not start: retried synchronously
+
+        try:
+            deferred = []
+            for action in fields:
+                if action.required:
+                    ok = self.execute(action, defer_missing=True)
+                    if ok is None:
+                        deferred.append(action)
+                    if self.aborted:
+                        return
+
+            self._await_uploads([entry for entry in uploads.values() if entry[0].required])
+            if self.aborted:
+                return
+
+            for action in fields:
+                if not action.required:
+                    self.execute(action)
+                    if self.aborted:
+                        return
+
+            # Required fields that were not on the page yet (revealed by an answer above)
+            for action in deferred:
+                self.execute(action)
+                if self.aborted:
+                    return
+
+            self._await_uploads([entry for entry in uploads.values() if not entry[0].required])
+        finally:
+            for action, upload, temp_dir in uploads.values():
+                cleanup_file(temp_dir)
+                if action.id not in self.results:
+                    self.results[action.id] = "skipped"
+                    self.errors[action.id] = f"Upload abandoned: {self.aborted}"
+
+    def execute(self, action: Action, defer_missing: bool = False) -> bool | None:
+        """
+        Runs one action and records the result.
+
+        Returns:
+            True/False, or None if defer_missing and a required action failed
+            because its element is not on the page (yet)
+        """
+        # Checked up front: the executors wait and retry for ~30s on a missing element
+        if not _element_present(self.driver, _selectors(action)):
+            if defer_missing and action.required and _session_alive(self.driver):
+                logger.info(f"Required field '{action.id}' not on the page yet, retrying after the optional fields")
+                return None
+            self._record(action, False, f"Element not found: {action.selector}")
+            return False
+
+        ok, message = _execute(self.driver, action)
+        self._record(action, ok, message)
+        return ok
+
+    def _record(self, action: Action, ok: bool, message: str):
+        status = "success" if ok else "failed"
+        self.results[action.id] = status
+        if ok:
+            self.errors.pop(action.id, None)
+        else:
+            self.errors[action.id] = message
+        if self.checkpoint is not None:
+            self.checkpoint.record(action.id, status, None if ok else message)
+
+        if ok or self.aborted:
+            return
+        if not _session_alive(self.driver):
+            self.aborted = "Browser session lost"
+        elif self.fail_fast and action.required:
+            self.aborted = f"required field '{action.id}' failed"
+
+    def _start_upload(self, action: Action) -> tuple[Action, PendingUpload, str | None] | None:
+        """Attaches the file without waiting; None if it could not be started"""
+        if not _element_present(self.driver, _selectors(action)):
+            return None
+        abs_path, temp_dir, error = prepare_file(action.value, action.fileName)
+        if error:
+            return None
+        try:
+            with span(executor="input_file.start", action=action.id):
+                return action, start_upload(self.driver, action.selector, abs_path), temp_dir
+        except Exception as e:
+            logger.debug(f"Could not start upload '{action.id}' early: {e}")
+            cleanup_file(temp_dir)
+            return None
+
+    def _await_uploads(self, entries: list):
+        """Waits for started uploads; one that did not finish is retried with the regular executor"""
+        for action, upload, temp_dir in entries:
+            if self.aborted:
+                return
+            with span(executor="input_file.await", action=action.id):
+                try:
+                    ok, message = finish_upload(self.driver, upload, self.upload_timeout)
+                except Exception as e:
+                    ok, message = False, f"Error: {str(e)}"
+            if ok:
+                self._record(action, ok, message)
+            else:
+                logger.info(f"Background upload '{action.id}' failed ({message}), retrying")
+                self.execute(action)
+
+
+def _execute(driver: WebDriver, action: Action) -> tuple[bool, str]:
+    """Runs one action through its executor"""
+    fill = EXECUTORS[action.type]
+    kwargs = {"fileName": action.fileName} if action.type == "input_file" else {}
+    with span(executor=action.type, action=action.id):
+        try:
+            return fill(driver, action.selector, action.value, **kwargs)
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+
+
+def _already_filled(driver: WebDriver, actions: list[Action], checkpoint: PlanCheckpoint) -> set[str]:
+    """
+    Ids of actions that need not run again, from one bulk read of the page.
+
+    A field counts as done when it already holds its expected value. Clicks
+    leave nothing to read back, so they also need a successful checkpoint,
+    and are run again whenever a later action still has to run: a "Next"
+    button that is on the page means the form is (again) at that step, and
+    the fields behind it only appear after the click.
+    """
+    try:
+        with span(phase="fill.resume_check"):
+            verification = verify_plan(driver, actions)
+    except Exception as e:
+        logger.warning(f"Could not read page state for resume, re-running all actions: {e}")
+        return set()
+
+    done = set()
+    pending_after = False
+    for action in reversed(actions):
+        filled = bool(verification["results"].get(action.id))
+        if action.type == "click":
+            filled = filled and checkpoint.results.get(action.id) == "success" and not pending_after
+        if filled:
+            done.add(action.id)
+        else:
+            pending_after = True
+    return done
+
+
+def _selectors(action: Action) -> list[str]:
+    """Selectors the action's executor may use (file inputs have Greenhouse fallbacks)"""
+    if action.type == "input_file":
+        return file_input_selectors(action.selector)
+    return [action.selector]
+
+
+def _element_present(driver: WebDriver, selectors: list[str], timeout: float = PRESENCE_TIMEOUT) -> bool:
+    """Whether any selector matches, polling briefly for elements still being rendered"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if driver.execute_script(PRESENCE_SCRIPT, selectors):
+                return True
+        except Exception:
+            return False
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.1)
+
+
+def _session_alive(driver: WebDriver) -> bool:
+    try:
+        driver.execute_script("return 1;")
+        return True
+    except Exception:
+        return False
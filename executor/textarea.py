@@ -4,47 +4,97 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 import time
+import logging
 
-def fill_textarea(driver: WebDriver, selector: str, value: str, max_retries: int = 3) -> tuple[bool, str]:
+logger = logging.getLogger(__name__)
+
+# Answers at least this long are pasted instead of typed in "auto" mode
+PASTE_THRESHOLD = 200
+
+# Focuses the field and selects the given range [start, end] (end=-1 means to the end)
+SELECT_RANGE_SCRIPT = """
+var el = arguments[0], start = arguments[1], end = arguments[2];
+el.scrollIntoView({block: 'center'});
+el.focus();
+el.setSelectionRange(start, end < 0 ? el.value.length : end);
+"""
+
+# Fallback when CDP is unavailable: insertText keeps React's value tracking in sync
+EXEC_INSERT_SCRIPT = """
+return document.execCommand('insertText', false, arguments[0]);
+"""
+
+# Returns [length, FNV-1a hash] of the field value over UTF-16 code units
+VALUE_DIGEST_SCRIPT = """
+var v = arguments[0].value, h = 0x811c9dc5;
+for (var i = 0; i < v.length; i++) {
+    h ^= v.charCodeAt(i);
+    h = Math.imul(h, 0x01000193) >>> 0;
+}
+return [v.length, h];
+"""
+
+
+def fill_textarea(driver: WebDriver, selector: str, value: str, max_retries: int = 3,
+                  mode: str = "auto") -> tuple[bool, str]:
     """
     Fills a <textarea> element.
-    
+
     Used for:
     - Cover letters
     - Additional information
     - Multi-line text fields
-    
+
+    Modes:
+    - "type": send_keys character by character
+    - "paste": insert the whole text in one shot (CDP Input.insertText, else
+      execCommand('insertText')), verify by length + hash, and on mismatch
+      re-insert only the divergent suffix
+    - "auto": paste when the value is at least PASTE_THRESHOLD characters
+
     Args:
         driver: Selenium WebDriver instance
         selector: CSS selector
         value: Text value to fill (can contain newlines)
         max_retries: Number of retry attempts
-        
+        mode: "auto", "paste" or "type"
+
     Returns:
         (success: bool, error_message: str)
     """
+    value = (value or "").replace("\r\n", "\n")
+    paste = mode == "paste" or (mode == "auto" and len(value) >= PASTE_THRESHOLD)
+
     for attempt in range(max_retries):
         try:
             wait = WebDriverWait(driver, 10)
             element = wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, selector))
             )
-            
+
+            if paste:
+                ok, error = _paste_value(driver, element, value, max_repairs=max_retries)
+                if ok:
+                    return True, ""
+                if attempt < max_retries - 1:
+                    continue
+                return False, error
+
             # Scroll into view
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
             time.sleep(0.3)
-            
+
             # Wait for element to be clickable
             element = wait.until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
             )
-            
+
             # Clear and fill
             element.clear()
             time.sleep(0.2)
             element.send_keys(value)
             time.sleep(0.3)
-            
+
             # Verify
             actual_value = element.get_attribute("value")
             if actual_value == value:
@@ -53,23 +103,95 @@ def fill_textarea(driver: WebDriver, selector: str, value: str, max_retries: int
                 if attempt < max_retries - 1:
                     continue
                 return False, f"Verification failed: expected '{value[:50]}...', got '{actual_value[:50]}...'"
-                
+
         except TimeoutException:
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
             return False, f"Element not found: {selector}"
-            
+
         except StaleElementReferenceException:
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
             return False, "Element became stale"
-            
+
         except Exception as e:
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
             return False, f"Error: {str(e)}"
-    
+
     return False, "Max retries exceeded"
+
+
+def _paste_value(driver: WebDriver, element, value: str, max_repairs: int = 3) -> tuple[bool, str]:
+    """
+    Replaces the field's content with value in one insert, then repairs divergent suffixes.
+    """
+    if not value:
+        element.clear()
+        return (True, "") if _digest_matches(driver, element, value) else (False, "Field could not be cleared")
+
+    # Select everything so the insert replaces the existing content
+    driver.execute_script(SELECT_RANGE_SCRIPT, element, 0, -1)
+    _insert_text(driver, value)
+
+    for _ in range(max_repairs):
+        if _digest_matches(driver, element, value):
+            return True, ""
+
+        # Only now transfer the actual value, and re-insert from the first differing character
+        actual = (element.get_attribute("value") or "").replace("\r\n", "\n")
+        common = _common_prefix_length(actual, value)
+        start = _utf16_length(value[:common])
+        logger.debug(f"Textarea diverged at char {common}/{len(value)}, re-inserting suffix")
+
+        driver.execute_script(SELECT_RANGE_SCRIPT, element, start, -1)
+        _insert_text(driver, value[common:])
+
+    if _digest_matches(driver, element, value):
+        return True, ""
+    return False, f"Verification failed after paste: expected {len(value)} chars"
+
+
+def _insert_text(driver: WebDriver, text: str):
+    """Inserts text at the current selection via CDP, falling back to execCommand"""
+    if hasattr(driver, "execute_cdp_cmd"):
+        try:
+            driver.execute_cdp_cmd("Input.insertText", {"text": text})
+            return
+        except Exception as e:
+            logger.debug(f"CDP insertText unavailable, using execCommand: {e}")
+
+    driver.execute_script(EXEC_INSERT_SCRIPT, text)
+
+
+def _digest_matches(driver: WebDriver, element, value: str) -> bool:
+    """Compares length + hash of the field value without transferring it"""
+    length, digest = driver.execute_script(VALUE_DIGEST_SCRIPT, element)
+    return length == _utf16_length(value) and digest == _fnv1a_utf16(value)
+
+
+def _fnv1a_utf16(text: str) -> int:
+    """32-bit FNV-1a over UTF-16 code units (matches VALUE_DIGEST_SCRIPT)"""
+    data = text.encode("utf-16-le")
+    h = 0x811c9dc5
+    for i in range(0, len(data), 2):
+        h ^= data[i] | (data[i + 1] << 8)
+        h = (h * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def _utf16_length(text: str) -> int:
+    """Length of text as JavaScript counts it"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Number of leading characters a and b share"""
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
@@ -0,0 +1,205 @@
+"""
+WebDriver command instrumentation.
+
+Wraps a driver's `execute` method (the single choke point every WebDriver
+command goes through: find_element, get_attribute, execute_script, send_keys...)
+to count and time each command, attributing it to the active executor/action
+or scanner phase. Drivers that are not instrumented pay no overhead at all.
+
+Usage:
+    driver = create_driver(instrument=True)
+
+    with span(phase="scan.dropdowns"):
+        ...
+
+    with RECORDER.job("job-123") as trace:
+        with span(executor="dropdown_custom", action="question_61968829"):
+            fill_dropdown_custom(driver, selector, value)
+    trace.to_dict()
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Active attribution: {'job': JobTrace | None, 'executor', 'action', 'phase'}
+_scope = contextvars.ContextVar("webdriver_scope", default={})
+
+
+class Histogram:
+    """Fixed-bucket latency histogram"""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self) -> dict:
+        buckets = {str(bound): n for bound, n in zip(LATENCY_BUCKETS, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "buckets": buckets,
+        }
+
+
+class JobTrace:
+    """Structured per-job trace of every WebDriver command issued inside RECORDER.job()"""
+
+    def __init__(self, job_id: str, max_events: int = 10000):
+        self.job_id = job_id
+        self.max_events = max_events
+        self.started = time.perf_counter()
+        self.events = []
+        self.commands = 0
+        self.time = 0.0
+
+    def add(self, command: str, duration: float, scope: dict):
+        self.commands += 1
+        self.time += duration
+        if len(self.events) < self.max_events:
+            self.events.append({
+                "t": round(time.perf_counter() - self.started, 6),
+                "command": command,
+                "ms": round(duration * 1000, 3),
+                "executor": scope.get("executor"),
+                "action": scope.get("action"),
+                "phase": scope.get("phase"),
+            })
+
+    def to_dict(self) -> dict:
+        by_scope = {}
+        for event in self.events:
+            key = _scope_label(event)
+            entry = by_scope.setdefault(key, {"commands": 0, "ms": 0.0})
+            entry["commands"] += 1
+            entry["ms"] = round(entry["ms"] + event["ms"], 3)
+
+        return {
+            "job": self.job_id,
+            "commands": self.commands,
+            "webdriver_time": round(self.time, 6),
+            "wall_time": round(time.perf_counter() - self.started, 6),
+            "truncated": self.commands > len(self.events),
+            "by_scope": by_scope,
+            "events": self.events,
+        }
+
+
+class CommandRecorder:
+    """Aggregates command latencies per scope and command name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, command: str, duration: float, scope: dict):
+        key = (_scope_label(scope), command)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(duration)
+
+        job = scope.get("job")
+        if job is not None:
+            job.add(command, duration, scope)
+
+    @contextmanager
+    def job(self, job_id: str):
+        """Collects a JobTrace for every command issued inside the block"""
+        trace = JobTrace(job_id)
+        token = _scope.set({**_scope.get(), "job": trace})
+        try:
+            yield trace
+        finally:
+            _scope.reset(token)
+
+    def snapshot(self) -> dict:
+        """Aggregated histograms as {scope: {command: histogram}} plus totals"""
+        with self._lock:
+            items = [(key, histogram.to_dict()) for key, histogram in self._histograms.items()]
+
+        scopes = {}
+        total_commands, total_time = 0, 0.0
+        for (scope, command), histogram in sorted(items):
+            scopes.setdefault(scope, {})[command] = histogram
+            total_commands += histogram["count"]
+            total_time += histogram["sum"]
+
+        return {"commands": total_commands, "time": round(total_time, 6), "scopes": scopes}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+# Process-wide recorder used by create_driver(instrument=True)
+RECORDER = CommandRecorder()
+
+
+@contextmanager
+def span(**fields):
+    """
+    Attributes WebDriver commands issued inside the block.
+
+    Args:
+        executor: Executor name (e.g. "dropdown_custom")
+        action: Fill plan action id
+        phase: Scanner phase (e.g. "scan.dropdowns")
+    """
+    token = _scope.set({**_scope.get(), **fields})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def instrument_driver(driver, recorder: CommandRecorder = RECORDER):
+    """
+    Wraps driver.execute so every WebDriver command is timed and recorded.
+    Idempotent: instrumenting twice has no further effect.
+    """
+    if getattr(driver, "_instrumented", False):
+        return driver
+
+    execute = driver.execute
+    perf_counter = time.perf_counter
+
+    def instrumented_execute(driver_command, params=None):
+        started = perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            recorder.record(driver_command, perf_counter() - started, _scope.get())
+
+    driver.execute = instrumented_execute
+    driver._instrumented = True
+    return driver
+
+
+def _scope_label(scope: dict) -> str:
+    """Aggregation key for a scope: the scanner phase, else the executor, else unattributed"""
+    if scope.get("phase"):
+        return scope["phase"]
+    if scope.get("executor"):
+        return f"executor.{scope['executor']}"
+    return "unattributed"
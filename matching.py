@@ -0,0 +1,95 @@
+"""
+Option matching shared by the executors and the AI service.
+
+Ranks option texts against a desired value entirely in Python, so callers can
+fetch all options in one script call and select the winner in another.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import NamedTuple
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+class OptionMatch(NamedTuple):
+    """A ranked candidate option"""
+    index: int
+    text: str
+    score: float
+    method: str  # exact, case, normalized, prefix, contains, tokens, fuzzy
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation/whitespace to single spaces"""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", text.casefold()).strip()
+
+
+def score_option(value: str, option: str) -> tuple[float, str]:
+    """
+    Scores how well an option text matches the desired value.
+
+    Tiers are tried from strictest to loosest; each tier caps the score so a
+    stricter match always outranks a looser one.
+
+    Returns:
+        (score in [0, 1], method name)
+    """
+    if option == value:
+        return 1.0, "exact"
+    if option.strip().casefold() == value.strip().casefold():
+        return 0.97, "case"
+
+    nv, no = normalize(value), normalize(option)
+    if not nv or not no:
+        return 0.0, "none"
+    if nv == no:
+        return 0.94, "normalized"
+
+    # "Yes" -> "Yes, I am authorized", "United States" -> "United States of America"
+    if no.startswith(nv + " "):
+        return 0.88, "prefix"
+    if f" {nv} " in f" {no} ":
+        return 0.8, "contains"
+
+    tv, to = set(nv.split()), set(no.split())
+    common = len(tv & to)
+    token_score = 0.0
+    if common:
+        jaccard = common / len(tv | to)
+        coverage = common / len(tv)
+        token_score = 0.75 * (0.5 * jaccard + 0.5 * coverage)
+
+    fuzzy_score = 0.75 * SequenceMatcher(None, nv, no).ratio()
+
+    if token_score >= fuzzy_score and token_score > 0:
+        return round(token_score, 4), "tokens"
+    return round(fuzzy_score, 4), "fuzzy"
+
+
+def rank_options(value: str, options: list[str]) -> list[OptionMatch]:
+    """
+    Ranks every option against value, best first.
+    Ties prefer the shorter option text, then the earlier option.
+    """
+    ranked = []
+    for index, text in enumerate(options):
+        if text is None:
+            continue
+        score, method = score_option(value, text)
+        if score > 0:
+            ranked.append(OptionMatch(index, text, score, method))
+
+    ranked.sort(key=lambda m: (-m.score, len(m.text), m.index))
+    return ranked
+
+
+def best_match(value: str, options: list[str], min_score: float = 0.6) -> OptionMatch | None:
+    """Returns the best ranked option, or None if nothing scores at least min_score"""
+    ranked = rank_options(value, options)
+    if ranked and ranked[0].score >= min_score:
+        return ranked[0]
+    return None
@@ -45,3 +45,5 @@ class AIResponse(BaseModel):
     intent: str | None = None  # Canonical intent path (e.g., "social.linkedin")
     isNewIntent: bool = False  # True if AI suggested a new intent
     suggestedIntentName: str | None = None  # If creating new intent, suggested name
+    optionIndex: int | None = None  # Index of the snapped option in AIRequest.options
+    matchScore: float | None = None  # Snap score of the answer against that option (0-1)
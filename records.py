@@ -0,0 +1,201 @@
+"""
+Compact question records shared by the scanner, batch tools and fill plans.
+
+Scanner output is a list of dicts in the extension's camelCase schema; a large
+batch holds thousands of them with the same labels, selectors and option
+lists repeated. Question stores one field as a tuple with interned strings and
+tuple options, converts directly into a models.Action (mapping scanner field
+types such as 'select' and 'file' onto executor types), and round-trips to the
+dict schema for JSON output.
+
+dumps/loads use orjson when installed (json otherwise); packb/unpackb need
+msgpack.
+"""
+
+import json
+import sys
+from typing import Iterable, NamedTuple
+
+from models import Action, FillPlan
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional: binary serialization
+    msgpack = None
+
+# Scanner fieldType -> Action.type (executor)
+ACTION_TYPES = {
+    'text': 'input_text',
+    'email': 'input_text',
+    'tel': 'input_text',
+    'number': 'input_text',
+    'url': 'input_text',
+    'password': 'input_text',
+    'textarea': 'textarea',
+    'file': 'input_file',
+    'select': 'dropdown_native',
+    'dropdown_custom': 'dropdown_custom',
+    'radio': 'radio',
+    'checkbox': 'checkbox',
+}
+
+
+def _intern(text: str | None) -> str | None:
+    return sys.intern(text) if text is not None else None
+
+
+class Question(NamedTuple):
+    """One scanned field"""
+    question_text: str
+    field_type: str
+    selector: str
+    required: bool = False
+    options: tuple[str, ...] | None = None
+    step: int = 1
+    conditional: bool = False
+    depends_on: tuple[tuple[str, str], ...] = ()  # (selector, option) pairs that reveal it
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Question":
+        """From the scanner dict schema; strings are interned so repeats share memory"""
+        options = data.get('options')
+        return cls(
+            _intern(data['questionText']),
+            _intern(data['fieldType']),
+            _intern(data['selector']),
+            bool(data.get('required')),
+            tuple(_intern(str(option)) for option in options) if options is not None else None,
+            int(data.get('step', 1)),
+            bool(data.get('conditional')),
+            tuple((_intern(d['selector']), _intern(d['option'])) for d in data.get('dependsOn') or ()),
+        )
+
+    def to_dict(self) -> dict:
+        """Back to the scanner dict schema"""
+        data = {
+            'questionText': self.question_text,
+            'fieldType': self.field_type,
+            'options': list(self.options) if self.options is not None else None,
+            'required': self.required,
+            'selector': self.selector,
+            'step': self.step,
+        }
+        if self.conditional:
+            data['conditional'] = True
+            data['dependsOn'] = [{'selector': selector, 'option': option} for selector, option in self.depends_on]
+        return data
+
+    @property
+    def action_type(self) -> str | None:
+        """Executor type for this field, or None if no executor handles it"""
+        return ACTION_TYPES.get(self.field_type)
+
+    @property
+    def action_id(self) -> str:
+        """Stable action id: the element id, radio group name, or the selector itself"""
+        selector = self.selector
+        if selector.startswith('#'):
+            return selector[1:]
+        if selector.startswith('[id="') and selector.endswith('"]'):
+            return selector[5:-2]
+        marker = '[name="'
+        if marker in selector:
+            start = selector.index(marker) + len(marker)
+            return selector[start:selector.index('"]', start)]
+        return selector
+
+    def to_action(self, value: str | bool | None, file_name: str | None = None) -> Action:
+        """Fill-plan action answering this question with value"""
+        if self.action_type is None:
+            raise ValueError(f"No executor for field type '{self.field_type}'")
+        if self.action_type == 'checkbox' and isinstance(value, str):
+            value = value.strip().lower() in ('yes', 'true', '1', 'on', 'checked')
+        return Action(
+            id=self.action_id,
+            type=self.action_type,
+            selector=self.selector,
+            value=value,
+            required=self.required,
+            fileName=file_name,
+        )
+
+
+def questions_from_result(result: dict) -> tuple[Question, ...]:
+    """Questions of a scan result (FormScanner / static scanner output)"""
+    return tuple(Question.from_dict(question) for question in result['questions'])
+
+
+def build_fill_plan(job_url: str, questions: Iterable[Question], answers: dict,
+                    file_names: dict | None = None) -> FillPlan:
+    """
+    Fill plan for the answered questions.
+
+    Args:
+        job_url: Application URL
+        questions: Scanned questions
+        answers: Value per question, keyed by selector or question text;
+            unanswered questions are left out of the plan
+        file_names: Display file name per selector for file uploads
+
+    Raises:
+        ValueError: An answered question has no executor
+    """
+    file_names = file_names or {}
+    actions = []
+    for question in questions:
+        if question.selector in answers:
+            value = answers[question.selector]
+        elif question.question_text in answers:
+            value = answers[question.question_text]
+        else:
+            continue
+        actions.append(question.to_action(value, file_names.get(question.selector)))
+    return FillPlan(jobUrl=job_url, actions=actions)
+
+
+def dumps(data) -> bytes:
+    """JSON bytes (orjson when available); Questions and other NamedTuples serialize as dicts"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_PASSTHROUGH_SUBCLASS)
+    return json.dumps(_plain(data), default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: bytes | str):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def packb(data) -> bytes:
+    """msgpack bytes (requires the msgpack package)"""
+    if msgpack is None:
+        raise ImportError("msgpack is not installed (pip install msgpack)")
+    return msgpack.packb(_plain(data), default=_default, use_bin_type=True)
+
+
+def unpackb(data: bytes):
+    if msgpack is None:
+        raise ImportError("msgpack is not installed (pip install msgpack)")
+    return msgpack.unpackb(data, raw=False)
+
+
+def _plain(data):
+    """Questions to dicts, recursively (json and msgpack would write NamedTuples as arrays)"""
+    if isinstance(data, Question):
+        return data.to_dict()
+    if isinstance(data, dict):
+        return {key: _plain(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_plain(value) for value in data]
+    return data
+
+
+def _default(obj):
+    if isinstance(obj, Question):
+        return obj.to_dict()
+    if hasattr(obj, 'model_dump'):  # pydantic models (Action, FillPlan...)
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
@@ -0,0 +1,31 @@
+"""
+Fast JSON responses for the FastAPI service.
+
+FastAPI's default path re-validates a returned model against response_model,
+converts it with jsonable_encoder and encodes the result with json.dumps.
+FastJSONResponse serializes pydantic models straight to bytes with
+pydantic-core's serializer and everything else (dicts, lists, scan results,
+records.Question) with orjson, falling back to json when orjson is missing.
+
+Endpoints that return FastJSONResponse(model) directly skip FastAPI's
+response_model pass entirely; response_model still documents the schema.
+"""
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from records import dumps
+
+
+def render_json(content) -> bytes:
+    """JSON bytes for a pydantic model or plain data"""
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    return dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core (models) or orjson (everything else)"""
+
+    def render(self, content) -> bytes:
+        return render_json(content)
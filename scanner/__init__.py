@@ -1,4 +1,5 @@
 """Scanner package initialization"""
 from .form_scanner import FormScanner
+from .cache import ScanCache
 
-__all__ = ['FormScanner']
+__all__ = ['FormScanner', 'ScanCache']
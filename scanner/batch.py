@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Batch scanning of many job application URLs across a pool of headless browsers.
+
+Each worker thread owns one headless Chrome (its own temporary profile) and
+scans URLs from a shared queue, so concurrency is bounded by the pool size.
+Results are streamed as JSON Lines as each URL finishes; transient WebDriver
+failures are retried (restarting the worker's browser if its session died).
+
+Usage (from the repository root):
+    python -m scanner.batch urls.txt --workers 4 --output scans.jsonl
+    cat urls.txt | python -m scanner.batch - --retries 1 > scans.jsonl
+
+Each line: {"url", "ok", "attempts", "seconds", "questions", "cached", "source", "result" | "error"}.
+A throughput summary (forms/minute, per-URL timing percentiles) goes to stderr.
+With --instrument (or WEBDRIVER_INSTRUMENTATION=1), every line also carries the URL's WebDriver command trace
+("webdriver": commands, time and per-phase breakdown) and the summary the
+aggregated command latency histograms.
+With --cache-dir, forms whose structure has not changed since the last scan
+are answered from the scan cache (see scanner.cache). With --static-first,
+each page is first scanned from its HTML without a browser and a worker's
+Chrome is only started for pages the static scanner cannot fully describe.
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from driver import create_driver
+from instrumentation import RECORDER
+from records import dumps
+from .cache import ScanCache
+from .form_scanner import FormScanner
+from . import static_scanner
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """
+    One headless Chrome per worker thread, created on first use.
+
+    Args:
+        headless: Run the browsers headless
+        instrument: Passed to create_driver
+    """
+
+    def __init__(self, headless: bool = True, instrument: bool | None = None):
+        self.headless = headless
+        self.instrument = instrument
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._browsers = []  # (driver, profile_dir)
+
+    def driver(self):
+        """The calling thread's driver, starting a browser if it has none"""
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            profile_dir = tempfile.mkdtemp(prefix="scan_profile_")
+            # Serialize startup: chromedriver download/cache is not safe to race
+            with self._lock:
+                driver = create_driver(headless=self.headless, use_existing_browser=False,
+                                       instrument=self.instrument, user_data_dir=profile_dir)
+                self._browsers.append((driver, profile_dir))
+            self._local.driver = driver
+        return driver
+
+    def restart(self):
+        """Quits the calling thread's browser so the next driver() call starts a fresh one"""
+        driver = getattr(self._local, "driver", None)
+        self._local.driver = None
+        if driver is not None:
+            self._quit(driver)
+
+    def close(self):
+        with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for driver, profile_dir in browsers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    def _quit(self, driver):
+        with self._lock:
+            entries = [entry for entry in self._browsers if entry[0] is driver]
+            self._browsers = [entry for entry in self._browsers if entry[0] is not driver]
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        for _, profile_dir in entries:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def scan_url(pool: BrowserPool, url: str, retries: int = 2, backoff: float = 1.0,
+             discover_conditionals: bool = False, cache: ScanCache | None = None,
+             static_first: bool = False) -> dict:
+    """
+    Scans one URL with the calling thread's browser, retrying transient failures.
+
+    Returns:
+        {'url', 'ok', 'attempts', 'seconds', 'questions', 'result' or 'error'}
+    """
+    started = time.perf_counter()
+    error = None
+
+    for attempt in range(1, retries + 2):
+        try:
+            with RECORDER.job(url) as trace:
+                if static_first:
+                    result = static_scanner.scan_application(url, pool.driver,
+                                                             discover_conditionals=discover_conditionals, cache=cache)
+                else:
+                    scanner = FormScanner(pool.driver(), cache=cache)
+                    result = scanner.scan_application(url, discover_conditionals=discover_conditionals)
+            record = {
+                "url": url,
+                "ok": True,
+                "attempts": attempt,
+                "seconds": round(time.perf_counter() - started, 3),
+                "questions": result["total"],
+                "cached": result.get("cached", False),
+                "source": result.get("source", "selenium"),
+                "result": result,
+            }
+            if trace.commands:
+                record["webdriver"] = {k: v for k, v in trace.to_dict().items() if k not in ("job", "events")}
+            return record
+        except TimeoutException as e:
+            error = f"Timeout: {e.msg or e}"
+        except WebDriverException as e:
+            # Crashed tab / dead session: start a fresh browser for the retry
+            error = f"WebDriver error: {e.msg or e}"
+            pool.restart()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            break  # Not transient
+
+        logger.warning(f"Attempt {attempt} failed for {url}: {error}")
+        if attempt <= retries:
+            time.sleep(backoff * attempt)
+
+    return {
+        "url": url,
+        "ok": False,
+        "attempts": attempt,
+        "seconds": round(time.perf_counter() - started, 3),
+        "questions": 0,
+        "error": error,
+    }
+
+
+def scan_batch(urls: Iterable[str], workers: int = 4, retries: int = 2, headless: bool = True,
+               discover_conditionals: bool = False, cache: ScanCache | None = None,
+               static_first: bool = False, instrument: bool | None = None) -> Iterator[dict]:
+    """
+    Scans URLs concurrently across `workers` browsers, yielding each record
+    (see scan_url) as soon as it finishes.
+    """
+    pool = BrowserPool(headless=headless, instrument=instrument)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan") as executor:
+            futures = [
+                executor.submit(scan_url, pool, url, retries, discover_conditionals=discover_conditionals,
+                                cache=cache, static_first=static_first)
+                for url in urls
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        pool.close()
+
+
+def summarize(records: list[dict], wall_time: float) -> dict:
+    """Throughput and per-URL timing summary"""
+    seconds = sorted(record["seconds"] for record in records)
+    ok = sum(1 for record in records if record["ok"])
+
+    def percentile(p: float) -> float:
+        return seconds[min(len(seconds) - 1, int(p * len(seconds)))] if seconds else 0.0
+
+    return {
+        "urls": len(records),
+        "ok": ok,
+        "failed": len(records) - ok,
+        "retried": sum(1 for record in records if record["attempts"] > 1),
+        "cached": sum(1 for record in records if record.get("cached")),
+        "static": sum(1 for record in records if record.get("source") == "static"),
+        "wall_time": round(wall_time, 3),
+        "forms_per_minute": round(ok / wall_time * 60, 2) if wall_time else 0.0,
+        "seconds_p50": round(statistics.median(seconds), 3) if seconds else 0.0,
+        "seconds_p95": round(percentile(0.95), 3),
+        "seconds_max": round(seconds[-1], 3) if seconds else 0.0,
+    }
+
+
+def read_urls(path: str) -> list[str]:
+    """URLs from a file (or '-' for stdin), one per line; blank lines and #comments skipped"""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        urls = [line.strip() for line in stream]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return [url for url in urls if url and not url.startswith("#")]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Scan many job application URLs in parallel")
+    parser.add_argument("urls", help="File with one URL per line, or - for stdin")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent headless browsers")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per URL for transient failures")
+    parser.add_argument("--output", help="JSON Lines output path (default: stdout)")
+    parser.add_argument("--discover-conditionals", action="store_true", help="Probe for conditional questions")
+    parser.add_argument("--no-headless", action="store_true", help="Show the browser windows")
+    parser.add_argument("--cache-dir", help="Reuse scans of unchanged forms from this directory")
+    parser.add_argument("--static-first", action="store_true", help="Try the browserless static scanner first")
+    parser.add_argument("--cache-ttl", type=float, default=24 * 3600, help="Scan cache entry lifetime (s)")
+    parser.add_argument("--instrument", action="store_true", help="Record WebDriver command counts and latency")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                        stream=sys.stderr)
+
+    urls = read_urls(args.urls)
+    if not urls:
+        print("No URLs to scan", file=sys.stderr)
+        return 1
+
+    cache = ScanCache(args.cache_dir, ttl=args.cache_ttl) if args.cache_dir else None
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    records = []
+    started = time.perf_counter()
+    try:
+        for record in scan_batch(urls, args.workers, args.retries, not args.no_headless,
+                                 args.discover_conditionals, cache, args.static_first,
+                                 instrument=True if args.instrument else None):
+            records.append({k: v for k, v in record.items() if k != "result"})
+            out.write(dumps(record).decode("utf-8") + "\n")
+            out.flush()
+            status = "ok" if record["ok"] else f"FAILED ({record['error']})"
+            print(f"[{len(records)}/{len(urls)}] {record['seconds']:.1f}s {record['url']} {status}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    summary = summarize(records, time.perf_counter() - started)
+    webdriver_stats = RECORDER.snapshot()
+    if webdriver_stats["commands"]:
+        summary["webdriver"] = webdriver_stats
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
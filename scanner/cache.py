@@ -0,0 +1,188 @@
+"""
+Scan-result cache.
+
+A full scan physically clicks every dropdown, so rescanning an unchanged
+posting is pure waste. Results are stored on local disk keyed by the
+canonical job URL; each entry also records a structural fingerprint of the
+form (tag/type/id/name of every field, read in one script call right after
+page load). A cached result is reused only while the live page still has the
+same fingerprint and the entry is younger than the TTL. The least recently
+used entries are evicted once the cache holds more than `max_entries`.
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.getcwd(), "scan_cache")
+
+# Seconds after which a .tmp file is a leftover of a crashed write (not one in progress)
+STALE_TMP_AGE = 300
+
+# Query parameters that never change which form is served
+TRACKING_PARAMS = {'gh_src', 'source', 'src', 'ref', 'referrer', 'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+
+# One round trip: a stable description of every field on the page
+# arguments: field selector
+FINGERPRINT_SCRIPT = """
+return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function(el) {
+    return [el.tagName, el.type || '', el.id || '', el.getAttribute('name') || '',
+            el.getAttribute('role') || '', el.required ? 1 : 0].join('|');
+});
+"""
+
+
+def canonical_url(url: str) -> str:
+    """
+    URL normalized for cache keys: lowercase scheme/host, no fragment, no
+    trailing slash, tracking parameters (utm_*, gh_src...) dropped and the
+    remaining query parameters sorted
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip('/') or '/',
+        urlencode(query),
+        ''
+    ))
+
+
+def form_fingerprint(driver, field_selector: str) -> str:
+    """Hash of the field structure of the loaded page"""
+    fields = driver.execute_script(FINGERPRINT_SCRIPT, field_selector) or []
+    return hashlib.sha256('\n'.join(fields).encode('utf-8')).hexdigest()[:16]
+
+
+class ScanCache:
+    """
+    Disk-backed scan results, one JSON file per job URL.
+
+    Args:
+        directory: Cache directory (created on first write)
+        ttl: Seconds an entry stays valid
+        max_entries: Entries kept before least recently used ones are evicted
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl: float = 24 * 3600, max_entries: int = 500):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, url: str, variant: str = '') -> str:
+        """Cache key for a URL (variant separates scans run with different options)"""
+        return hashlib.sha256(f"{canonical_url(url)}#{variant}".encode('utf-8')).hexdigest()[:32]
+
+    def get(self, url: str, fingerprint: str, variant: str = '') -> dict | None:
+        """Cached scan result, or None when missing, expired or the form has changed"""
+        path = self._path(self.key(url, variant))
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if time.time() - entry.get('created', 0) > self.ttl:
+            logger.debug(f"Scan cache expired for {url}")
+            self._remove(path)
+            self.misses += 1
+            return None
+        if entry.get('fingerprint') != fingerprint:
+            logger.info(f"Form changed since last scan of {url}, rescanning")
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # Recently used: last in line for eviction
+        except OSError:
+            pass
+        self.hits += 1
+        return entry['result']
+
+    def put(self, url: str, fingerprint: str, result: dict, variant: str = ''):
+        """Stores a scan result, then evicts expired and least recently used entries"""
+        entry = {
+            'url': canonical_url(url),
+            'fingerprint': fingerprint,
+            'created': time.time(),
+            'result': result,
+        }
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, default=str)
+                os.replace(tmp_path, self._path(self.key(url, variant)))
+            except OSError:
+                self._remove(tmp_path)
+                raise
+            self._evict()
+
+    def clear(self):
+        """Removes every cached entry (and leftover temp files)"""
+        with self._lock:
+            for path in self._entries('.json', '.tmp'):
+                self._remove(path)
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries()),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def _evict(self):
+        now = time.time()
+        entries = []
+        for path in self._entries('.json', '.tmp'):
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if path.endswith('.tmp'):
+                # Left behind by a crash between write and rename
+                if now - mtime > STALE_TMP_AGE:
+                    self._remove(path)
+                continue
+            entries.append((mtime, path))
+
+        entries.sort()
+        excess = len(entries) - self.max_entries
+        for i, (mtime, path) in enumerate(entries):
+            # mtime is refreshed on every hit, so it bounds the creation age from below
+            if i < excess or now - mtime > self.ttl:
+                self._remove(path)
+
+    def _entries(self, *suffixes: str) -> list[str]:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [os.path.join(self.directory, name) for name in names if name.endswith(suffixes or ('.json',))]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,254 @@
+"""
+Conditional-question discovery.
+
+Greenhouse reveals follow-up questions ("If yes, please explain") only after
+certain answers. For each select, radio group and React-Select dropdown, one
+async script tries every option in turn, records which fields become visible
+compared to the starting state, and then restores the original answer - so a
+whole question is probed in a single WebDriver round trip instead of a rescan
+per option.
+"""
+
+from selenium.webdriver.common.by import By
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fields that can be revealed by an answer
+REVEALABLE_FIELDS = 'input:not([type="hidden"]), textarea, select, [role="combobox"]'
+
+# Scanner field type -> probe strategy
+PROBE_KINDS = {'select': 'select', 'radio': 'radio', 'dropdown_custom': 'react_select'}
+
+# Larger option lists (countries, schools...) are not probed
+MAX_PROBE_OPTIONS = 25
+
+# Async: tries every option of one control and reports the fields each reveals.
+# arguments: control element, kind, revealable selector, settle ms, callback
+# Returns {options: [{option, revealed: [{questionText, fieldType, selector, required, options}]}], restored}
+PROBE_OPTIONS_SCRIPT = """
+var control = arguments[0], kind = arguments[1], FIELDS = arguments[2], settleMs = arguments[3];
+var done = arguments[arguments.length - 1];
+
+function text(el) { return el ? (el.innerText || el.textContent || '').trim() : ''; }
+function rendered(el) { return el.isConnected && el.getClientRects().length > 0; }
+function visibleFields() {
+    return Array.prototype.filter.call(document.querySelectorAll(FIELDS), rendered);
+}
+function fire(el) {
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+function labelOf(el) {
+    var aria = el.getAttribute('aria-label');
+    if (aria && aria.trim()) return aria.trim();
+    var by = el.getAttribute('aria-labelledby');
+    if (by && document.getElementById(by)) return text(document.getElementById(by));
+    if (el.id) {
+        var forLabel = document.querySelector('label[for="' + CSS.escape(el.id) + '"]');
+        if (forLabel) return text(forLabel);
+    }
+    var field = el.closest('fieldset, .field, [class*="question"]');
+    var heading = field && field.querySelector('legend, label, [class*="label"]');
+    return text(heading || el.closest('label'));
+}
+function selectorOf(el) {
+    var name = el.getAttribute('name');
+    if (el.type === 'radio' && name) return 'input[type="radio"][name="' + name + '"]';
+    if (el.id) return /^[A-Za-z][\\w-]*$/.test(el.id) ? '#' + el.id : '[id="' + el.id + '"]';
+    if (name) return el.tagName.toLowerCase() + '[name="' + name + '"]';
+    return null;
+}
+function fieldTypeOf(el) {
+    var tag = el.tagName.toLowerCase();
+    if (el.getAttribute('role') === 'combobox') return 'dropdown_custom';
+    if (tag === 'textarea' || tag === 'select') return tag;
+    return el.type === 'file' ? 'file' : (el.type || 'text');
+}
+function describe(el) {
+    var entry = {
+        questionText: labelOf(el), fieldType: fieldTypeOf(el), selector: selectorOf(el),
+        required: el.required || el.getAttribute('aria-required') === 'true', options: null
+    };
+    if (entry.fieldType === 'select') {
+        entry.options = Array.prototype.map.call(el.options, text).filter(function(t) { return t; });
+    }
+    return entry;
+}
+function reactProps(el, accept) {
+    var key = Object.keys(el).find(function(k) {
+        return k.indexOf('__reactFiber$') === 0 || k.indexOf('__reactInternalInstance$') === 0;
+    });
+    for (var fiber = key ? el[key] : null, depth = 0; fiber && depth < 40; depth++, fiber = fiber.return) {
+        var props = fiber.memoizedProps;
+        if (props && typeof props.onChange === 'function' && accept(props)) return props;
+    }
+    return null;
+}
+function reactSelectProps(el) {
+    return reactProps(el, function(props) { return Array.isArray(props.options); });
+}
+// Checked state as React last rendered it (the DOM may disagree until the next render)
+function checkedState(r) {
+    var key = Object.keys(r).find(function(k) { return k.indexOf('__reactProps$') === 0; });
+    return key && typeof r[key].checked === 'boolean' ? r[key].checked : r.checked;
+}
+// Clears a radio's answer. r.checked = false alone is undone by React on a controlled
+// group, so its onChange is called with an empty target - handlers keyed on either
+// target.checked or target.value then store "no answer"
+function uncheck(r) {
+    r.checked = false;
+    var props = reactProps(r, function() { return true; });
+    if (!props) { fire(r); return; }
+    var target = {name: r.name, type: 'radio', id: r.id, value: '', checked: false};
+    props.onChange({target: target, currentTarget: target, type: 'change', nativeEvent: new Event('change'),
+                    preventDefault: function() {}, stopPropagation: function() {}, persist: function() {}});
+}
+
+var ops = {items: [], apply: function() {}, restore: function() {}};
+if (kind === 'select') {
+    var originalIndex = control.selectedIndex, indexes = [];
+    Array.prototype.forEach.call(control.options, function(o, i) {
+        if (o.value !== '' && text(o)) indexes.push(i);
+    });
+    ops = {
+        items: indexes.map(function(i) { return text(control.options[i]); }),
+        apply: function(n) { control.selectedIndex = indexes[n]; fire(control); },
+        restore: function() { control.selectedIndex = originalIndex; fire(control); }
+    };
+} else if (kind === 'radio') {
+    var group = control.name
+        ? Array.prototype.slice.call(document.querySelectorAll('input[type="radio"][name="' + CSS.escape(control.name) + '"]'))
+        : [control];
+    var originalRadio = group.filter(function(r) { return r.checked; })[0];
+    ops = {
+        items: group.map(function(r) { return text(r.closest('label')) || (r.id && text(document.querySelector('label[for="' + CSS.escape(r.id) + '"]'))) || r.value; }),
+        apply: function(n) { group[n].click(); },
+        restore: function() {
+            if (originalRadio) { originalRadio.click(); return; }
+            group.filter(function(r) { return r.checked; }).forEach(uncheck);
+        },
+        // A controlled group may keep the probed option checked in React state
+        restored: function() {
+            return group.every(function(r) { return checkedState(r) === (r === originalRadio); });
+        }
+    };
+} else if (kind === 'react_select') {
+    var props = reactSelectProps(control);
+    if (props) {
+        var flat = [];
+        props.options.forEach(function(o) {
+            if (o && Array.isArray(o.options)) flat.push.apply(flat, o.options); else flat.push(o);
+        });
+        var originalValue = props.value === undefined ? null : props.value;
+        ops = {
+            items: flat.map(function(o) { return o && typeof o === 'object' ? String(o.label !== undefined ? o.label : o.value) : String(o); }),
+            apply: function(n) {
+                reactSelectProps(control).onChange(flat[n], {action: 'select-option', option: flat[n], name: props.name});
+            },
+            restore: function() {
+                reactSelectProps(control).onChange(originalValue, {action: originalValue ? 'select-option' : 'clear', name: props.name});
+            }
+        };
+    }
+}
+
+var baseline = new Set(visibleFields());
+var results = [], n = 0;
+
+function probeNext() {
+    if (n >= ops.items.length) {
+        ops.restore();
+        setTimeout(finish, settleMs);
+        return;
+    }
+    ops.apply(n);
+    setTimeout(function() {
+        var revealed = [], seen = {};
+        visibleFields().forEach(function(el) {
+            if (baseline.has(el) || el === control) return;
+            var entry = describe(el);
+            var key = entry.selector || entry.questionText;
+            if (key && !seen[key]) { seen[key] = true; revealed.push(entry); }
+        });
+        results.push({option: ops.items[n], revealed: revealed});
+        n++;
+        probeNext();
+    }, settleMs);
+}
+
+function finish() {
+    var now = visibleFields();
+    var restored = now.length === baseline.size && now.every(function(el) { return baseline.has(el); })
+        && (!ops.restored || ops.restored());
+    done({options: results, restored: restored});
+}
+
+try { probeNext(); } catch (e) { done({options: results, restored: false, error: String(e)}); }
+"""
+
+
+def discover_dependencies(driver, questions: list[dict], settle: float = 0.15,
+                          max_options: int = MAX_PROBE_OPTIONS) -> tuple[list[dict], list[dict], list[dict]]:
+    """
+    Probes every option of each select-type question for the fields it reveals.
+
+    Args:
+        driver: Selenium WebDriver instance (page already loaded)
+        questions: Scanned questions (FormScanner output format)
+        settle: Seconds to wait after each option for the page to react
+        max_options: Questions with more options are not probed
+
+    Returns:
+        (dependencies, revealed, unrestored) where dependencies is the edge list
+        [{'selector', 'questionText', 'option', 'reveals': [selector, ...]}],
+        revealed lists the conditional questions with 'dependsOn': [{'selector', 'option'}]
+        and unrestored lists the questions ({'selector', 'questionText'}) whose
+        original answer could not be put back. Probing stops at the first one,
+        since every later baseline would include the stuck answer's effects.
+    """
+    dependencies = []
+    revealed = {}
+    unrestored = []
+
+    for question in questions:
+        kind = PROBE_KINDS.get(question['fieldType'])
+        options = question.get('options') or []
+        if not kind or not options or len(options) > max_options:
+            continue
+
+        try:
+            control = driver.find_element(By.CSS_SELECTOR, question['selector'])
+            result = driver.execute_async_script(
+                PROBE_OPTIONS_SCRIPT, control, kind, REVEALABLE_FIELDS, int(settle * 1000)
+            )
+        except Exception as e:
+            logger.debug(f"Could not probe '{question['questionText']}': {e}")
+            continue
+
+        if result.get('error'):
+            logger.debug(f"Probe of '{question['questionText']}' failed: {result['error']}")
+        for entry in result.get('options', []):
+            fields = [field for field in entry['revealed'] if field['selector'] and field['questionText']]
+            if not fields:
+                continue
+
+            dependencies.append({
+                'selector': question['selector'],
+                'questionText': question['questionText'],
+                'option': entry['option'],
+                'reveals': [field['selector'] for field in fields],
+            })
+            for field in fields:
+                conditional = revealed.setdefault(field['selector'], {**field, 'dependsOn': []})
+                conditional['dependsOn'].append({'selector': question['selector'], 'option': entry['option']})
+
+        logger.debug(f"Probed '{question['questionText']}': {len(result.get('options', []))} options")
+
+        if not result.get('restored'):
+            logger.warning(f"Probing '{question['questionText']}' did not restore the form state; "
+                           f"skipping the remaining questions of this step")
+            unrestored.append({'selector': question['selector'], 'questionText': question['questionText']})
+            break
+
+    return dependencies, list(revealed.values()), unrestored
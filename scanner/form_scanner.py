@@ -7,11 +7,125 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from instrumentation import span
+from .conditionals import discover_dependencies
+from .cache import ScanCache, form_fingerprint
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Selector for anything the scanner treats as a field (or a field container)
+FIELD_SELECTOR = ('input, textarea, select, [role="combobox"], [role="radiogroup"], '
+                  '[aria-haspopup="listbox"], [data-source]')
+
+# Records nodes added or revealed after a step transition (Next click)
+OBSERVE_MUTATIONS_SCRIPT = """
+if (window.__scanObserver) window.__scanObserver.disconnect();
+const state = {nodes: new Set(), last: performance.now()};
+const observer = new MutationObserver(records => {
+    for (const record of records) {
+        if (record.type === 'childList') {
+            record.addedNodes.forEach(node => { if (node.nodeType === 1) state.nodes.add(node); });
+        } else if (record.target.nodeType === 1) {
+            state.nodes.add(record.target);
+        }
+    }
+    state.last = performance.now();
+});
+observer.observe(document.body, {
+    childList: true, subtree: true, attributes: true,
+    attributeFilter: ['hidden', 'style', 'class', 'aria-hidden', 'disabled']
+});
+window.__scanObserver = observer;
+window.__scanMutations = state;
+"""
+
+# [mutated node count, ms since the last mutation]
+MUTATION_QUIET_SCRIPT = """
+const state = window.__scanMutations;
+return state ? [state.nodes.size, performance.now() - state.last] : [0, 1e9];
+"""
+
+# Stops observing and returns the outermost rendered nodes that contain fields
+COLLECT_MUTATIONS_SCRIPT = """
+const FIELDS = arguments[0];
+const state = window.__scanMutations;
+if (window.__scanObserver) window.__scanObserver.disconnect();
+window.__scanObserver = null;
+window.__scanMutations = null;
+if (!state) return [];
+
+const roots = new Set();
+for (let node of state.nodes) {
+    if (!node.isConnected) continue;
+    // Scan from the parent so the field itself is a descendant of the root
+    if (node.matches(FIELDS) && node.parentElement) node = node.parentElement;
+    if (node.getClientRects().length === 0) continue;
+    if (!node.matches(FIELDS) && !node.querySelector(FIELDS)) continue;
+    roots.add(node);
+}
+const list = [...roots];
+return list.filter(node => !list.some(other => other !== node && other.contains(node)));
+"""
+
+
+# Async: triggers lazy-loaded content and waits for it to settle, in one round trip.
+# Skips pages with nothing below the fold and no lazy markers; otherwise scrolls to
+# the bottom and watches mutations: nothing reacting within the probe window means
+# no lazy content, growth means scroll to the new bottom once the page is quiet.
+# Pages that keep mutating without growing (animations) are released after 4x quiet.
+# arguments: max ms, quiet ms, probe ms, callback
+# Returns {skipped, scrolls, ms, height, mutations, timedOut}
+LAZY_LOAD_SCRIPT = """
+const [maxMs, quietMs, probeMs] = arguments;
+const done = arguments[arguments.length - 1];
+const LAZY = '[loading="lazy"], [data-src], [data-lazy], [data-lazy-src], [class*="lazy"], [data-infinite-scroll]';
+const started = performance.now();
+const scroller = document.scrollingElement || document.documentElement;
+const height = () => Math.max(scroller.scrollHeight, document.body ? document.body.scrollHeight : 0);
+
+if (height() <= window.innerHeight + 1 && !document.querySelector(LAZY)) {
+    done({skipped: true, scrolls: 0, ms: 0, height: height(), mutations: 0, timedOut: false});
+    return;
+}
+
+let mutations = 0, last = 0, scrolls = 0;
+const observer = new MutationObserver(records => { mutations += records.length; last = performance.now(); });
+observer.observe(document.body, {
+    childList: true, subtree: true, attributes: true, attributeFilter: ['src', 'style', 'class', 'hidden']
+});
+
+const finish = timedOut => {
+    observer.disconnect();
+    window.scrollTo({top: 0, left: 0, behavior: 'instant'});
+    done({skipped: false, scrolls, ms: Math.round(performance.now() - started), height: height(), mutations, timedOut});
+};
+
+const scrollDown = () => {
+    const before = height(), stepStart = performance.now(), seen = mutations;
+    window.scrollTo({top: before, left: 0, behavior: 'instant'});
+    scrolls++;
+    const poll = () => {
+        const now = performance.now();
+        if (now - started > maxMs) return finish(true);
+        const grew = height() > before + 1;
+        if (mutations === seen) {
+            if (grew) return scrollDown();
+            if (now - stepStart >= probeMs) return finish(false);  // Nothing reacted to the scroll
+        } else if (now - last >= quietMs) {
+            return grew ? scrollDown() : finish(false);
+        } else if (!grew && now - stepStart >= quietMs * 4) {
+            return finish(false);  // Busy (animations) but nothing new below the fold
+        }
+        setTimeout(poll, 50);
+    };
+    setTimeout(poll, 50);
+};
+
+scrollDown();
+"""
+
 
 class FormScanner:
     """
@@ -19,74 +133,146 @@ class FormScanner:
     to collect complete question and option data
     """
     
-    def __init__(self, driver):
+    def __init__(self, driver, cache: ScanCache | None = None):
         self.driver = driver
+        self.cache = cache  # reuse results for unchanged forms (see scanner.cache)
         self.questions = []
         self.wait = WebDriverWait(driver, 10)
+        self._seen = set()  # (selector, fieldType, questionText) of scanned fields
+        self._step = 1
+        self.dependencies = []  # conditional-question edges (discover_conditionals=True)
+        self.unrestored = []  # probed questions whose original answer could not be restored
+        self._discover = False
+        self.lazy_load = {}  # report of the last lazy-load scroll
     
-    def scan_application(self, url: str) -> dict:
+    def scan_application(self, url: str, discover_conditionals: bool = False) -> dict:
         """
         Main entry point: scan entire application form
         
         Args:
             url: Job application URL
+            discover_conditionals: Probe every option of select/radio/custom dropdown
+                questions for follow-up questions they reveal (scratch pass, state restored)
             
         Returns:
             {
                 'url': str,
-                'questions': list,
-                'total': int
+                'questions': list,  # each tagged with its 'step' (1-based); revealed
+                                    # follow-ups carry 'conditional' and 'dependsOn'
+                'total': int,
+                'dependencies': list,  # [{'selector', 'questionText', 'option', 'reveals'}]
+                'unrestored': list,  # [{'selector', 'questionText', 'step'}] left with a probed answer
+                'cached': bool  # served from the scan cache
             }
         """
         logger.info(f"Starting scan of application: {url}")
+        self._discover = discover_conditionals
         
-        self.driver.get(url)
-        time.sleep(2)  # Initial page load
+        with span(phase="scan.load"):
+            self.driver.get(url)
+            time.sleep(2)  # Initial page load
         
         # Scroll to trigger lazy loading
-        self._scroll_entire_page()
+        with span(phase="scan.scroll"):
+            self._scroll_entire_page()
+        
+        # Unchanged form scanned before: skip the physical scan. Fingerprinted
+        # after the scroll, so a change to lazy-loaded fields invalidates the entry
+        fingerprint = None
+        variant = 'conditionals' if discover_conditionals else ''
+        if self.cache is not None:
+            fingerprint = form_fingerprint(self.driver, FIELD_SELECTOR)
+            cached = self.cache.get(url, fingerprint, variant)
+            if cached is not None:
+                logger.info(f"Scan cache hit: {cached['total']} questions")
+                return {**cached, 'url': url, 'cached': True}
         
         # Scan all field types
-        self._scan_text_inputs()
-        self._scan_textareas()
-        self._scan_file_inputs()  # NEW: Scan resume/CV upload fields
-        self._scan_dropdowns()
-        self._scan_radio_groups()
-        self._scan_checkboxes()
+        with span(phase="scan.text_inputs"):
+            self._scan_text_inputs()
+        with span(phase="scan.textareas"):
+            self._scan_textareas()
+        with span(phase="scan.file_inputs"):
+            self._scan_file_inputs()  # NEW: Scan resume/CV upload fields
+        with span(phase="scan.dropdowns"):
+            self._scan_dropdowns()
+        with span(phase="scan.radio_groups"):
+            self._scan_radio_groups()
+        with span(phase="scan.checkboxes"):
+            self._scan_checkboxes()
+        
+        if self._discover:
+            self._discover_conditionals()
         
         # Handle multi-step forms
-        self._handle_multistep_forms()
+        with span(phase="scan.multistep"):
+            self._handle_multistep_forms()
         
         logger.info(f"Scan complete: {len(self.questions)} questions found")
         
-        return {
+        result = {
             'url': url,
             'questions': self.questions,
-            'total': len(self.questions)
+            'total': len(self.questions),
+            'dependencies': self.dependencies,
+            'unrestored': self.unrestored,
+            'cached': False
         }
+        if self.cache is not None:
+            self.cache.put(url, fingerprint, result, variant)
+        
+        return result
     
-    def _scroll_entire_page(self):
-        """Scroll to bottom to trigger lazy-loaded content"""
+    def _scroll_entire_page(self, timeout: float = 5.0, quiet: float = 0.3, probe: float = 0.2) -> dict:
+        """
+        Trigger lazy-loaded content (see LAZY_LOAD_SCRIPT) and return the report
+        {skipped, scrolls, ms, height, mutations, timedOut, seconds}
+        """
         logger.debug("Scrolling page to load lazy content")
+        started = time.perf_counter()
         
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        try:
+            report = self.driver.execute_async_script(
+                LAZY_LOAD_SCRIPT, int(timeout * 1000), int(quiet * 1000), int(probe * 1000)
+            ) or {}
+        except Exception as e:
+            logger.warning(f"Lazy-load scroll failed: {e}")
+            report = {}
         
-        while True:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
-            
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
+        report['seconds'] = round(time.perf_counter() - started, 3)
+        self.lazy_load = report
         
-        # Scroll back to top
-        self.driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(0.5)
+        if report.get('skipped'):
+            logger.debug("No lazy content below the fold, scroll skipped")
+        else:
+            logger.info(f"Lazy-load scroll: {report.get('scrolls', 0)} scroll(s), "
+                        f"{report.get('mutations', 0)} mutation(s) in {report['seconds']}s"
+                        f"{' (timed out)' if report.get('timedOut') else ''}")
+        return report
     
-    def _scan_text_inputs(self):
+    def _scan_fields(self, root=None):
+        """Scan every field type, inside root (a WebElement) or the whole document"""
+        self._scan_text_inputs(root)
+        self._scan_textareas(root)
+        self._scan_file_inputs(root)
+        self._scan_dropdowns(root)
+        self._scan_radio_groups(root)
+        self._scan_checkboxes(root)
+    
+    def _add_question(self, question: dict) -> bool:
+        """Record a question unless the same field was already scanned; tags it with the current step"""
+        key = (question['selector'], question['fieldType'], question['questionText'])
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        question['step'] = self._step
+        self.questions.append(question)
+        return True
+    
+    def _scan_text_inputs(self, root=None):
         """Scan text, email, tel, number inputs"""
         logger.debug("Scanning text inputs")
+        search = root if root is not None else self.driver
         
         selectors = [
             'input[type="text"]',
@@ -99,7 +285,7 @@ class FormScanner:
         
         for selector in selectors:
             try:
-                inputs = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                inputs = search.find_elements(By.CSS_SELECTOR, selector)
                 
                 for inp in inputs:
                     if not self._is_visible(inp):
@@ -117,7 +303,7 @@ class FormScanner:
                     required = self._is_required(inp)
                     field_type = inp.get_attribute('type') or 'text'
                     
-                    self.questions.append({
+                    self._add_question({
                         'questionText': label,
                         'fieldType': field_type,
                         'options': None,
@@ -130,12 +316,13 @@ class FormScanner:
             except Exception as e:
                 logger.warning(f"Error scanning text inputs with selector {selector}: {e}")
     
-    def _scan_textareas(self):
+    def _scan_textareas(self, root=None):
         """Scan textarea elements"""
         logger.debug("Scanning textareas")
+        search = root if root is not None else self.driver
         
         try:
-            textareas = self.driver.find_elements(By.TAG_NAME, 'textarea')
+            textareas = search.find_elements(By.TAG_NAME, 'textarea')
             
             for textarea in textareas:
                 if not self._is_visible(textarea):
@@ -148,7 +335,7 @@ class FormScanner:
                 element_selector = self._get_selector(textarea)
                 required = self._is_required(textarea)
                 
-                self.questions.append({
+                self._add_question({
                     'questionText': label,
                     'fieldType': 'textarea',
                     'options': None,
@@ -161,18 +348,23 @@ class FormScanner:
         except Exception as e:
             logger.warning(f"Error scanning textareas: {e}")
     
-    def _scan_file_inputs(self):
+    def _scan_file_inputs(self, root=None):
         """
         Scan file upload fields (Resume/CV, Cover Letter)
         Handles both standard <input type="file"> and Greenhouse custom upload widgets
         """
         logger.debug("Scanning file inputs")
+        search = root if root is not None else self.driver
         
         try:
             # 1. Standard HTML5 file inputs
-            file_inputs = self.driver.find_elements(By.CSS_SELECTOR, 'input[type="file"]')
+            file_inputs = search.find_elements(By.CSS_SELECTOR, 'input[type="file"]')
             
             for file_input in file_inputs:
+                # File inputs are often visually hidden; skip only those in a hidden step/section
+                if not self._is_container_rendered(file_input):
+                    continue
+                
                 label = self._get_label(file_input)
                 if not label:
                     # Try to get label from surrounding div or parent
@@ -193,7 +385,7 @@ class FormScanner:
                 element_selector = self._get_selector(file_input)
                 required = self._is_required(file_input)
                 
-                self.questions.append({
+                self._add_question({
                     'questionText': label,
                     'fieldType': 'file',
                     'options': None,
@@ -216,7 +408,7 @@ class FormScanner:
             
             for selector in greenhouse_selectors:
                 try:
-                    sections = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    sections = search.find_elements(By.CSS_SELECTOR, selector)
                     for section in sections:
                         if not self._is_visible(section):
                             continue
@@ -253,7 +445,7 @@ class FormScanner:
                         # Greenhouse file fields are usually required
                         required = 'required' in label.lower() or '*' in label
                         
-                        self.questions.append({
+                        self._add_question({
                             'questionText': label,
                             'fieldType': 'file',
                             'options': None,
@@ -270,7 +462,7 @@ class FormScanner:
         except Exception as e:
             logger.warning(f"Error scanning file inputs: {e}")
     
-    def _scan_dropdowns(self):
+    def _scan_dropdowns(self, root=None):
         """
         CRITICAL: Click dropdowns to see ALL options
         Handles both native <select> and custom ARIA dropdowns
@@ -278,15 +470,16 @@ class FormScanner:
         logger.debug("Scanning dropdowns")
         
         # Native select elements
-        self._scan_native_selects()
+        self._scan_native_selects(root)
         
         # Custom ARIA dropdowns
-        self._scan_custom_dropdowns()
+        self._scan_custom_dropdowns(root)
     
-    def _scan_native_selects(self):
+    def _scan_native_selects(self, root=None):
         """Scan native <select> elements"""
+        search = root if root is not None else self.driver
         try:
-            selects = self.driver.find_elements(By.TAG_NAME, 'select')
+            selects = search.find_elements(By.TAG_NAME, 'select')
             
             for select in selects:
                 if not self._is_visible(select):
@@ -313,7 +506,7 @@ class FormScanner:
                 element_selector = self._get_selector(select)
                 required = self._is_required(select)
                 
-                self.questions.append({
+                self._add_question({
                     'questionText': label,
                     'fieldType': 'select',
                     'options': options,
@@ -326,11 +519,12 @@ class FormScanner:
         except Exception as e:
             logger.warning(f"Error scanning native selects: {e}")
     
-    def _scan_custom_dropdowns(self):
+    def _scan_custom_dropdowns(self, root=None):
         """
         Scan custom ARIA dropdowns by physically clicking them
         This is the KEY feature that makes this approach robust
         """
+        search = root if root is not None else self.driver
         try:
             # Find all elements with role="combobox" or aria-haspopup="listbox"
             dropdown_selectors = [
@@ -341,7 +535,7 @@ class FormScanner:
             ]
             
             for selector in dropdown_selectors:
-                dropdowns = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                dropdowns = search.find_elements(By.CSS_SELECTOR, selector)
                 
                 for dropdown in dropdowns:
                     if not self._is_visible(dropdown):
@@ -351,6 +545,10 @@ class FormScanner:
                     if not label:
                         continue
                     
+                    element_selector = self._get_selector(dropdown)
+                    if any(key[0] == element_selector and key[2] == label for key in self._seen):
+                        continue  # Already scanned (e.g. on an earlier step); skip the click
+                    
                     # PHYSICALLY CLICK to open dropdown
                     options = self._click_and_extract_options(dropdown, label)
                     
@@ -358,10 +556,9 @@ class FormScanner:
                         logger.debug(f"No options extracted for: {label}")
                         continue
                     
-                    element_selector = self._get_selector(dropdown)
                     required = self._is_required(dropdown)
                     
-                    self.questions.append({
+                    self._add_question({
                         'questionText': label,
                         'fieldType': 'dropdown_custom',
                         'options': options,
@@ -430,12 +627,13 @@ class FormScanner:
             logger.debug(f"Error clicking dropdown '{label}': {e}")
             return []
     
-    def _scan_radio_groups(self):
+    def _scan_radio_groups(self, root=None):
         """Scan radio button groups"""
         logger.debug("Scanning radio groups")
+        search = root if root is not None else self.driver
         
         try:
-            radios = self.driver.find_elements(By.CSS_SELECTOR, 'input[type="radio"]')
+            radios = search.find_elements(By.CSS_SELECTOR, 'input[type="radio"]')
             processed_names = set()
             
             for radio in radios:
@@ -469,7 +667,7 @@ class FormScanner:
                 element_selector = f'input[type="radio"][name="{name}"]'
                 required = self._is_required(group[0])
                 
-                self.questions.append({
+                self._add_question({
                     'questionText': label,
                     'fieldType': 'radio',
                     'options': options,
@@ -482,12 +680,13 @@ class FormScanner:
         except Exception as e:
             logger.warning(f"Error scanning radio groups: {e}")
     
-    def _scan_checkboxes(self):
+    def _scan_checkboxes(self, root=None):
         """Scan checkbox elements"""
         logger.debug("Scanning checkboxes")
+        search = root if root is not None else self.driver
         
         try:
-            checkboxes = self.driver.find_elements(By.CSS_SELECTOR, 'input[type="checkbox"]')
+            checkboxes = search.find_elements(By.CSS_SELECTOR, 'input[type="checkbox"]')
             
             for checkbox in checkboxes:
                 if not self._is_visible(checkbox):
@@ -500,7 +699,7 @@ class FormScanner:
                 element_selector = self._get_selector(checkbox)
                 required = self._is_required(checkbox)
                 
-                self.questions.append({
+                self._add_question({
                     'questionText': label,
                     'fieldType': 'checkbox',
                     'options': ['Yes', 'No'],  # Checkboxes are binary
@@ -516,7 +715,8 @@ class FormScanner:
     def _handle_multistep_forms(self):
         """
         Detect and navigate multi-step forms
-        Clicks "Next"/"Continue" buttons and scans each step
+        Clicks "Next"/"Continue" buttons and scans only the fields each step
+        adds or reveals (collected with a MutationObserver), tagging them with the step
         """
         logger.debug("Checking for multi-step form")
         
@@ -557,26 +757,63 @@ class FormScanner:
                     logger.debug("No next button found, single-step form")
                     break
                 
-                # Click Next
+                # Click Next, recording what the transition adds or reveals
                 logger.info(f"Found multi-step form, navigating to step {step + 1}")
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
                 time.sleep(0.5)
+                self.driver.execute_script(OBSERVE_MUTATIONS_SCRIPT)
                 next_button.click()
-                time.sleep(2)  # Wait for next step to load
+                scopes = self._collect_new_scopes()
                 
-                # Scan this step
-                self._scan_text_inputs()
-                self._scan_textareas()
-                self._scan_dropdowns()
-                self._scan_radio_groups()
-                self._scan_checkboxes()
+                if not scopes:
+                    logger.debug("Next revealed no new fields, stopping")
+                    break
                 
+                # Scan only the new parts of the page
                 step += 1
+                self._step = step
+                for root in scopes:
+                    self._scan_fields(root)
+                
+                if self._discover:
+                    self._discover_conditionals()
                 
             except Exception as e:
                 logger.debug(f"Multi-step navigation ended: {e}")
                 break
     
+    def _discover_conditionals(self):
+        """Probe the current step's select-type questions and record the follow-ups they reveal"""
+        step_questions = [q for q in self.questions if q['step'] == self._step and not q.get('conditional')]
+        
+        with span(phase="scan.conditionals"):
+            dependencies, revealed, unrestored = discover_dependencies(self.driver, step_questions)
+        
+        self.dependencies.extend(dependencies)
+        self.unrestored.extend({**question, 'step': self._step} for question in unrestored)
+        for question in revealed:
+            question['conditional'] = True
+            self._add_question(question)
+        
+        logger.info(f"Step {self._step}: {len(dependencies)} conditional edge(s), {len(revealed)} follow-up question(s)")
+    
+    def _collect_new_scopes(self, timeout: float = 2.0, quiet: float = 0.3) -> list:
+        """
+        Waits for the step transition to settle (no mutations for `quiet` seconds,
+        at most `timeout`), then returns the outermost added/revealed elements
+        containing fields
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            changed, idle_ms = self.driver.execute_script(MUTATION_QUIET_SCRIPT)
+            if changed and idle_ms >= quiet * 1000:
+                break
+            time.sleep(0.1)
+        
+        scopes = self.driver.execute_script(COLLECT_MUTATIONS_SCRIPT, FIELD_SELECTOR) or []
+        logger.debug(f"Step transition revealed {len(scopes)} field container(s)")
+        return scopes
+    
     # ===== Helper Methods =====
     
     def _get_label(self, element):
@@ -709,6 +946,16 @@ class FormScanner:
         except:
             return False
     
+    def _is_container_rendered(self, element):
+        """Check that the element's parent is rendered (not inside a hidden step/section)"""
+        try:
+            return self.driver.execute_script(
+                "const p = arguments[0].parentElement; return !!p && p.getClientRects().length > 0;",
+                element
+            )
+        except:
+            return False
+    
     def _is_required(self, element):
         """Check if field is required"""
         try:
@@ -0,0 +1,517 @@
+"""
+Static (browserless) form scanner.
+
+Most Greenhouse boards server-render the application form, and the newer
+job-boards pages embed the full question set - labels, field names, option
+lists - as JSON in the page (window.__remixContext). This scanner fetches the
+HTML (or takes it as a string), parses it with html.parser, fills in
+React-Select options from the embedded JSON, and returns the same questions
+schema as FormScanner in milliseconds with no Chrome instance.
+
+When the static view is incomplete - a combobox without known options, a
+label pointing at a field that only exists after JavaScript runs, no fields
+at all - scan_application falls back to the Selenium FormScanner.
+
+Differences from the Selenium scan: visibility comes from the `hidden`
+attribute and inline display:none only (no CSS), and fields inside hidden
+containers are numbered as later steps in document order rather than found
+by clicking "Next".
+"""
+
+from html.parser import HTMLParser
+from typing import Callable
+import json
+import logging
+import re
+import time
+import urllib.request
+
+from instrumentation import span
+from .cache import ScanCache
+from .form_scanner import FormScanner
+
+logger = logging.getLogger(__name__)
+
+# Same placeholders FormScanner skips in native selects
+PLACEHOLDER_OPTIONS = {'Select...', 'Choose...', '--', 'Please select'}
+
+TEXT_INPUT_TYPES = {'text', 'email', 'tel', 'number', 'url'}
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+# Same special characters FormScanner._get_selector switches to [id="..."] for
+SELECTOR_SPECIAL_CHARS = set('[](){}.:,;/\\@!#$%^&*+=~`"\'<>?')
+
+# Greenhouse job board field type -> scanner field type
+GREENHOUSE_FIELD_TYPES = {
+    'input_text': 'text',
+    'input_file': 'file',
+    'textarea': 'textarea',
+    'multi_value_single_select': 'dropdown_custom',
+    'multi_value_multi_select': 'dropdown_custom',
+}
+
+# Script assignments that carry the page's initial state
+EMBEDDED_STATE = re.compile(r'(?:window\.)?(__remixContext|__NEXT_DATA__|__INITIAL_STATE__|__APP_DATA__)\s*=\s*')
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+class _Node:
+    """Element in the parsed tree"""
+    __slots__ = ('tag', 'attrs', 'children', 'parent')
+
+    def __init__(self, tag: str, attrs: dict, parent: '_Node | None'):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []  # _Node or str
+        self.parent = parent
+
+    def get(self, name: str, default=None):
+        return self.attrs.get(name, default)
+
+    def iter(self):
+        """Descendant elements in document order"""
+        for child in self.children:
+            if isinstance(child, _Node):
+                yield child
+                yield from child.iter()
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def raw_text(self) -> str:
+        return ''.join(child if isinstance(child, str) else child.raw_text() for child in self.children)
+
+    def text(self) -> str:
+        """Rendered-ish text: script/style dropped, whitespace collapsed"""
+        parts = []
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag not in ('script', 'style', 'template'):
+                parts.append(child.text())
+        return ' '.join(''.join(parts).split())
+
+    def is_hidden(self) -> bool:
+        """Hidden by attribute or inline style (this element only)"""
+        style = (self.get('style') or '').replace(' ', '').lower()
+        return 'hidden' in self.attrs or 'display:none' in style or self.tag == 'template'
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds a _Node tree, tolerating unclosed and stray end tags"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node('#document', {}, None)
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = _Node(tag, {name: value if value is not None else '' for name, value in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = _Node(tag, {name: value if value is not None else '' for name, value in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> _Node:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def embedded_fields(root: _Node) -> dict[str, dict]:
+    """
+    Field definitions from JSON embedded in <script> tags, by field name.
+
+    Recognizes the Greenhouse job board question schema:
+    {'label', 'required', 'fields': [{'name', 'type', 'values': [{'label', 'value'}]}]}
+
+    Returns:
+        {name: {'questionText', 'fieldType', 'options', 'required'}}
+    """
+    fields = {}
+    for script in root.iter():
+        if script.tag != 'script' or script.get('src'):
+            continue
+        for data in _script_json(script):
+            _collect_questions(data, fields)
+    return fields
+
+
+def _script_json(script: _Node) -> list:
+    text = script.raw_text().strip()
+    if not text:
+        return []
+    if 'json' in (script.get('type') or '').lower():
+        try:
+            return [json.loads(text)]
+        except ValueError:
+            return []
+
+    found = []
+    decoder = json.JSONDecoder()
+    for match in EMBEDDED_STATE.finditer(text):
+        start = text.find('{', match.end())
+        if start == -1:
+            continue
+        try:
+            data, _ = decoder.raw_decode(text, start)
+        except ValueError:
+            continue
+        # Some frameworks double-encode the state as a JSON string
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                continue
+        found.append(data)
+    return found
+
+
+def _collect_questions(data, fields: dict):
+    """Walks decoded JSON for Greenhouse question objects"""
+    if isinstance(data, list):
+        for item in data:
+            _collect_questions(item, fields)
+        return
+    if not isinstance(data, dict):
+        return
+
+    label = data.get('label')
+    if isinstance(label, str) and isinstance(data.get('fields'), list):
+        for field in data['fields']:
+            if not isinstance(field, dict) or not field.get('name'):
+                continue
+            field_type = GREENHOUSE_FIELD_TYPES.get(field.get('type'))
+            if field_type is None:
+                continue
+            values = field.get('values') or []
+            options = [str(v.get('label', v.get('value'))) for v in values if isinstance(v, dict)] or None
+            fields.setdefault(str(field['name']), {
+                'questionText': ' '.join(label.split()),
+                'fieldType': field_type,
+                'options': options,
+                'required': bool(data.get('required')),
+            })
+        return
+
+    for value in data.values():
+        if isinstance(value, (dict, list)):
+            _collect_questions(value, fields)
+
+
+class _StaticForm:
+    """One pass over a parsed page, producing FormScanner-style questions"""
+
+    def __init__(self, root: _Node):
+        self.root = root
+        self.by_id = {}
+        self.labels_for = {}
+        for node in root.iter():
+            element_id = node.get('id')
+            if element_id and element_id not in self.by_id:
+                self.by_id[element_id] = node
+            if node.tag == 'label' and node.get('for'):
+                self.labels_for.setdefault(node.get('for'), node)
+        self.embedded = embedded_fields(root)
+        self.questions = []
+        self.unresolved = []
+        self._seen = set()
+        self._steps = {}  # id(hidden container) -> step number
+
+    def scan(self) -> tuple[list[dict], list[str]]:
+        used_names = set()
+        radio_groups = set()
+
+        for node in self.root.iter():
+            if node.tag not in ('input', 'textarea', 'select'):
+                continue
+            field_type = (node.get('type') or 'text').lower() if node.tag == 'input' else node.tag
+            if field_type in ('hidden', 'submit', 'button', 'image', 'reset'):
+                continue
+            used_names.update(filter(None, (node.get('id'), node.get('name'))))
+
+            if node.get('role') == 'combobox':
+                self._combobox(node)
+            elif field_type in TEXT_INPUT_TYPES:
+                if not self._inside_dropdown(node):
+                    self._field(node, field_type)
+            elif field_type == 'textarea':
+                self._field(node, 'textarea')
+            elif field_type == 'file':
+                self._file(node)
+            elif field_type == 'select':
+                self._select(node)
+            elif field_type == 'radio':
+                name = node.get('name')
+                if name and name not in radio_groups:
+                    radio_groups.add(name)
+                    self._radio_group(node, name)
+            elif field_type == 'checkbox':
+                self._field(node, 'checkbox', options=['Yes', 'No'])
+
+        # Labels pointing at fields that only exist once JavaScript runs
+        for target, label in self.labels_for.items():
+            if target in self.by_id or target in used_names:
+                continue
+            if target in self.embedded:
+                self._add(self.embedded[target], _selector_for_id(target), self._step(label))
+                used_names.add(target)
+            else:
+                self.unresolved.append(label.text() or target)
+
+        if not self.questions:
+            self.unresolved.append('no form fields in the static HTML')
+
+        return self.questions, self.unresolved
+
+    # ===== Field types =====
+
+    def _field(self, node: _Node, field_type: str, options: list[str] | None = None):
+        label = self._label(node)
+        if not label:
+            return
+        self._add({
+            'questionText': label,
+            'fieldType': field_type,
+            'options': options,
+            'required': _is_required(node),
+        }, _selector(node), self._step(node))
+
+    def _combobox(self, node: _Node):
+        label = self._label(node)
+        known = self.embedded.get(node.get('id')) or self.embedded.get(node.get('name'))
+        if not known or not known['options']:
+            self.unresolved.append(label or _selector(node))
+            return
+        self._add({
+            'questionText': label or known['questionText'],
+            'fieldType': 'dropdown_custom',
+            'options': known['options'],
+            'required': _is_required(node) or known['required'],
+        }, _selector(node), self._step(node))
+
+    def _file(self, node: _Node):
+        label = self._label(node)
+        if not label:
+            section = next((a for a in node.ancestors() if a.tag == 'div' and 'field' in (a.get('class') or '')), None)
+            heading = section and next((n for n in section.iter() if n.tag == 'label' or 'label' in (n.get('class') or '')), None)
+            label = heading.text() if heading else None
+        if not label:
+            file_id = (node.get('id') or '').lower()
+            label = 'Resume/CV' if 'resume' in file_id else 'Cover Letter' if 'cover' in file_id else None
+        if label:
+            self._add({
+                'questionText': label,
+                'fieldType': 'file',
+                'options': None,
+                'required': _is_required(node),
+            }, _selector(node), self._step(node))
+
+    def _select(self, node: _Node):
+        label = self._label(node)
+        options = [text for text in (option.text() for option in node.iter() if option.tag == 'option')
+                   if text and text not in PLACEHOLDER_OPTIONS]
+        if label and options:
+            self._add({
+                'questionText': label,
+                'fieldType': 'select',
+                'options': options,
+                'required': _is_required(node),
+            }, _selector(node), self._step(node))
+
+    def _radio_group(self, first: _Node, name: str):
+        group = [n for n in self.root.iter()
+                 if n.tag == 'input' and (n.get('type') or '').lower() == 'radio' and n.get('name') == name]
+        fieldset = next((a for a in first.ancestors() if a.tag == 'fieldset' or a.get('role') == 'radiogroup'), None)
+        legend = fieldset and next((n for n in fieldset.iter() if n.tag == 'legend'), None)
+        label = (legend.text() if legend else None) or (fieldset and self._aria_label(fieldset)) or self._label(first)
+        if not label:
+            return
+
+        options = []
+        for radio in group:
+            parent = radio.parent
+            if parent is not None and parent.tag == 'label':
+                text = parent.text()
+            elif radio.get('id') in self.labels_for:
+                text = self.labels_for[radio.get('id')].text()
+            else:
+                text = radio.get('value')
+            if text and text != label:
+                options.append(text)
+
+        if options:
+            self._add({
+                'questionText': label,
+                'fieldType': 'radio',
+                'options': options,
+                'required': any(_is_required(radio) for radio in group),
+            }, f'input[type="radio"][name="{name}"]', self._step(first))
+
+    # ===== Helpers =====
+
+    def _add(self, question: dict, selector: str, step: int):
+        key = (selector, question['fieldType'], question['questionText'])
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self.questions.append({**question, 'selector': selector, 'step': step})
+
+    def _aria_label(self, node: _Node) -> str | None:
+        aria = (node.get('aria-label') or '').strip()
+        if aria:
+            return aria
+        labelledby = node.get('aria-labelledby')
+        if labelledby and labelledby in self.by_id:
+            return self.by_id[labelledby].text() or None
+        return None
+
+    def _label(self, node: _Node) -> str | None:
+        """Same lookup order as FormScanner._get_label"""
+        label = self._aria_label(node)
+        if label:
+            return label
+        if node.get('id') in self.labels_for:
+            text = self.labels_for[node.get('id')].text()
+            if text:
+                return text
+        parent = node.parent
+        if parent is None:
+            return None
+        if parent.tag == 'label':
+            return parent.text() or None
+        for candidate in parent.iter():
+            cls = candidate.get('class') or ''
+            if candidate.tag == 'label' or 'label' in cls or 'question' in cls:
+                text = candidate.text()
+                if text and len(text) < 300:
+                    return text
+        return None
+
+    def _inside_dropdown(self, node: _Node) -> bool:
+        grandparent = node.parent.parent if node.parent is not None else None
+        classes = (grandparent.get('class') or '').lower() if grandparent is not None else ''
+        return 'select__' in classes or 'dropdown' in classes
+
+    def _step(self, node: _Node) -> int:
+        """1 for fields visible on load; hidden containers are later steps in document order"""
+        hidden = [a for a in (node, *node.ancestors()) if a.is_hidden()]
+        if not hidden:
+            return 1
+        container = hidden[-1]  # outermost
+        return self._steps.setdefault(id(container), len(self._steps) + 2)
+
+
+def _is_required(node: _Node) -> bool:
+    return 'required' in node.attrs or node.get('aria-required') == 'true'
+
+
+def _selector_for_id(element_id: str) -> str:
+    if SELECTOR_SPECIAL_CHARS.intersection(element_id):
+        return f'[id="{element_id}"]'
+    return f'#{element_id}'
+
+
+def _selector(node: _Node) -> str:
+    """Same selector FormScanner._get_selector produces for the element"""
+    if node.get('id'):
+        return _selector_for_id(node.get('id'))
+    if node.get('name'):
+        return f'{node.tag}[name="{node.get("name")}"]'
+    classes = (node.get('class') or '').split()[:2]
+    return f'{node.tag}.{".".join(classes)}' if classes else node.tag
+
+
+def scan_html(html: str, url: str = '') -> dict:
+    """
+    Scans raw HTML without a browser.
+
+    Returns:
+        FormScanner.scan_application's result plus
+        'source': 'static', 'complete': bool and 'unresolved': [label, ...]
+        (fields the static view could not describe)
+    """
+    questions, unresolved = _StaticForm(parse_html(html)).scan()
+    return {
+        'url': url,
+        'questions': questions,
+        'total': len(questions),
+        'dependencies': [],
+        'unrestored': [],
+        'cached': False,
+        'source': 'static',
+        'complete': not unresolved,
+        'unresolved': unresolved,
+    }
+
+
+def fetch_html(url: str, timeout: float = 10.0) -> str:
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT, 'Accept': 'text/html'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or 'utf-8'
+        return response.read().decode(charset, errors='replace')
+
+
+def scan_application(url: str, driver_factory: Callable | None = None, html: str | None = None,
+                     discover_conditionals: bool = False, cache: ScanCache | None = None,
+                     timeout: float = 10.0) -> dict:
+    """
+    Static scan first, Selenium only when the static view is incomplete.
+
+    Args:
+        url: Job application URL
+        driver_factory: Returns a WebDriver for the fallback; only called when needed
+        html: Page HTML if already fetched
+        discover_conditionals: Needs a browser, so goes straight to Selenium
+        cache: Scan cache for the Selenium fallback
+        timeout: HTTP fetch timeout (s)
+
+    Returns:
+        scan result with 'source' 'static' or 'selenium'. Without a driver_factory
+        an incomplete static result is returned as-is ('complete': False).
+    """
+    result = None
+    if not discover_conditionals:
+        started = time.perf_counter()
+        try:
+            with span(phase="scan.static"):
+                result = scan_html(html if html is not None else fetch_html(url, timeout), url)
+        except OSError as e:
+            logger.warning(f"Static fetch failed for {url}: {e}")
+
+        if result is not None:
+            if result['complete']:
+                logger.info(f"Static scan complete: {result['total']} questions "
+                            f"in {time.perf_counter() - started:.3f}s")
+                return result
+            logger.info(f"Static scan incomplete (unresolved: {', '.join(result['unresolved'][:5])})")
+
+    if driver_factory is None:
+        if result is None:
+            raise RuntimeError(f"Could not scan {url}: static fetch failed and no browser available")
+        return result
+
+    logger.info("Falling back to Selenium scan")
+    result = FormScanner(driver_factory(), cache=cache).scan_application(url, discover_conditionals=discover_conditionals)
+    result['source'] = 'selenium'
+    return result
@@ -1 +1 @@
-from .verify import verify_field
+from .verify import verify_field, verify_plan
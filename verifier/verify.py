@@ -1,64 +1,309 @@
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
-import time
+from matching import best_match, score_option
+from models import Action, FillPlan
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Lowest match score for option-type fields (same default as the executors).
+# When the field's options can be read, the selection must also be the option
+# the executor would pick: "United States Minor Outlying Islands" scores 0.88
+# against "United States", but loses to an "United States" option.
+MIN_OPTION_SCORE = 0.6
+
+# Radio group helpers shared with executor/radio.py, so the executor and the
+# verifier agree on which item of a group is selected.
+# radioItems(el) resolves a selector match to its whole group: native
+# <input type="radio"> groups (by name), ARIA [role="radio"] items (via their
+# radiogroup) and Greenhouse's button-style widgets (buttons inside a
+# radiogroup/fieldset). radioChecked() also accepts selected/active/checked classes.
+RADIO_GROUP_JS = """
+function textOf(node) {
+    return node ? (node.innerText || node.textContent || '').trim() : '';
+}
+
+function radioItems(el) {
+    var items;
+    if (el.matches('input[type="radio"]')) {
+        items = el.name
+            ? Array.from((el.form || document).querySelectorAll('input[type="radio"]'))
+                  .filter(function(r) { return r.name === el.name; })
+            : [el];
+    } else if (el.getAttribute('role') === 'radio') {
+        var group = el.closest('[role="radiogroup"]');
+        items = group ? Array.from(group.querySelectorAll('[role="radio"]')) : [el];
+    } else {
+        items = Array.from(el.querySelectorAll('input[type="radio"]'));
+        if (!items.length) items = Array.from(el.querySelectorAll('[role="radio"]'));
+        if (!items.length) items = Array.from(el.querySelectorAll('button, [aria-pressed]'));
+    }
+    return items;
+}
+
+function radioLabel(item) {
+    if (item.labels && item.labels.length) return textOf(item.labels[0]);
+    var wrapping = item.closest('label');
+    if (wrapping) return textOf(wrapping);
+    if (item.getAttribute('aria-label')) return item.getAttribute('aria-label').trim();
+    var labelledby = item.getAttribute('aria-labelledby');
+    if (labelledby) {
+        var ref = document.getElementById(labelledby.split(' ')[0]);
+        if (ref) return textOf(ref);
+    }
+    if (item.tagName !== 'INPUT') return textOf(item);
+    var sibling = item.nextElementSibling;
+    return sibling ? textOf(sibling) : '';
+}
+
+function radioValue(item) {
+    return item.tagName === 'INPUT' ? item.value : (item.getAttribute('data-value') || item.getAttribute('value') || '');
+}
+
+function radioChecked(item) {
+    if (item.tagName === 'INPUT') return item.checked;
+    if (item.getAttribute('aria-checked') === 'true' || item.getAttribute('aria-pressed') === 'true') return true;
+    return /(^|[-_\\s])(selected|active|checked)($|[-_\\s])/i.test(item.className || '');
+}
+"""
+
+# React-Select helpers shared with executor/dropdown_custom.py.
+# selectRoot(input) is the element holding both the control and the menu.
+# React-Select v5 wraps the input in "<prefix>__input-container" inside
+# "<prefix>__value-container", so the nearest [class*="container"] would be the
+# input's own wrapper, not the root. selectPropOptions(input) reads the complete
+# option list from the React `options` prop ({labels, values}, or null).
+REACT_SELECT_JS = """
+function selectRoot(input) {
+    var control = input.closest('[class*="control"]');
+    if (control && control.parentElement) return control.parentElement;
+    for (var node = input.parentElement; node; node = node.parentElement) {
+        var cls = typeof node.className === 'string' ? node.className : '';
+        if (/container/i.test(cls) && !/(input|value)-?container|(Input|Value)Container/.test(cls)) return node;
+    }
+    return input.parentElement;
+}
+
+function selectPropOptions(input) {
+    function labelOf(o) {
+        if (o === null || o === undefined) return null;
+        if (typeof o !== 'object') return String(o);
+        if (typeof o.label === 'string') return o.label;
+        return o.value !== undefined ? String(o.value) : null;
+    }
+    function valueOf(o) {
+        if (o === null || o === undefined) return '';
+        if (typeof o !== 'object') return String(o);
+        return o.value !== undefined && o.value !== null ? String(o.value) : '';
+    }
+
+    var fiberKey = Object.keys(input).find(function(k) {
+        return k.indexOf('__reactFiber$') === 0 || k.indexOf('__reactInternalInstance$') === 0;
+    });
+    var fiber = fiberKey ? input[fiberKey] : null;
+    for (var depth = 0; fiber && depth < 40; depth++, fiber = fiber.return) {
+        var props = fiber.memoizedProps;
+        if (props && Array.isArray(props.options) && props.options.length) {
+            var labels = [], values = [];
+            var add = function(o) {
+                var label = labelOf(o);
+                if (label) { labels.push(label); values.push(valueOf(o)); }
+            };
+            props.options.forEach(function(o) {
+                if (o && Array.isArray(o.options)) o.options.forEach(add);
+                else add(o);
+            });
+            return {labels: labels, values: values};
+        }
+    }
+    return null;
+}
+"""
+
+# Reads the state of every [selector, fieldType] pair in one round trip
+READ_FIELDS_SCRIPT = RADIO_GROUP_JS + REACT_SELECT_JS + """
+var specs = arguments[0];
+
+function readRadio(el) {
+    var items = radioItems(el);
+    var checked = items.find(radioChecked);
+    var state = checked
+        ? {checked: true, label: radioLabel(checked), value: radioValue(checked) || null}
+        : {checked: false, label: null, value: null};
+    state.options = items.map(radioLabel);
+    return state;
+}
+
+return specs.map(function(spec) {
+    var el;
+    try { el = document.querySelector(spec[0]); } catch (e) { return {found: false, error: 'Invalid selector'}; }
+    if (!el) return {found: false};
+
+    switch (spec[1]) {
+        case 'input_text':
+        case 'textarea':
+            return {found: true, value: el.value};
+        case 'input_file':
+            return {found: true, files: Array.from(el.files || []).map(function(f) { return f.name; })};
+        case 'checkbox':
+            return {found: true, checked: el.checked === true || el.getAttribute('aria-checked') === 'true'};
+        case 'radio':
+            var state = readRadio(el);
+            state.found = true;
+            return state;
+        case 'dropdown_native':
+            var option = el.options ? el.options[el.selectedIndex] : null;
+            return {found: true, value: el.value, label: option ? option.text : null,
+                    options: Array.from(el.options || []).map(function(o) { return o.text; })};
+        case 'dropdown_custom':
+            var root = selectRoot(el);
+            var single = root && root.querySelector(
+                '[class*="singleValue"], [class*="single-value"], [class*="multi-value__label"], [class*="multiValue"]'
+            );
+            var props = selectPropOptions(el);
+            return {found: true, value: el.value, label: textOf(single), expanded: el.getAttribute('aria-expanded'),
+                    options: props ? props.labels : null};
+        default:
+            return {found: true};
+    }
+});
+"""
+
 
 def verify_field(driver: WebDriver, selector: str, expected_value: str | bool, field_type: str) -> bool:
     """
     Verifies that a field was filled correctly.
-    
+
     This is called after each fill operation to ensure the value was set.
-    
+
     Args:
         driver: Selenium WebDriver instance
         selector: CSS selector for the field
         expected_value: Expected value (string or bool)
         field_type: Type of field (for type-specific verification)
-        
+
     Returns:
         True if verification passes, False otherwise
     """
     try:
-        element = driver.find_element(By.CSS_SELECTOR, selector)
-        
-        if field_type in ["input_text", "textarea"]:
-            actual = element.get_attribute("value")
-            return actual == expected_value
-            
-        elif field_type == "input_file":
-            actual = element.get_attribute("value")
-            # File inputs show different formats, just check if non-empty
-            return bool(actual)
-            
-        elif field_type in ["radio", "checkbox"]:
-            is_selected = element.is_selected()
-            if isinstance(expected_value, bool):
-                return is_selected == expected_value
-            else:
-                # For radio, expected_value is the option text
-                # We just verify it's selected
-                return is_selected
-                
-        elif field_type in ["dropdown_native", "dropdown_custom"]:
-            # Check input value
-            actual = element.get_attribute("value")
-            if actual and expected_value.lower() in actual.lower():
-                return True
-            
-            # For custom dropdowns, check aria attributes
-            if field_type == "dropdown_custom":
-                aria_expanded = element.get_attribute("aria-expanded")
-                if aria_expanded == "false":  # Closed = likely selected
-                    return True
-            
-            return False
-            
-        else:
-            # Unknown type, just check presence
-            return True
-            
-    except NoSuchElementException:
-        return False
+        state = driver.execute_script(READ_FIELDS_SCRIPT, [[selector, field_type]])[0]
+        return _compare(field_type, expected_value, state)[0]
     except Exception as e:
-        print(f"Verification error: {e}")
+        logger.warning(f"Verification error: {e}")
         return False
+
+
+def verify_plan(driver: WebDriver, plan: FillPlan | list[Action]) -> dict:
+    """
+    Verifies every action of a fill plan in a single script execution.
+
+    The page state of all fields is read in one round trip; type-specific
+    comparison happens in Python.
+
+    Args:
+        driver: Selenium WebDriver instance
+        plan: FillPlan or list of actions to verify
+
+    Returns:
+        {
+            'verified': bool,          # True if every action matches
+            'results': {id: bool},
+            'mismatches': {id: {'type', 'selector', 'expected', 'actual', 'reason'}}
+        }
+    """
+    actions = plan.actions if isinstance(plan, FillPlan) else list(plan)
+    if not actions:
+        return {'verified': True, 'results': {}, 'mismatches': {}}
+
+    states = driver.execute_script(
+        READ_FIELDS_SCRIPT,
+        [[action.selector, action.type] for action in actions]
+    )
+
+    results = {}
+    mismatches = {}
+    for action, state in zip(actions, states):
+        ok, reason = _compare(action.type, action.value, state, action.fileName)
+        results[action.id] = ok
+        if not ok:
+            mismatches[action.id] = {
+                'type': action.type,
+                'selector': action.selector,
+                'expected': action.value,
+                'actual': _actual_value(action.type, state),
+                'reason': reason,
+            }
+
+    return {'verified': not mismatches, 'results': results, 'mismatches': mismatches}
+
+
+def _compare(field_type: str, expected, state: dict, file_name: str | None = None) -> tuple[bool, str]:
+    """
+    Applies the type-specific comparison rule to a field state.
+
+    Returns:
+        (matches: bool, reason: str)
+    """
+    if not state or not state.get('found'):
+        return False, state.get('error', 'Element not found') if state else 'Element not found'
+
+    if field_type in ["input_text", "textarea"]:
+        actual = (state.get('value') or '').replace('\r\n', '\n')
+        wanted = '' if expected is None else str(expected).replace('\r\n', '\n')
+        if actual == wanted:
+            return True, ''
+        return False, 'Value differs'
+
+    elif field_type == "input_file":
+        files = state.get('files') or []
+        if not files:
+            return False, 'No file attached'
+        if file_name and not any(name.startswith(file_name.rsplit('.', 1)[0]) for name in files):
+            return False, f"Attached file does not match '{file_name}'"
+        return True, ''
+
+    elif field_type == "checkbox":
+        if state.get('checked') == _as_bool(expected):
+            return True, ''
+        return False, 'Checked state differs'
+
+    elif field_type in ["radio", "dropdown_native", "dropdown_custom"]:
+        if field_type == "radio" and isinstance(expected, bool):
+            return (True, '') if state.get('checked') == expected else (False, 'Checked state differs')
+
+        label, value = state.get('label'), state.get('value')
+        if not label and not (field_type == "dropdown_native" and value):
+            return False, 'Nothing selected'
+
+        wanted = str(expected)
+        score = max(score_option(wanted, label or '')[0], score_option(wanted, value or '')[0])
+        if score < MIN_OPTION_SCORE:
+            return False, 'Selected option differs'
+
+        # The executor picks the best-ranked option: a closer one means the wrong one is selected
+        best = best_match(wanted, state.get('options') or [], MIN_OPTION_SCORE)
+        if best is not None and best.score > score:
+            return False, f"Selected option differs (closer option: '{best.text}')"
+        return True, ''
+
+    # Unknown type (e.g. click), just check presence
+    return True, ''
+
+
+def _actual_value(field_type: str, state: dict):
+    """Picks the most useful observed value for a mismatch report"""
+    if not state or not state.get('found'):
+        return None
+    if field_type == "input_file":
+        return state.get('files')
+    if field_type == "checkbox":
+        return state.get('checked')
+    if field_type in ["radio", "dropdown_native", "dropdown_custom"]:
+        return state.get('label') or state.get('value')
+    return state.get('value')
+
+
+def _as_bool(value) -> bool:
+    """Coerces plan values like "true"/"yes" to bool"""
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "yes", "1", "on", "checked")
+    return bool(value)